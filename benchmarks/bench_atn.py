@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading the ATNs of the generated lexer and parser.
+
+For each recognizer, deserializing its ATN is compared to loading it from the cache
+written by `python -m jast._parser._atn`, reported as the best of several runs.
+"""
+
+import argparse
+import importlib
+import os
+import tempfile
+import time
+
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+
+from jast._parser import _atn
+
+
+def best(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in _atn._MODULES:
+            module = importlib.import_module(name)
+            serialized = module.serializedATN()
+            path = os.path.join(directory, name.rsplit(".", 1)[1] + ".atn")
+            _atn._write(path, serialized, ATNDeserializer().deserialize(serialized))
+            deserialize = best(
+                lambda: ATNDeserializer().deserialize(serialized), args.repeat
+            )
+            cached = best(lambda: _atn._read(path, serialized), args.repeat)
+            print(
+                f"{name.rsplit('.', 1)[1]:<11} deserialize {deserialize * 1000:6.1f} ms"
+                f"   cache {cached * 1000:6.1f} ms   ({os.path.getsize(path)} bytes)"
+            )
+
+
+if __name__ == "__main__":
+    main()
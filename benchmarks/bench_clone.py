@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark copying jASTs.
+
+The trees of the generated corpus are copied with `jast.clone` and with
+`copy.deepcopy`, reported as the best of several runs.
+"""
+
+import argparse
+import copy
+import sys
+import time
+
+import jast
+
+from corpus import corpus
+
+
+def best(function, trees, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            function(tree)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    trees = [jast.parse(src) for src in corpus(args.scale).values()]
+    clone = best(jast.clone, trees, args.repeat)
+    deepcopy = best(copy.deepcopy, trees, args.repeat)
+    print(f"clone    {clone * 1000:8.1f} ms")
+    print(f"deepcopy {deepcopy * 1000:8.1f} ms   ({deepcopy / clone:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark running many visitors in one traversal.
+
+Visitors that each count the nodes of one class traverse the trees of the generated
+corpus one after another and fused in a `jast.CompositeVisitor`, reported as the best
+of several runs.
+"""
+
+import argparse
+import sys
+import time
+
+import jast
+
+from corpus import corpus
+
+CLASSES = (
+    "Name",
+    "Call",
+    "BinOp",
+    "Return",
+    "If",
+    "For",
+    "ForEach",
+    "Method",
+    "Field",
+    "Class",
+    "Constant",
+    "Member",
+    "Assign",
+    "Lambda",
+    "IntLiteral",
+    "StringLiteral",
+    "This",
+    "param",
+    "declarator",
+    "Case",
+)
+
+
+def counter(name: str) -> type:
+    def visit(self, node):
+        self.count += 1
+
+    return type(
+        f"Count{name}",
+        (jast.JNodeVisitor,),
+        {"count": 0, f"visit_{name}": visit},
+    )
+
+
+def best(function, trees, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            function(tree)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    trees = [jast.parse(src) for src in corpus(args.scale).values()]
+    visitors = [counter(name)() for name in CLASSES]
+
+    def separate(tree):
+        for visitor in visitors:
+            visitor.visit(tree)
+
+    composite = jast.CompositeVisitor(visitors)
+    separate_time = best(separate, trees, args.repeat)
+    composite_time = best(composite.visit, trees, args.repeat)
+    print(f"{len(visitors)} visitors")
+    print(f"separate  {separate_time * 1000:8.1f} ms")
+    print(
+        f"composite {composite_time * 1000:8.1f} ms   "
+        f"({separate_time / composite_time:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the conversion of ANTLR parse trees into jASTs.
+
+The source is parsed once, and only the conversion is timed, reported as the best of
+several runs and as the time per created node.
+"""
+
+import argparse
+import sys
+import time
+
+from antlr4 import InputStream
+
+import jast
+from jast._parser import sa_java
+from jast._parser._convert import JASTConverter
+
+
+def generate_source(methods: int) -> str:
+    members = "".join(
+        f"    int m{i}(int a, int b) {{\n"
+        f"        int c = a * {i} + b - (a << 2);\n"
+        f"        if (a > b && c != 0 || !f(a)) return c % 7;\n"
+        f'        x[i] = y.z(a, b, "s" + c);\n'
+        f"        return m{i}(a + 1, b - 1) ? 1 : 2;\n"
+        f"    }}\n"
+        for i in range(methods)
+    )
+    return f"class Bench {{\n{members}}}\n"
+
+
+def count_nodes(node: jast.JAST) -> int:
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for _, value in node:
+            if isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, jast.JAST))
+            elif isinstance(value, jast.JAST):
+                stack.append(value)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--methods", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    src = generate_source(args.methods)
+    tree = sa_java._py_parse(InputStream(src), "compilationUnit", None)
+    converter = JASTConverter()
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        node = converter.visit(tree)
+        best = min(best, time.perf_counter() - start)
+    nodes = count_nodes(node)
+    print(f"lines:     {src.count(chr(10))}")
+    print(f"nodes:     {nodes}")
+    print(f"convert:   {best * 1000:.1f} ms")
+    print(f"per node:  {best / nodes * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import time of jast.
+
+Every run imports jast in a fresh interpreter, followed by the first parse, which
+loads the parser. Both are reported as the best of several runs.
+"""
+
+import argparse
+import subprocess
+import sys
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+import jast
+imported = time.perf_counter()
+jast.parse("class A {}")
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def measure() -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], check=True, capture_output=True, text=True
+    ).stdout
+    imported, parsed = output.split()
+    return float(imported), float(parsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    print(f"import:       {min(run[0] for run in runs) * 1000:.1f} ms")
+    print(f"first parse:  {min(run[1] for run in runs) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory footprint of jASTs per source line.
+
+Each source of the generated corpus is parsed and accounted with `jast.memory_report`,
+reported as bytes per source line, next to the estimates for nodes with `__slots__`
+and for shared identifiers, literals and location ints. The sizes depend on the
+Python version, which is saved with the results, so that a baseline is only compared
+to results of the same version.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from importlib.metadata import PackageNotFoundError, version
+
+import jast
+
+from corpus import corpus
+
+
+def measure(sources: dict) -> dict:
+    files = {}
+    for name, src in sources.items():
+        report = jast.memory_report(jast.parse(src), compare=True)
+        files[name] = {
+            "lines": src.count("\n"),
+            "nodes": report.nodes,
+            "bytes": report.total_bytes,
+            "slotted": report.slotted_bytes,
+            "interned": report.interned_bytes,
+        }
+    try:
+        release = version("jast")
+    except PackageNotFoundError:
+        release = None
+    return {"jast": release, "python": platform.python_version(), "files": files}
+
+
+def report(results: dict, baseline: dict = None, threshold: float = 0.05) -> bool:
+    """
+    Print the results and compare them to a baseline.
+    :param results:     The results of `measure`.
+    :param baseline:    Earlier results of `measure`.
+    :param threshold:   The relative growth of bytes per line reported as regression.
+    :return:            Whether the total bytes per line regressed.
+    """
+    if baseline and baseline["python"] != results["python"]:
+        print(
+            f"baseline of Python {baseline['python']} is not comparable "
+            f"to Python {results['python']}"
+        )
+        baseline = None
+    header = (
+        f"{'file':<16} {'lines':>6} {'nodes':>7} {'bytes':>9} {'B/line':>7} "
+        f"{'slotted':>8} {'interned':>8}"
+    )
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    totals = dict.fromkeys(("lines", "nodes", "bytes", "slotted", "interned"), 0)
+    rows = list(results["files"].items()) + [("total", totals)]
+    for name, result in rows:
+        if result is not totals:
+            for key in totals:
+                totals[key] += result[key]
+        lines = result["lines"]
+        line = (
+            f"{name:<16} {lines:>6} {result['nodes']:>7} {result['bytes']:>9} "
+            f"{result['bytes'] / lines:7.0f} {result['slotted'] / lines:8.0f} "
+            f"{result['interned'] / lines:8.0f}"
+        )
+        if baseline:
+            base = baseline["files"].get(name)
+            if name == "total":
+                base = {
+                    key: sum(file[key] for file in baseline["files"].values())
+                    for key in ("lines", "bytes")
+                }
+            if base:
+                ratio = (result["bytes"] / lines) / (base["bytes"] / base["lines"])
+                line += f" {ratio:7.2f}x"
+        print(line)
+    if not baseline:
+        return False
+    base_lines = sum(file["lines"] for file in baseline["files"].values())
+    base_bytes = sum(file["bytes"] for file in baseline["files"].values())
+    ratio = (totals["bytes"] / totals["lines"]) / (base_bytes / base_lines)
+    return ratio > 1 + threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--save", metavar="FILE", help="save the results as baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare to a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="relative growth of bytes per line reported as regression",
+    )
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    results = measure(corpus(args.scale))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    regressed = report(results, baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if regressed:
+        sys.exit("regression in bytes per line")
+
+
+if __name__ == "__main__":
+    main()
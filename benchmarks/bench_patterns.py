@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark matching many tree patterns.
+
+Generated patterns for calls, getters and field assignments are matched against the
+trees of the generated corpus, once by a `jast.PatternMatcher` in a single traversal
+and once with a traversal per pattern, reported as the best of several runs.
+"""
+
+import argparse
+import sys
+import time
+
+import jast
+
+from corpus import corpus
+
+
+def patterns(count: int):
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            yield jast.TreePattern(f"m{i}($$args)")
+        elif kind == 1:
+            yield jast.TreePattern(f"$x.getField{i}()")
+        else:
+            yield jast.TreePattern(f"this.field{i} = $v;", mode="stmt")
+
+
+def best(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--patterns", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    trees = [jast.parse(src) for src in corpus(args.scale).values()]
+    matcher = jast.PatternMatcher(patterns(args.patterns))
+    indexed = sum(len(matcher.findall(tree)) for tree in trees)
+    separate = sum(
+        len(pattern.findall(tree)) for pattern in matcher.patterns for tree in trees
+    )
+    assert indexed == separate, (indexed, separate)
+    matcher_time = best(lambda: [matcher.findall(tree) for tree in trees], args.repeat)
+    separate_time = best(
+        lambda: [
+            pattern.findall(tree) for pattern in matcher.patterns for tree in trees
+        ],
+        args.repeat,
+    )
+    print(f"{len(matcher.patterns)} patterns, {indexed} matches")
+    print(f"separate {separate_time * 1000:9.1f} ms")
+    print(
+        f"matcher  {matcher_time * 1000:9.1f} ms   "
+        f"({separate_time / matcher_time:.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pruning of subtrees in visitors and transformers.
+
+A visitor that counts calls and a transformer that renames called methods traverse
+the trees of the generated corpus with and without skipping the subtrees that cannot
+contain a call, reported as the best of several runs.
+"""
+
+import argparse
+import sys
+import time
+
+import jast
+
+from corpus import corpus
+
+
+class CountCalls(jast.JNodeVisitor):
+    prune = True
+
+    def default_result(self):
+        return 0
+
+    def aggregate_result(self, aggregate, result):
+        return aggregate + result
+
+    def visit_Call(self, node):
+        return 1 + self.generic_visit(node)
+
+
+class RenameCalls(jast.JNodeTransformer):
+    prune = True
+
+    def visit_Call(self, node):
+        if isinstance(node.func, jast.Name) and node.func.id == "f":
+            node.func = jast.Name(jast.identifier("g"))
+        return self.generic_visit(node)
+
+
+def best(visitor, trees, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            visitor.visit(tree)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    trees = [jast.parse(src) for src in corpus(args.scale).values()]
+    for visitor in (CountCalls(), RenameCalls()):
+        visitor.prune = False
+        full = best(visitor, trees, args.repeat)
+        visitor.prune = True
+        pruned = best(visitor, trees, args.repeat)
+        print(
+            f"{type(visitor).__name__:<12} full {full * 1000:7.1f} ms   "
+            f"pruned {pruned * 1000:7.1f} ms   ({full / pruned:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
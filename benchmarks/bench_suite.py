@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark the stages of jast on a generated Java corpus.
+
+Each source of the corpus is lexed, parsed, converted into a jAST, visited, unparsed,
+and round-tripped (parsed and unparsed again) with every stage timed separately. The
+times are the best of several runs, reported as throughput in files/s and nodes/s.
+The peak memory of every stage is measured in an extra run with tracemalloc. The
+results can be saved as a baseline and compared against later.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from antlr4 import CommonTokenStream, InputStream
+
+import jast
+from jast._parse import _SimpleErrorListener
+from jast._parser._convert import JASTConverter
+from jast._parser._sync import java_lexer, java_parser
+
+from bench_convert import count_nodes
+from corpus import corpus
+
+STAGES = ("lex", "parse", "convert", "visit", "unparse", "roundtrip")
+
+
+def run(src: str, clock=time.perf_counter, mark=lambda: None) -> Dict[str, float]:
+    """
+    Run all stages on a source.
+    :param src:     The Java source.
+    :param clock:   The measure taken after each stage.
+    :param mark:    Called before each stage.
+    :return:        The measure of each stage.
+    """
+    results = {}
+    listener = _SimpleErrorListener()
+    mark()
+    start = clock()
+    tokens = CommonTokenStream(java_lexer(InputStream(src), listener))
+    tokens.fill()
+    results["lex"] = clock() - start
+    mark()
+    start = clock()
+    tree = java_parser(tokens, listener).compilationUnit()
+    results["parse"] = clock() - start
+    mark()
+    start = clock()
+    node = JASTConverter().visit(tree)
+    results["convert"] = clock() - start
+    del tree
+    mark()
+    start = clock()
+    visitor = jast.JNodeVisitor()
+    # the stage measures a traversal of every node
+    visitor.prune = False
+    visitor.visit(node)
+    results["visit"] = clock() - start
+    mark()
+    start = clock()
+    code = jast.unparse(node)
+    results["unparse"] = clock() - start
+    mark()
+    start = clock()
+    jast.unparse(jast.parse(code))
+    results["roundtrip"] = clock() - start
+    return results
+
+
+def peak() -> float:
+    return tracemalloc.get_traced_memory()[1]
+
+
+def measure(sources: Dict[str, str], repeat: int) -> dict:
+    nodes = sum(count_nodes(jast.parse(src)) for src in sources.values())
+    seconds = dict.fromkeys(STAGES, 0.0)
+    for src in sources.values():
+        runs = [run(src) for _ in range(repeat)]
+        for stage in STAGES:
+            seconds[stage] += min(result[stage] for result in runs)
+    memory = dict.fromkeys(STAGES, 0)
+    tracemalloc.start()
+    try:
+        for src in sources.values():
+            result = run(src, clock=peak, mark=tracemalloc.reset_peak)
+            for stage in STAGES:
+                memory[stage] = max(memory[stage], int(result[stage]))
+    finally:
+        tracemalloc.stop()
+    return {
+        "files": len(sources),
+        "lines": sum(src.count("\n") for src in sources.values()),
+        "nodes": nodes,
+        "stages": {
+            stage: {"seconds": seconds[stage], "peak": memory[stage]}
+            for stage in STAGES
+        },
+    }
+
+
+def report(results: dict, baseline: dict = None, threshold: float = 0.1) -> List[str]:
+    """
+    Print the results and compare them to a baseline.
+    :param results:     The results of `measure`.
+    :param baseline:    Earlier results of `measure`.
+    :param threshold:   The relative slowdown reported as a regression.
+    :return:            The stages that regressed.
+    """
+    print(
+        f"{results['files']} files, {results['lines']} lines, "
+        f"{results['nodes']} nodes"
+    )
+    header = f"{'stage':<10} {'time':>10} {'files/s':>9} {'nodes/s':>10} {'peak':>9}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    regressions = []
+    for stage, result in results["stages"].items():
+        seconds = result["seconds"]
+        line = (
+            f"{stage:<10} {seconds * 1000:8.1f}ms {results['files'] / seconds:9.1f} "
+            f"{results['nodes'] / seconds:10.0f} {result['peak'] / 2**20:7.1f}MB"
+        )
+        if baseline and stage in baseline["stages"]:
+            ratio = seconds / baseline["stages"][stage]["seconds"]
+            line += f" {ratio:7.2f}x"
+            if ratio > 1 + threshold:
+                line += "  slower"
+                regressions.append(stage)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE", help="save the results as baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare to a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown of a stage reported as regression",
+    )
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    sources = corpus(args.scale)
+    # warm up the DFA caches of the lexer and parser
+    for src in sources.values():
+        jast.parse(src)
+    results = measure(sources, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    regressions = report(results, baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if regressions:
+        sys.exit(f"regressions in: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
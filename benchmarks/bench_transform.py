@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark transformers that keep the original jAST.
+
+A single identifier of the largest source of the generated corpus is renamed with a
+`JNodeKeepTransformer`, which copies every node, and with a `JNodeSharingTransformer`,
+which copies only the path to the renamed identifier. The times are the best of
+several runs, next to the number of nodes the result does not share with the original.
+"""
+
+import argparse
+import sys
+import time
+
+import jast
+from jast._parse import _walk
+
+from corpus import corpus
+
+
+def renamer(base: type, old: str, new: str) -> type:
+    class Rename(base):
+        def visit_identifier(self, node):
+            if node == old:
+                return jast.identifier(new)
+            return node
+
+    return Rename
+
+
+def copied(tree: jast.JAST, result: jast.JAST) -> int:
+    original = {id(node) for node in _walk(tree)}
+    return sum(1 for node in _walk(result) if id(node) not in original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    tree = jast.parse(corpus(args.scale)["Generated.java"])
+    nodes = sum(1 for _ in _walk(tree))
+    print(f"{nodes} nodes")
+    for base in (jast.JNodeKeepTransformer, jast.JNodeSharingTransformer):
+        transformer = renamer(base, "field0", "renamed")()
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = transformer.visit(tree)
+            times.append(time.perf_counter() - start)
+        print(
+            f"{base.__name__:<24} {min(times) * 1000:8.1f} ms "
+            f"{copied(tree, result):>7} nodes copied"
+        )
+
+
+if __name__ == "__main__":
+    main()
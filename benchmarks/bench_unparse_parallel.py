@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark unparsing in parallel.
+
+The members of a huge generated class are unparsed with `jast.unparse` and with
+`jast.unparse_parallel`, and the trees of the generated corpus with `jast.unparse` and
+with `jast.unparse_many`, reported as the best of several runs. Parsing is slow, so
+the members and the trees are repeated to get above the time from which the work is
+spread across processes. The speed-up depends on the number of cores, with a single
+core the pool only adds its overhead.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import jast
+import jast._unparse
+
+from corpus import corpus, generated
+
+
+def best(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(name: str, sequential: float, parallel: float):
+    print(f"{name:<10} sequential {sequential * 1000:8.1f} ms")
+    if parallel < sequential:
+        print(
+            f"{'':<10} parallel   {parallel * 1000:8.1f} ms   "
+            f"({sequential / parallel:.1f}x faster)"
+        )
+    else:
+        print(
+            f"{'':<10} parallel   {parallel * 1000:8.1f} ms   "
+            f"({parallel / sequential:.1f}x slower)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="the seconds of work from which the pool is used, 0 to always use it",
+    )
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    if args.threshold is not None:
+        jast._unparse._PARALLEL_SECONDS = args.threshold
+    workers = args.workers
+    print(f"{os.cpu_count()} cores, {workers} workers")
+
+    tree = jast.parse(generated(100))
+    tree.body[0].body *= 64 * args.scale
+    sequential = best(lambda: jast.unparse(tree), args.repeat)
+    parallel = best(
+        lambda: jast.unparse_parallel(tree, max_workers=workers), args.repeat
+    )
+    report("class", sequential, parallel)
+
+    trees = [jast.parse(src) for src in corpus().values()] * 32 * args.scale
+    sequential = best(lambda: [jast.unparse(tree) for tree in trees], args.repeat)
+    parallel = best(lambda: jast.unparse_many(trees, max_workers=workers), args.repeat)
+    report("corpus", sequential, parallel)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+A generated corpus of Java sources for the benchmarks.
+
+The corpus mixes the shapes that stress different parts of jast: many small utility
+classes, huge generated classes with flat members, deeply nested expressions, and
+stream pipelines with nested lambdas.
+"""
+
+from typing import Dict
+
+
+def utility(index: int) -> str:
+    return f"""package org.example.util;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Helpers for strings and collections.
+ */
+public final class Util{index} {{
+    private static final int LIMIT = {index + 16};
+
+    private Util{index}() {{
+    }}
+
+    public static boolean isBlank(String value) {{
+        if (value == null) {{
+            return true;
+        }}
+        for (int i = 0; i < value.length(); i++) {{
+            if (!Character.isWhitespace(value.charAt(i))) {{
+                return false;
+            }}
+        }}
+        return true;
+    }}
+
+    public static <T extends Comparable<T>> T max(List<T> values) {{
+        T result = null;
+        for (T value : values) {{
+            if (result == null || value.compareTo(result) > 0) {{
+                result = value;
+            }}
+        }}
+        return result;
+    }}
+
+    public static List<String> split(String value, char separator) {{
+        List<String> parts = new ArrayList<>();
+        StringBuilder current = new StringBuilder();
+        for (char c : value.toCharArray()) {{
+            if (c == separator && parts.size() < LIMIT) {{
+                parts.add(current.toString());
+                current.setLength(0);
+            }} else {{
+                current.append(c);
+            }}
+        }}
+        parts.add(current.toString());
+        return parts;
+    }}
+
+    public static int count(Map<String, Integer> counts, String key) {{
+        try {{
+            return counts.getOrDefault(key, 0) + {index};
+        }} catch (NullPointerException e) {{
+            throw new IllegalArgumentException("no counts for " + key, e);
+        }} finally {{
+            counts.remove(key);
+        }}
+    }}
+}}
+"""
+
+
+def generated(members: int) -> str:
+    fields = "".join(f"    private long field{i} = {i}L;\n" for i in range(members))
+    accessors = "".join(
+        f"    public long getField{i}() {{\n"
+        f"        return field{i};\n"
+        f"    }}\n"
+        f"\n"
+        f"    public Generated setField{i}(long value) {{\n"
+        f"        this.field{i} = value;\n"
+        f"        return this;\n"
+        f"    }}\n"
+        f"\n"
+        for i in range(members)
+    )
+    cases = "".join(f"            case {i}: return field{i};\n" for i in range(members))
+    return (
+        "package org.example.generated;\n"
+        "\n"
+        '@SuppressWarnings("all")\n'
+        "public final class Generated {\n"
+        f"{fields}\n"
+        f"{accessors}"
+        "    public long get(int index) {\n"
+        "        switch (index) {\n"
+        f"{cases}"
+        "            default: throw new IndexOutOfBoundsException();\n"
+        "        }\n"
+        "    }\n"
+        "}\n"
+    )
+
+
+def nested(depth: int) -> str:
+    arithmetic = "x"
+    for i in range(depth):
+        arithmetic = f"({arithmetic} {'+-*/'[i % 4]} {i + 1})"
+    conditional = "0"
+    for i in range(depth):
+        conditional = f"x > {i} ? {conditional} : {i}"
+    calls = "x"
+    for i in range(depth):
+        calls = f"f({calls}, {i})"
+    return (
+        "class Nested {\n"
+        "    int f(int a, int b) {\n"
+        "        return a + b;\n"
+        "    }\n"
+        "\n"
+        "    int arithmetic(int x) {\n"
+        f"        return {arithmetic};\n"
+        "    }\n"
+        "\n"
+        "    int conditional(int x) {\n"
+        f"        return {conditional};\n"
+        "    }\n"
+        "\n"
+        "    int calls(int x) {\n"
+        f"        return {calls};\n"
+        "    }\n"
+        "}\n"
+    )
+
+
+def lambdas(pipelines: int) -> str:
+    methods = "".join(
+        f"    List<String> pipeline{i}(List<Item> items) {{\n"
+        f"        return items.stream()\n"
+        f"            .filter(item -> item.weight() > {i} && item.tags().stream()"
+        f'.anyMatch(tag -> tag.startsWith("t{i}")))\n'
+        f"            .map(item -> {{\n"
+        f"                Function<Item, String> name = it -> it.name().trim();\n"
+        f"                return name.apply(item);\n"
+        f"            }})\n"
+        f"            .sorted(Comparator.comparing(String::length)"
+        f".thenComparing((a, b) -> b.compareTo(a)))\n"
+        f"            .collect(Collectors.toList());\n"
+        f"    }}\n"
+        f"\n"
+        for i in range(pipelines)
+    )
+    return (
+        "import java.util.Comparator;\n"
+        "import java.util.List;\n"
+        "import java.util.function.Function;\n"
+        "import java.util.stream.Collectors;\n"
+        "\n"
+        "class Pipelines {\n"
+        "    record Item(String name, int weight, List<String> tags) {\n"
+        "    }\n"
+        "\n"
+        f"{methods}"
+        "}\n"
+    )
+
+
+def corpus(scale: int = 1) -> Dict[str, str]:
+    """
+    Generate the corpus.
+    :param scale:   The factor for the number and the size of the sources.
+    :return:        The sources by file name.
+    """
+    sources = {f"Util{i}.java": utility(i) for i in range(8 * scale)}
+    sources["Generated.java"] = generated(100 * scale)
+    sources["Nested.java"] = nested(25 * scale)
+    sources["Pipelines.java"] = lambdas(10 * scale)
+    return sources
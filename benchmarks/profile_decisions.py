@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Profile the prediction decisions of the Java parser.
+
+The parser runs with a profiling ATN simulator over Java files, or over the generated
+benchmark corpus if no files are given. The decisions are ranked by prediction time,
+lookahead depth, or fallbacks to full LL prediction and reported with the grammar rule,
+and its line in JavaParser.g4, that contains them.
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Dict, List
+
+from jast._parser._profile import DecisionInfo, profile
+
+from corpus import corpus
+
+GRAMMAR = os.path.join(
+    os.path.dirname(__file__), os.pardir, "antlr", "java", "JavaParser.g4"
+)
+
+SORT_KEYS = {
+    "time": lambda info: info.time,
+    "lookahead": lambda info: (info.max_lookahead, info.mean_lookahead),
+    "fallbacks": lambda info: (info.ll_fallbacks, info.time),
+}
+
+
+def rule_lines(grammar: str) -> Dict[str, int]:
+    lines = {}
+    with open(grammar) as file:
+        for number, line in enumerate(file, start=1):
+            match = re.match(r"([a-z]\w*)\s*(:|$)", line)
+            if match:
+                lines.setdefault(match.group(1), number)
+    return lines
+
+
+def read_sources(paths: List[str]) -> List[str]:
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(".java"):
+                        with open(os.path.join(root, name)) as file:
+                            sources.append(file.read())
+        else:
+            with open(path) as file:
+                sources.append(file.read())
+    return sources
+
+
+def report(decisions: List[DecisionInfo], sort: str, top: int, lines: Dict[str, int]):
+    total = sum(info.time for info in decisions) or 1
+    used = [info for info in decisions if info.invocations]
+    ranked = sorted(used, key=SORT_KEYS[sort], reverse=True)[:top]
+    print(
+        f"{len(used)} of {len(decisions)} decisions used, "
+        f"{total / 1e6:.1f} ms prediction time"
+    )
+    print(
+        f"{'rank':>4} {'dec':>4}  {'rule (JavaParser.g4 line)':<34} {'calls':>7} "
+        f"{'time':>10} {'share':>6} {'look':>6} {'max':>5} {'LL':>5} {'LL max':>6} "
+        f"{'ambig':>5}"
+    )
+    for rank, info in enumerate(ranked, start=1):
+        rule = f"{info.rule} ({lines[info.rule]})" if info.rule in lines else info.rule
+        print(
+            f"{rank:>4} {info.decision:>4}  {rule:<34} {info.invocations:>7} "
+            f"{info.time / 1e6:8.1f}ms {info.time / total:6.1%} "
+            f"{info.mean_lookahead:6.1f} {info.sll_max_lookahead:>5} "
+            f"{info.ll_fallbacks:>5} {info.ll_max_lookahead:>6} {info.ambiguities:>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Java files or directories")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="time")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--grammar", default=GRAMMAR)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(100000)
+    sources = read_sources(args.paths) if args.paths else list(corpus().values())
+    lines = rule_lines(args.grammar) if os.path.exists(args.grammar) else {}
+    report(profile(sources), args.sort, args.top, lines)
+
+
+if __name__ == "__main__":
+    main()
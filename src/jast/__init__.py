@@ -23,6 +23,9 @@ that work tightly with Java.
 :license: MIT License.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from jast._jast import (
     JASTError,
     JAST,
@@ -31,6 +34,7 @@ from jast._jast import (
     ModularUnit,
     declaration,
     EmptyDecl,
+    ErrorDecl,
     CompoundDecl,
     Package,
     Import,
@@ -199,10 +203,87 @@ from jast._jast import (
     pattern,
     guardedpattern,
     identifier,
+    dump,
+    clone,
+)
+from jast._unparse import (
+    unparse,
+    unparse_min,
+    unparse_parallel,
+    unparse_many,
+    SourceMap,
+)
+from jast._visitors import (
+    JNodeVisitor,
+    JNodeTransformer,
+    JNodeKeepTransformer,
+    JNodeSharingTransformer,
+    CompositeVisitor,
 )
-from jast._parse import parse, ParseMode
-from jast._unparse import unparse
-from jast._visitors import JNodeVisitor, JNodeTransformer, JNodeKeepTransformer
+from jast._memory import memory_report, MemoryReport
+from jast._patterns import (
+    Capture,
+    Many,
+    TreePattern,
+    PatternMatch,
+    PatternMatcher,
+)
+from jast._patch import (
+    Edit,
+    Replacement,
+    Deletion,
+    Insertion,
+    PatchRenderer,
+    unparse_variants,
+)
+
+if TYPE_CHECKING:
+    from jast._parse import (
+        parse,
+        parse_many,
+        reparse,
+        check,
+        is_valid,
+        Diagnostic,
+        ParseMode,
+        ParseStats,
+    )
+    from jast._tokenize import tokenize, Tokens, Positions
+    from jast._comments import Comments, get_comments
+    from jast._async import aparse, aparse_many
+
+# the parser is only imported on first use, since loading the generated parser and
+# deserializing its ATN dominates the import time
+_LAZY = {
+    "parse": "jast._parse",
+    "parse_many": "jast._parse",
+    "reparse": "jast._parse",
+    "check": "jast._parse",
+    "is_valid": "jast._parse",
+    "Diagnostic": "jast._parse",
+    "ParseMode": "jast._parse",
+    "ParseStats": "jast._parse",
+    "tokenize": "jast._tokenize",
+    "Tokens": "jast._tokenize",
+    "Positions": "jast._tokenize",
+    "Comments": "jast._comments",
+    "get_comments": "jast._comments",
+    "aparse": "jast._async",
+    "aparse_many": "jast._async",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "JASTError",
@@ -212,6 +293,7 @@ __all__ = [
     "ModularUnit",
     "declaration",
     "EmptyDecl",
+    "ErrorDecl",
     "CompoundDecl",
     "Package",
     "Import",
@@ -380,9 +462,43 @@ __all__ = [
     "pattern",
     "guardedpattern",
     "identifier",
+    "dump",
+    "clone",
     "parse",
+    "parse_many",
+    "aparse",
+    "aparse_many",
+    "reparse",
+    "check",
+    "is_valid",
+    "Diagnostic",
     "ParseMode",
+    "ParseStats",
+    "tokenize",
+    "Tokens",
+    "Positions",
+    "Comments",
+    "get_comments",
     "unparse",
+    "unparse_min",
+    "unparse_parallel",
+    "unparse_many",
+    "SourceMap",
     "JNodeVisitor",
     "JNodeTransformer",
+    "JNodeSharingTransformer",
+    "CompositeVisitor",
+    "Edit",
+    "Replacement",
+    "Deletion",
+    "Insertion",
+    "PatchRenderer",
+    "unparse_variants",
+    "memory_report",
+    "MemoryReport",
+    "Capture",
+    "Many",
+    "TreePattern",
+    "PatternMatch",
+    "PatternMatcher",
 ]
@@ -0,0 +1,94 @@
+"""
+Parsing from asyncio code without blocking the event loop.
+
+The parses run on an executor, by default the thread pool of the event loop. Since
+parsing is CPU bound, a `ProcessPoolExecutor` gives parallel parses on a standard
+build of Python, while threads keep the event loop responsive.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple
+
+from jast._jast import JAST
+from jast._parse import Diagnostic, ParseMode, parse
+
+
+async def aparse(
+    src: str,
+    mode: ParseMode | str | int = ParseMode.UNIT,
+    recover: bool = False,
+    comments: bool = False,
+    executor: Optional[Executor] = None,
+) -> JAST | Tuple[Optional[JAST], List[Diagnostic]]:
+    """
+    Parse Java source code into a jAST on an executor.
+    :param src:         The Java source code.
+    :param mode:        The parse mode used to identify the java code.
+    :param recover:     If True, recover from syntax errors, see `parse`.
+    :param comments:    If True, collect the comments of the source code, see `parse`.
+    :param executor:    The executor to parse on, by default the one of the event loop.
+    :return:            The result of `parse`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(parse, src, mode, False, recover, comments)
+    )
+
+
+async def _sources(sources: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(sources, AsyncIterable):
+        async for src in sources:
+            yield src
+    else:
+        for src in sources:
+            yield src
+
+
+async def aparse_many(
+    sources: Iterable[str] | AsyncIterable[str],
+    mode: ParseMode | str | int = ParseMode.UNIT,
+    limit: int = 4,
+    executor: Optional[Executor] = None,
+    recover: bool = False,
+    comments: bool = False,
+) -> AsyncIterator[JAST | Tuple[Optional[JAST], List[Diagnostic]]]:
+    """
+    Parse many Java sources on an executor, yielding the jASTs in the order of the
+    sources. At most `limit` sources are parsed at a time, and further sources are only
+    taken from `sources` once a result was consumed. If the consumer stops iterating or
+    a parse fails, the pending parses are cancelled, and the errors of those that
+    already finished are discarded.
+    :param sources:     The Java sources, as a synchronous or asynchronous iterable.
+    :param mode:        The parse mode used to identify the java code.
+    :param limit:       The maximum number of pending parses.
+    :param executor:    The executor to parse on, by default the one of the event loop.
+    :param recover:     If True, recover from syntax errors, see `parse`.
+    :param comments:    If True, collect the comments of the source code, see `parse`.
+    :return:            An asynchronous iterator over the results of `parse`.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    try:
+        async for src in _sources(sources):
+            if len(pending) >= limit:
+                yield await pending.popleft()
+            pending.append(
+                loop.run_in_executor(
+                    executor, partial(parse, src, mode, False, recover, comments)
+                )
+            )
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            if future.done():
+                if not future.cancelled():
+                    # retrieve the error, so that it is not logged as never retrieved
+                    future.exception()
+            else:
+                future.cancel()
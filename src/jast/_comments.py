@@ -0,0 +1,242 @@
+"""
+Comments of Java source code, kept in a side table next to the jAST.
+
+The comments are collected once from the hidden channel of the token stream. They are
+attached to declarations and statements only on request, by looking up the gap between
+a node and its neighbouring tokens in the table.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+
+import jast._jast as jast
+from jast._parse import _line_starts
+from jast._parser.JavaLexer import JavaLexer
+from jast._parser._sync import java_lexer
+
+_COMMENTS = (JavaLexer.COMMENT, JavaLexer.LINE_COMMENT)
+
+
+def _splice(
+    starts: array,
+    stops: array,
+    new_starts: array,
+    new_stops: array,
+    start: int,
+    end: int,
+    delta: int,
+) -> Tuple[array, array]:
+    # keep the spans before start, replace those in [start, end) by the new spans
+    # relative to start, and shift the spans from end on
+    first, last = bisect_left(starts, start), bisect_left(starts, end)
+    spliced_starts, spliced_stops = starts[:first], stops[:first]
+    spliced_starts.extend(offset + start for offset in new_starts)
+    spliced_stops.extend(offset + start for offset in new_stops)
+    spliced_starts.extend(offset + delta for offset in starts[last:])
+    spliced_stops.extend(offset + delta for offset in stops[last:])
+    return spliced_starts, spliced_stops
+
+
+class Comments:
+    """
+    The comments of a source, sorted by offset.
+
+    A comment is leading for a declaration or statement if it lies between the node
+    and the previous token, but not on the line of a previous `;` or `}`. A comment is
+    trailing for a node if it lies between the node and the next token and starts on
+    the line the node ends, or if the next token is a closing `}`. A comment is inner
+    for a node ending with an empty pair of braces, e.g., an empty block or class
+    body, if it lies between the braces.
+    """
+
+    def __init__(self, src: str, tokens: Iterable[Token]):
+        """
+        :param src:     The source code.
+        :param tokens:  All tokens of the source code, including the hidden ones.
+        """
+        self.src = src
+        self.starts = array("i")
+        self.stops = array("i")
+        self._code_starts = array("i")
+        self._code_stops = array("i")
+        for token in tokens:
+            if token.type in _COMMENTS:
+                self.starts.append(token.start)
+                self.stops.append(token.stop + 1)
+            elif token.channel == Token.DEFAULT_CHANNEL and token.type != Token.EOF:
+                self._code_starts.append(token.start)
+                self._code_stops.append(token.stop + 1)
+        self._line_starts = _line_starts(src)
+
+    @classmethod
+    def from_source(cls, src: str) -> "Comments":
+        """
+        Collect the comments of a source by lexing it.
+        :param src: The source code.
+        :return:    The comments of the source code.
+        """
+        lexer = java_lexer(InputStream(src))
+        lexer.removeErrorListeners()
+        return cls(src, lexer.getAllTokens())
+
+    def edited(
+        self, src: str, start: int, end: int, delta: int, line_starts: array = None
+    ) -> "Comments":
+        """
+        The comments of the source after replacing the text between two offsets that
+        lie between tokens. Only the new text is lexed, the comments before and after
+        it are kept and shifted.
+        :param src:         The edited source code.
+        :param start:       The offset where the replaced text starts.
+        :param end:         The offset where the replaced text ended before the edit.
+        :param delta:       The change of the length of the source code by the edit.
+        :param line_starts: The offsets of the lines of the edited source code, if
+                            they are known.
+        :return:            The comments of the edited source code.
+        """
+        lexer = java_lexer(InputStream(src[start : end + delta]))
+        lexer.removeErrorListeners()
+        fragment = Comments("", lexer.getAllTokens())
+        comments = Comments.__new__(Comments)
+        comments.src = src
+        comments.starts, comments.stops = _splice(
+            self.starts, self.stops, fragment.starts, fragment.stops, start, end, delta
+        )
+        comments._code_starts, comments._code_stops = _splice(
+            self._code_starts,
+            self._code_stops,
+            fragment._code_starts,
+            fragment._code_stops,
+            start,
+            end,
+            delta,
+        )
+        comments._line_starts = (
+            _line_starts(src) if line_starts is None else line_starts
+        )
+        return comments
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.text(index) for index in range(len(self.starts)))
+
+    def text(self, index: int) -> str:
+        """
+        :param index:   The index of a comment.
+        :return:        The text of the comment, including its delimiters.
+        """
+        return self.src[self.starts[index] : self.stops[index]]
+
+    def _line(self, offset: int) -> int:
+        return bisect_right(self._line_starts, offset)
+
+    def _span(self, node: jast.JAST) -> Optional[tuple]:
+        lineno = getattr(node, "lineno", None)
+        end_lineno = getattr(node, "end_lineno", None)
+        if lineno is None or end_lineno is None:
+            return None
+        start = self._line_starts[lineno - 1] + node.col_offset
+        end = self._line_starts[end_lineno - 1] + node.end_col_offset
+        index = bisect_left(self._code_starts, end)
+        if index < len(self._code_starts) and self._code_starts[index] == end:
+            end = self._code_stops[index]
+            index += 1
+        if index < len(self._code_starts) and self._char(index) == ";":
+            end = self._code_stops[index]
+        return start, end
+
+    def _char(self, index: int) -> str:
+        return self.src[self._code_starts[index]]
+
+    def _own_line(self, index: int) -> bool:
+        start = self.starts[index]
+        return not self.src[self._line_starts[self._line(start) - 1] : start].strip()
+
+    def _leading(self, node: jast.JAST) -> range:
+        span = self._span(node)
+        if span is None:
+            return range(0)
+        start = span[0]
+        index = bisect_left(self._code_starts, start) - 1
+        previous = self._code_stops[index] if index >= 0 else 0
+        first = bisect_left(self.starts, previous)
+        last = bisect_left(self.starts, start)
+        if index >= 0 and self._char(index) in ";}":
+            line = self._line(previous - 1)
+            while first < last and self._line(self.starts[first]) == line:
+                first += 1
+        return range(first, last)
+
+    def _trailing(self, node: jast.JAST) -> range:
+        span = self._span(node)
+        if span is None:
+            return range(0)
+        end = span[1]
+        index = bisect_left(self._code_starts, end)
+        if index < len(self._code_starts):
+            following = self._code_starts[index]
+            closing = self._char(index) == "}"
+        else:
+            following, closing = len(self.src), True
+        first = bisect_left(self.starts, end)
+        if closing:
+            return range(first, bisect_left(self.starts, following))
+        last = first
+        line = self._line(end - 1)
+        while (
+            last < len(self.starts)
+            and self.starts[last] < following
+            and self._line(self.starts[last]) == line
+        ):
+            last += 1
+        return range(first, last)
+
+    def _inner(self, node: jast.JAST) -> range:
+        span = self._span(node)
+        if span is None:
+            return range(0)
+        index = bisect_left(self._code_starts, span[1]) - 1
+        if index > 0 and self._char(index) == ";":
+            index -= 1
+        if index < 1 or self._char(index) != "}" or self._char(index - 1) != "{":
+            return range(0)
+        return range(
+            bisect_left(self.starts, self._code_stops[index - 1]),
+            bisect_left(self.starts, self._code_starts[index]),
+        )
+
+    def leading(self, node: jast.JAST) -> List[str]:
+        """
+        :param node:    A node of the tree parsed from the source.
+        :return:        The comments preceding the node.
+        """
+        return [self.text(index) for index in self._leading(node)]
+
+    def trailing(self, node: jast.JAST) -> List[str]:
+        """
+        :param node:    A node of the tree parsed from the source.
+        :return:        The comments following the node.
+        """
+        return [self.text(index) for index in self._trailing(node)]
+
+    def inner(self, node: jast.JAST) -> List[str]:
+        """
+        :param node:    A node of the tree parsed from the source.
+        :return:        The comments between the empty braces the node ends with.
+        """
+        return [self.text(index) for index in self._inner(node)]
+
+
+def get_comments(tree: jast.JAST) -> Optional[Comments]:
+    """
+    :param tree:    A jAST returned by `parse(..., comments=True)`.
+    :return:        The comments of the parsed source, or None if they were not
+                    collected.
+    """
+    return getattr(tree, "_comments", None)
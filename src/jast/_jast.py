@@ -2497,6 +2497,21 @@ class EmptyDecl(declaration):
     """
 
 
+class ErrorDecl(declaration):
+    """
+    Represents a decl in the Java AST that could not be parsed. It keeps the source
+    text of the decl.
+
+    <text>
+    """
+
+    def __init__(self, text: str = None, *vargs, **kwargs):
+        super().__init__(*vargs, **kwargs)
+        if text is None:
+            raise JASTError("text is required for ErrorDecl")
+        self.text = text
+
+
 class CompoundDecl(declaration):
     """
     Represents a compound decl in the Java AST.
@@ -3292,3 +3307,93 @@ class ModularUnit(mod):
         if self.imports:
             yield "imports", self.imports
         yield "body", self.body
+
+
+_ATTRIBUTES = ("lineno", "col_offset", "end_lineno", "end_col_offset")
+
+
+def dump(node: JAST | List[JAST] | Any, include_attributes: bool = False) -> str:
+    """
+    Return a formatted dump of a tree. Two trees are structurally equal if their dumps
+    are equal.
+    :param node:                The node to dump.
+    :param include_attributes:  If True, the location attributes are included.
+    :return:                    The dump of the node.
+    """
+    if isinstance(node, JAST):
+        fields = ", ".join(
+            f"{field}={dump(value, include_attributes)}"
+            for field, value in vars(node).items()
+            if not field.startswith("_")
+            and (include_attributes or field not in _ATTRIBUTES)
+        )
+        return f"{node.__class__.__name__}({fields})"
+    elif isinstance(node, list):
+        return f"[{', '.join(dump(value, include_attributes) for value in node)}]"
+    else:
+        return repr(node)
+
+
+# the instances of these classes are immutable or have no attributes, so clones share
+# them with the original tree
+_SHARED = (identifier, literal, operator, unaryop, postop, modifier)
+# annotations are nodes and the lines of a text block are a mutable list
+_UNSHARED = (Annotation, TextBlock)
+# how clone treats the attribute values by type: 0 shares, 1 copies a node, 2 copies a
+# list of nodes
+_CLONE_KINDS = {list: 2}
+
+
+def _clone_kind(cls: type) -> int:
+    if issubclass(cls, JAST):
+        kind = int(not issubclass(cls, _SHARED) or issubclass(cls, _UNSHARED))
+    else:
+        kind = 0
+    _CLONE_KINDS[cls] = kind
+    return kind
+
+
+def clone(tree: JAST) -> JAST:
+    """
+    Return a deep copy of a tree, copied in a single iterative pass. Identifiers,
+    literals other than text blocks, operators and modifiers other than annotations
+    are immutable leaves and shared with the original tree, as are the non-node
+    attribute values.
+    :param tree:    The root of the tree to copy.
+    :return:        The copy of the tree.
+    """
+    kinds = _CLONE_KINDS
+    new = object.__new__
+    root_type = type(tree)
+    if (kinds.get(root_type) or _clone_kind(root_type)) != 1:
+        return tree.__copy__()
+    root = new(root_type)
+    stack = [(tree, root)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, copied = pop()
+        for field, value in vars(node).items():
+            value_type = type(value)
+            kind = kinds.get(value_type)
+            if kind is None:
+                kind = _clone_kind(value_type)
+            if kind == 1:
+                child = new(value_type)
+                push((value, child))
+                value = child
+            elif kind == 2:
+                items = []
+                for item in value:
+                    item_type = type(item)
+                    kind = kinds.get(item_type)
+                    if kind is None:
+                        kind = _clone_kind(item_type)
+                    if kind == 1:
+                        child = new(item_type)
+                        push((item, child))
+                        item = child
+                    items.append(item)
+                value = items
+            # set the attributes one by one to keep the compact layout of instances
+            setattr(copied, field, value)
+    return root
@@ -0,0 +1,232 @@
+"""
+Memory accounting for jAST trees.
+
+`memory_report` walks a tree and sums the sizes of its nodes, lists, identifiers,
+literals and location ints as reported by `sys.getsizeof`. The attributes of a node
+are read through the garbage collector, so the report does not materialize the
+instance dicts that Python 3.11 and later keep inline until `__dict__` is accessed.
+The size of such inline attribute storage is estimated.
+"""
+
+import gc
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from jast._jast import JAST, identifier, literal
+
+_LOCATIONS = ("lineno", "col_offset", "end_lineno", "end_col_offset")
+_SAMPLES = {object: (), str: ("a",), float: (0.0,)}
+_SLOT_SAVINGS: Dict[type, Optional[int]] = {}
+
+
+def _slot_savings(cls: type) -> Optional[int]:
+    """
+    The bytes an instance of a class saves with `__slots__` instead of a `__dict__`,
+    or None if the class cannot have slots.
+    """
+    base = next((b for b in (int, str, float) if issubclass(cls, b)), object)
+    if base not in _SLOT_SAVINGS:
+        if base is int:
+            # int subclasses do not support nonempty slots
+            _SLOT_SAVINGS[base] = None
+        else:
+            plain = type("plain", (base,), {})(*_SAMPLES[base])
+            slotted = type("slotted", (base,), {"__slots__": ()})(*_SAMPLES[base])
+            _SLOT_SAVINGS[base] = sys.getsizeof(plain) - sys.getsizeof(slotted)
+    return _SLOT_SAVINGS[base]
+
+
+def _inline(attributes: int) -> int:
+    # a header, a pointer and an index byte per value, aligned to 8 bytes
+    return 8 + 8 * attributes + (attributes + 10) // 8 * 8
+
+
+def _free(value: Any) -> bool:
+    # the interpreter shares these objects, so they do not add to the size of a tree
+    return (
+        value is None
+        or type(value) is bool
+        or type(value) is int
+        and -5 <= value <= 256
+    )
+
+
+def _attributes(node: JAST) -> Tuple[List[Any], int]:
+    """
+    The attribute values of a node and the size of their storage.
+    """
+    values = [value for value in gc.get_referents(node) if value is not type(node)]
+    for value in values:
+        if type(value) is dict:
+            return list(value.values()), sys.getsizeof(value)
+    if (3, 11) <= sys.version_info < (3, 13):
+        return values, _inline(len(values))
+    return values, 0
+
+
+class MemoryReport:
+    """
+    The memory footprint of a jAST tree, as computed by `memory_report`. All sizes
+    are in bytes.
+
+    `classes` maps the name of each node class to the number of its nodes and their
+    bytes, including the storage of their attributes, which is also summed up in
+    `attribute_bytes`. Identifiers and literals are counted by references, distinct
+    objects and distinct values, so that shared and duplicated objects can be told
+    apart, and their bytes include their values. Location ints are counted by
+    references and distinct objects, the small ints cached by the interpreter are
+    free. `slotted_bytes` and `interned_bytes` estimate the total for nodes with
+    `__slots__` and for sharing equal identifiers, literals and location ints, and
+    are None unless requested.
+    """
+
+    def __init__(self):
+        self.classes: Dict[str, List[int]] = {}
+        self.nodes = 0
+        self.node_bytes = 0
+        self.attribute_bytes = 0
+        self.lists = 0
+        self.list_bytes = 0
+        self.value_bytes = 0
+        self.identifiers = 0
+        self.identifier_objects = 0
+        self.identifier_values = 0
+        self.identifier_bytes = 0
+        self.literals = 0
+        self.literal_objects = 0
+        self.literal_values = 0
+        self.literal_bytes = 0
+        self.locations = 0
+        self.location_objects = 0
+        self.location_bytes = 0
+        self.slotted_bytes: Optional[int] = None
+        self.interned_bytes: Optional[int] = None
+
+    @property
+    def total_bytes(self) -> int:
+        return (
+            self.node_bytes + self.list_bytes + self.value_bytes + self.location_bytes
+        )
+
+    def __repr__(self):
+        return (
+            f"MemoryReport(nodes={self.nodes}, total_bytes={self.total_bytes}, "
+            f"identifiers={self.identifiers}, literals={self.literals}, "
+            f"locations={self.locations})"
+        )
+
+    def __str__(self):
+        lines = [f"{'class':<24} {'count':>8} {'bytes':>10} {'avg':>7}"]
+        for name, (count, size) in sorted(
+            self.classes.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(f"{name:<24} {count:>8} {size:>10} {size / count:7.1f}")
+        lines.append("")
+        lines.append(
+            f"{'nodes':<24} {self.nodes:>8} {self.node_bytes:>10}"
+            f"  {self.attribute_bytes} in attributes"
+        )
+        lines.append(f"{'lists':<24} {self.lists:>8} {self.list_bytes:>10}")
+        lines.append(
+            f"{'identifiers':<24} {self.identifiers:>8} {self.identifier_bytes:>10}"
+            f"  {self.identifier_objects} objects, {self.identifier_values} values"
+        )
+        lines.append(
+            f"{'literals':<24} {self.literals:>8} {self.literal_bytes:>10}"
+            f"  {self.literal_objects} objects, {self.literal_values} values"
+        )
+        lines.append(
+            f"{'location ints':<24} {self.locations:>8} {self.location_bytes:>10}"
+            f"  {self.location_objects} objects"
+        )
+        lines.append(f"{'total':<24} {'':>8} {self.total_bytes:>10}")
+        if self.slotted_bytes is not None:
+            lines.append(f"{'slotted':<24} {'':>8} {self.slotted_bytes:>10}")
+        if self.interned_bytes is not None:
+            lines.append(f"{'interned':<24} {'':>8} {self.interned_bytes:>10}")
+        return "\n".join(lines)
+
+
+def memory_report(tree: JAST, compare: bool = False) -> MemoryReport:
+    """
+    Account for the memory used by a jAST tree. Objects referenced more than once
+    are counted once.
+    :param tree:    The root of the tree.
+    :param compare: Whether to estimate the total for a layout with `__slots__` and
+                    for a layout that shares equal identifiers, literals and location
+                    ints.
+    :return:        The memory report of the tree.
+    """
+    report = MemoryReport()
+    seen = set()
+    slot_savings = 0
+    # the bytes of the identifiers, literals and location ints by their value
+    names: Dict[str, List[int]] = {}
+    literals: Dict[tuple, List[int]] = {}
+    ints: Dict[int, List[int]] = {}
+    stack = [tree]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, list):
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                report.lists += 1
+                report.list_bytes += sys.getsizeof(obj)
+                stack.extend(reversed(obj))
+            continue
+        if isinstance(obj, identifier):
+            report.identifiers += 1
+        elif isinstance(obj, literal):
+            report.literals += 1
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        values, storage = _attributes(obj)
+        size = sys.getsizeof(obj) + storage
+        report.nodes += 1
+        report.node_bytes += size
+        report.attribute_bytes += storage
+        entry = report.classes.setdefault(type(obj).__name__, [0, 0])
+        entry[0] += 1
+        entry[1] += size
+        if compare:
+            savings = _slot_savings(type(obj))
+            if savings is not None:
+                slot_savings += storage + savings - 8 * len(values)
+        for name in _LOCATIONS:
+            value = getattr(obj, name, None)
+            if type(value) is int:
+                report.locations += 1
+                if not _free(value) and id(value) not in seen:
+                    seen.add(id(value))
+                    report.location_objects += 1
+                    report.location_bytes += sys.getsizeof(value)
+                    ints.setdefault(value, []).append(sys.getsizeof(value))
+        for value in values:
+            if isinstance(value, (JAST, list)):
+                stack.append(value)
+            elif not _free(value) and id(value) not in seen:
+                seen.add(id(value))
+                report.value_bytes += sys.getsizeof(value)
+                if isinstance(obj, (identifier, literal)):
+                    size += sys.getsizeof(value)
+        if isinstance(obj, identifier):
+            report.identifier_objects += 1
+            report.identifier_bytes += size
+            names.setdefault(obj.value, []).append(size)
+        elif isinstance(obj, literal):
+            report.literal_objects += 1
+            report.literal_bytes += size
+            long, double = getattr(obj, "long", None), getattr(obj, "double", None)
+            key = type(obj), repr(obj.value), long, double
+            literals.setdefault(key, []).append(size)
+    report.identifier_values = len(names)
+    report.literal_values = len(literals)
+    if compare:
+        report.slotted_bytes = report.total_bytes - slot_savings
+        report.interned_bytes = report.total_bytes - sum(
+            sum(sizes) - sizes[0]
+            for group in (names, literals, ints)
+            for sizes in group.values()
+        )
+    return report
@@ -1,12 +1,27 @@
 import enum
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Tuple, List, Optional, Iterator
 
+from antlr4.CommonTokenStream import CommonTokenStream
 from antlr4.InputStream import InputStream
+from antlr4.Parser import Parser
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.Token import Token
+from antlr4.atn.PredictionMode import PredictionMode
 from antlr4.error.ErrorListener import ErrorListener
-from antlr4.error.Errors import ParseCancellationException
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from antlr4.error.Errors import ParseCancellationException, InputMismatchException
 
+import jast._jast as jast
 from jast._jast import JAST
 from jast._parser import sa_java
-from jast._parser._convert import JASTConverter
+from jast._parser._convert import JASTConverter, JASTRecoveringConverter
+from jast._parser._sync import java_lexer, java_parser
 
 
 class ParseMode(enum.Enum):
@@ -36,21 +51,201 @@ class ParseMode(enum.Enum):
     DIRE = "dire"
 
 
+_ENTRY_RULES = {
+    ParseMode.UNIT: "compilationUnit",
+    ParseMode.DECL: "declarationStart",
+    ParseMode.STMT: "statementStart",
+    ParseMode.EXPR: "expressionStart",
+    ParseMode.DIRE: "directiveStart",
+}
+
+
+def _parse_mode(mode: ParseMode | str | int) -> ParseMode:
+    if isinstance(mode, str):
+        return ParseMode(mode)
+    elif isinstance(mode, int):
+        return list(ParseMode)[mode]
+    return mode
+
+
+class Diagnostic:
+    """
+    A syntax error found in Java source code.
+    """
+
+    def __init__(self, line: int, column: int, msg: str):
+        """
+        :param line:    The line of the error, starting at 1.
+        :param column:  The column of the error, starting at 0.
+        :param msg:     The error message.
+        """
+        self.line = line
+        self.column = column
+        self.msg = msg
+
+    def __str__(self):
+        return f"Line {self.line}, Column {self.column}: error: {self.msg}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.line}, {self.column}, {self.msg!r})"
+
+
 class _SimpleErrorListener(ErrorListener):
     # noinspection PyPep8Naming
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         raise ParseCancellationException(f"Line {line}, Column {column}: error: {msg}")
 
 
+class _SyntaxError(Exception):
+    def __init__(self, diagnostic: Diagnostic):
+        super().__init__(str(diagnostic))
+        self.diagnostic = diagnostic
+
+
+class _BailErrorListener(ErrorListener):
+    # noinspection PyPep8Naming
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise _SyntaxError(Diagnostic(line, column, msg))
+
+
+class _FirstErrorListener(ErrorListener):
+    def __init__(self):
+        self.diagnostic = None
+
+    # noinspection PyPep8Naming
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        if self.diagnostic is None:
+            self.diagnostic = Diagnostic(line, column, msg)
+
+
+class _CollectingErrorListener(ErrorListener):
+    def __init__(self):
+        self.diagnostics: List[Diagnostic] = []
+        self.errors = set()
+        self.offsets = []
+
+    # noinspection PyPep8Naming
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.diagnostics.append(Diagnostic(line, column, msg))
+        if isinstance(recognizer, Parser):
+            # errors inside a member spoil only the innermost enclosing member,
+            # errors between members are skipped by the recovery
+            ctx = recognizer._ctx
+            while ctx is not None and not isinstance(
+                ctx, JASTRecoveringConverter.BODIES
+            ):
+                if isinstance(ctx, JASTRecoveringConverter.MEMBERS):
+                    self.errors.add(id(ctx))
+                    break
+                ctx = ctx.parentCtx
+        else:
+            self.offsets.append(recognizer._tokenStartCharIndex)
+
+    def mark(self, tree: ParserRuleContext):
+        """
+        Mark the innermost members containing the characters the lexer dropped.
+        """
+        for offset in self.offsets:
+            node, member = tree, None
+            while node is not None:
+                if isinstance(node, JASTRecoveringConverter.MEMBERS):
+                    member = node
+                elif isinstance(node, JASTRecoveringConverter.BODIES):
+                    member = None
+                for child in node.children or ():
+                    if (
+                        isinstance(child, ParserRuleContext)
+                        and child.stop is not None
+                        and child.start.start <= offset <= child.stop.stop
+                    ):
+                        node = child
+                        break
+                else:
+                    node = None
+            if member is not None:
+                self.errors.add(id(member))
+
+
+class ParseStats:
+    """
+    Timings and counters of a call to `parse`, filled in if passed as `stats`.
+    The times are in seconds, and lexing is timed on its own by fetching all tokens
+    before parsing. `full_context` counts the decisions that SLL prediction could not
+    resolve and that were retried with full LL prediction, `ambiguities` counts the
+    decisions that were ambiguous even with full LL prediction.
+    """
+
+    def __init__(self):
+        self.lex_time = 0.0
+        self.parse_time = 0.0
+        self.convert_time = 0.0
+        self.tokens = 0
+        self.contexts = 0
+        self.nodes = 0
+        self.full_context = 0
+        self.ambiguities = 0
+
+    @property
+    def total_time(self) -> float:
+        return self.lex_time + self.parse_time + self.convert_time
+
+    def __repr__(self):
+        return (
+            f"ParseStats(lex_time={self.lex_time:.6f}, "
+            f"parse_time={self.parse_time:.6f}, "
+            f"convert_time={self.convert_time:.6f}, tokens={self.tokens}, "
+            f"contexts={self.contexts}, nodes={self.nodes}, "
+            f"full_context={self.full_context}, ambiguities={self.ambiguities})"
+        )
+
+
+class _StatsListener(ErrorListener):
+    def __init__(self, stats: ParseStats):
+        self.stats = stats
+
+    # noinspection PyPep8Naming
+    def reportAttemptingFullContext(
+        self, recognizer, dfa, startIndex, stopIndex, conflictingAlts, configs
+    ):
+        self.stats.full_context += 1
+
+    # noinspection PyPep8Naming
+    def reportAmbiguity(
+        self, recognizer, dfa, startIndex, stopIndex, exact, ambigAlts, configs
+    ):
+        self.stats.ambiguities += 1
+
+
+def _count_contexts(tree: ParserRuleContext) -> int:
+    count, stack = 0, [tree]
+    while stack:
+        ctx = stack.pop()
+        count += 1
+        stack.extend(
+            child
+            for child in ctx.children or ()
+            if isinstance(child, ParserRuleContext)
+        )
+    return count
+
+
+class _CheckErrorStrategy(BailErrorStrategy):
+    # report mismatched tokens, which the bail strategy cancels without a report
+    def recoverInline(self, recognizer):
+        e = InputMismatchException(recognizer)
+        self.reportError(recognizer, e)
+        self.recover(recognizer, e)
+
+
 class _SpeedyAntlrErrorListener(sa_java.SA_ErrorListener):
     """This is invoked from the speedy ANTLR parser when a syntax error is encountered"""
 
     pass
 
 
-class _Parser:
+class _Parser(threading.local):
+    # every thread gets its own converter, the recognizers are created per parse
     def __init__(self):
-        self._parse_modes = list(ParseMode)
         self._converter = JASTConverter()
 
     def parse(
@@ -58,40 +253,115 @@ class _Parser:
         src: str,
         mode: ParseMode | str | int = ParseMode.UNIT,
         legacy: bool = False,
-    ) -> JAST:
-        if isinstance(mode, str):
-            mode = ParseMode(mode)
-        elif isinstance(mode, int):
-            mode = self._parse_modes[mode]
+        recover: bool = False,
+        comments: bool = False,
+        stats: Optional[ParseStats] = None,
+    ) -> JAST | Tuple[Optional[JAST], List[Diagnostic]]:
         stream = InputStream(src)
-
-        if mode == ParseMode.UNIT:
-            entry_rule_name = "compilationUnit"
-        elif mode == ParseMode.DECL:
-            entry_rule_name = "declarationStart"
-        elif mode == ParseMode.STMT:
-            entry_rule_name = "statementStart"
-        elif mode == ParseMode.DIRE:
-            entry_rule_name = "directiveStart"
+        entry_rule_name = _ENTRY_RULES[_parse_mode(mode)]
+        if (
+            True
+            or legacy
+            or recover
+            or comments
+            or stats is not None
+            or not sa_java.USE_CPP_IMPLEMENTATION
+        ):
+            listener = _CollectingErrorListener() if recover else _SimpleErrorListener()
+            tokens = CommonTokenStream(java_lexer(stream, listener))
+            parser = java_parser(tokens, listener)
+            if stats is not None:
+                start = time.perf_counter()
+                tokens.fill()
+                stats.lex_time = time.perf_counter() - start
+                stats.tokens = (
+                    sum(
+                        token.channel == Token.DEFAULT_CHANNEL
+                        for token in tokens.tokens
+                    )
+                    - 1
+                )
+                parser.addErrorListener(_StatsListener(stats))
+                start = time.perf_counter()
+            tree = getattr(parser, entry_rule_name)()
+            if (
+                recover
+                and entry_rule_name == "compilationUnit"
+                and tree.ordinaryCompilationUnit() is None
+                and tree.modularCompilationUnit() is None
+            ):
+                tree, tokens, listener = self._resync_unit(src)
+            if stats is not None:
+                stats.parse_time = time.perf_counter() - start
+                stats.contexts = _count_contexts(tree)
+                start = time.perf_counter()
         else:
-            entry_rule_name = "expressionStart"
-        if True or legacy or not sa_java.USE_CPP_IMPLEMENTATION:
-            error_listener = _SimpleErrorListener()
-            parser = sa_java._py_parse
+            tree = sa_java._cpp_parse(
+                stream, entry_rule_name, _SpeedyAntlrErrorListener()
+            )
+        if recover:
+            node = self._convert_recover(tree, listener)
         else:
-            error_listener = _SpeedyAntlrErrorListener()
-            parser = sa_java._cpp_parse
-        tree = parser(stream, entry_rule_name, error_listener)
+            node = self._converter.visit(tree)
+        if stats is not None:
+            stats.convert_time = time.perf_counter() - start
+            stats.nodes = 0 if node is None else sum(1 for _ in _walk(node))
+        if comments and node is not None:
+            from jast._comments import Comments
+
+            node._comments = Comments(src, tokens.tokens)
+        return (node, listener.diagnostics) if recover else node
+
+    @staticmethod
+    def _resync_unit(
+        src: str,
+    ) -> Tuple[ParserRuleContext, CommonTokenStream, _CollectingErrorListener]:
+        """
+        Parse a compilation unit whose kind could not be predicted, e.g., because of
+        an error in an import, as either kind and keep the one with fewer errors, so
+        that its valid declarations can be recovered.
+        """
+        best = None
+        for rule in ("ordinaryCompilationUnit", "modularCompilationUnit"):
+            listener = _CollectingErrorListener()
+            tokens = CommonTokenStream(java_lexer(InputStream(src), listener))
+            parser = java_parser(tokens, listener)
+            tree = getattr(parser, rule)()
+            if tokens.LA(1) != Token.EOF:
+                token = tokens.LT(1)
+                parser.notifyErrorListeners(
+                    f"mismatched input '{token.text}' expecting <EOF>", token, None
+                )
+            if best is None or len(listener.diagnostics) < len(best[2].diagnostics):
+                best = tree, tokens, listener
+        return best
 
-        return self._converter.visit(tree)
+    @staticmethod
+    def _convert_recover(
+        tree: ParserRuleContext, listener: _CollectingErrorListener
+    ) -> Optional[JAST]:
+        listener.mark(tree)
+        converter = JASTRecoveringConverter(listener.errors)
+        try:
+            node = converter.visit(tree)
+        except JASTRecoveringConverter.INCOMPLETE:
+            if not JASTRecoveringConverter.incomplete(tree):
+                raise
+            node = None
+        return node
 
 
 _parser = _Parser()
 
 
 def parse(
-    src: str, mode: ParseMode | str | int = ParseMode.UNIT, legacy: bool = False
-) -> JAST:
+    src: str,
+    mode: ParseMode | str | int = ParseMode.UNIT,
+    legacy: bool = False,
+    recover: bool = False,
+    comments: bool = False,
+    stats: Optional[ParseStats] = None,
+) -> JAST | Tuple[Optional[JAST], List[Diagnostic]]:
     """
     Parse Java source code into an jAST.
 
@@ -101,6 +371,278 @@ def parse(
                     Other modes are `ParseMode.DECL`, `ParseMode.STMT`, and `ParseMode.EXPR`, for parsing
                     Java declarations, statements, and expressions, respectively.
     :param legacy:  If True, use the legacy parser implementation.
-    :return:        The jAST represents the Java source code.
+    :param recover: If True, recover from syntax errors instead of raising an exception.
+                    Every declaration containing an error becomes an `ErrorDecl` keeping
+                    its source text, and all syntax errors are returned as well.
+    :param comments: If True, collect the comments of the source code. They are
+                    available through `get_comments(tree)` and can be re-emitted by
+                    `unparse`.
+    :param stats:   A `ParseStats` object that is filled in with the timings and
+                    counters of this call.
+    :return:        The jAST represents the Java source code. If recover is True, a tuple
+                    of the jAST, or None if nothing could be recovered, and the list of
+                    syntax errors.
+    """
+    return _parser.parse(src, mode, legacy, recover, comments, stats)
+
+
+def parse_many(
+    sources: Iterable[str],
+    mode: ParseMode | str | int = ParseMode.UNIT,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[JAST]:
+    """
+    Parse many Java sources concurrently. The parser is safe to use from multiple
+    threads, which only run in parallel on a free-threaded build of Python.
+    :param sources:     The Java sources.
+    :param mode:        The parse mode used to identify the java code.
+    :param max_workers: The number of worker threads if no executor is given.
+    :param executor:    An executor to use instead of a new thread pool.
+    :return:            The jAST of each source.
+    """
+    sources = list(sources)
+    if len(sources) < 2:
+        return [_parser.parse(src, mode) for src in sources]
+    pool = executor or ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return list(pool.map(partial(parse, mode=mode), sources))
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+
+def check(
+    src: str, mode: ParseMode | str | int = ParseMode.UNIT
+) -> Optional[Diagnostic]:
+    """
+    Check Java source code for syntax errors without building a jAST.
+
+    The source is parsed with SLL prediction and without building a parse tree,
+    stopping at the first error. Only if SLL prediction fails, the source is parsed
+    again with full LL prediction to confirm the error.
+
+    :param src:     The Java source code.
+    :param mode:    The parse mode used to identify the java code.
+    :return:        The first syntax error, or None if the source code is valid.
+    """
+    entry_rule_name = _ENTRY_RULES[_parse_mode(mode)]
+    tokens = CommonTokenStream(java_lexer(InputStream(src), _BailErrorListener()))
+    try:
+        tokens.fill()
+    except _SyntaxError as e:
+        return e.diagnostic
+    parser = java_parser(tokens)
+    parser.removeErrorListeners()
+    parser.buildParseTrees = False
+    parser._errHandler = _CheckErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        getattr(parser, entry_rule_name)()
+        return None
+    except ParseCancellationException:
+        pass
+    tokens.seek(0)
+    parser.reset()
+    listener = _FirstErrorListener()
+    parser.addErrorListener(listener)
+    parser._interp.predictionMode = PredictionMode.LL
+    try:
+        getattr(parser, entry_rule_name)()
+        return None
+    except ParseCancellationException:
+        pass
+    if listener.diagnostic is None:
+        token = tokens.LT(1)
+        return Diagnostic(token.line, token.column, "syntax error")
+    return listener.diagnostic
+
+
+def is_valid(src: str, mode: ParseMode | str | int = ParseMode.UNIT) -> bool:
+    """
+    Check whether Java source code is syntactically valid.
+
+    :param src:     The Java source code.
+    :param mode:    The parse mode used to identify the java code.
+    :return:        True if the source code is valid, False otherwise.
     """
-    return _parser.parse(src, mode, legacy)
+    return check(src, mode) is None
+
+
+def _line_starts(src: str) -> array:
+    starts = array("i", [0])
+    start = src.find("\n")
+    while start >= 0:
+        starts.append(start + 1)
+        start = src.find("\n", start + 1)
+    return starts
+
+
+def _position(starts: array, offset: int) -> Tuple[int, int]:
+    line = bisect_right(starts, offset)
+    return line, offset - starts[line - 1]
+
+
+def _span(node: JAST, starts: array) -> Optional[Tuple[int, int]]:
+    try:
+        lineno, col_offset = node.lineno, node.col_offset
+        end_lineno, end_col_offset = node.end_lineno, node.end_col_offset
+    except AttributeError:
+        return None
+    if None in (lineno, col_offset, end_lineno, end_col_offset):
+        return None
+    return starts[lineno - 1] + col_offset, starts[end_lineno - 1] + end_col_offset + 1
+
+
+def _children(node: JAST) -> Iterator[Tuple[JAST, str, Optional[int]]]:
+    for field, value in list(vars(node).items()):
+        if isinstance(value, JAST):
+            yield value, field, None
+        elif isinstance(value, list):
+            for index, child in enumerate(value):
+                if isinstance(child, JAST):
+                    yield child, field, index
+
+
+def _walk(node: JAST) -> Iterator[JAST]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(child for child, _, _ in _children(node))
+
+
+def _candidates(
+    node: JAST,
+    src: str,
+    starts: array,
+    lo: int,
+    hi: int,
+    parent=None,
+    field=None,
+    index=None,
+) -> Iterator[Tuple[JAST, JAST, str, Optional[int], int, int]]:
+    span = _span(node, starts)
+    if span is not None:
+        start, end = span
+        if not (start <= lo and hi <= end):
+            return
+        if (
+            isinstance(node, (jast.stmt, jast.declaration))
+            and start < lo
+            and hi < end
+            and src[end - 1] in ";}"
+        ):
+            yield node, parent, field, index, start, end
+    for child, child_field, child_index in _children(node):
+        yield from _candidates(
+            child, src, starts, lo, hi, node, child_field, child_index
+        )
+
+
+def _shift_fragment(node: JAST, line: int, column: int):
+    for n in _walk(node):
+        for line_attr, col_attr in (
+            ("lineno", "col_offset"),
+            ("end_lineno", "end_col_offset"),
+        ):
+            lineno = getattr(n, line_attr, None)
+            if lineno is not None:
+                if lineno == 1:
+                    setattr(n, col_attr, getattr(n, col_attr) + column)
+                setattr(n, line_attr, lineno + line - 1)
+
+
+def _shift_after(node: JAST, skip: JAST, old: Tuple[int, int], new: Tuple[int, int]):
+    old_line, old_column = old
+    line_delta, column_delta = new[0] - old_line, new[1] - old_column
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is skip:
+            continue
+        end_lineno = getattr(node, "end_lineno", None)
+        if end_lineno is not None and (end_lineno, node.end_col_offset) < old:
+            continue
+        lineno = getattr(node, "lineno", None)
+        if line_delta == 0 and lineno is not None and lineno > old_line:
+            continue
+        for line_attr, col_attr in (
+            ("lineno", "col_offset"),
+            ("end_lineno", "end_col_offset"),
+        ):
+            lineno = getattr(node, line_attr, None)
+            if lineno is not None and (lineno, getattr(node, col_attr)) >= old:
+                if lineno == old_line:
+                    setattr(node, col_attr, getattr(node, col_attr) + column_delta)
+                setattr(node, line_attr, lineno + line_delta)
+        stack.extend(child for child, _, _ in _children(node))
+
+
+def reparse(
+    tree: JAST,
+    src: str,
+    edits: Iterable[Tuple[int, int, str]],
+    mode: ParseMode | str | int = ParseMode.UNIT,
+) -> JAST:
+    """
+    Update a jAST after text edits to its source code by reparsing only the smallest
+    statement or declaration that encloses all edits. The tree is updated in place and
+    the locations of all nodes after the edits are shifted. If no enclosing statement
+    or declaration can be reparsed, the complete edited source is parsed instead.
+
+    :param tree:    The jAST of the source code before the edits.
+    :param src:     The source code before the edits.
+    :param edits:   The edits as (start, end, text) tuples, replacing `src[start:end]`
+                    with `text`. The edits must not overlap.
+    :param mode:    The parse mode used for the complete source code.
+    :return:        The jAST of the edited source code, which is `tree` itself unless
+                    the complete source code had to be parsed.
+    """
+    edits = sorted(edits)
+    if not edits:
+        return tree
+    parts, position, delta = [], 0, 0
+    for start, end, text in edits:
+        if start < position or end < start:
+            raise ValueError(f"invalid or overlapping edit ({start}, {end})")
+        parts.append(src[position:start])
+        parts.append(text)
+        position = end
+        delta += len(text) - (end - start)
+    parts.append(src[position:])
+    new_src = "".join(parts)
+    lo, hi = edits[0][0], position
+
+    starts = _line_starts(src)
+    candidates = list(_candidates(tree, src, starts, lo, hi))
+    for node, parent, field, index, start, end in reversed(candidates):
+        fragment_mode = (
+            ParseMode.STMT if isinstance(node, jast.stmt) else ParseMode.DECL
+        )
+        try:
+            new = parse(new_src[start : end + delta], fragment_mode)
+        except Exception:
+            continue
+        if type(new) is not type(node):
+            continue
+        new_starts = _line_starts(new_src)
+        line, column = _position(starts, start)
+        _shift_fragment(new, line, column)
+        new.lineno, new.col_offset = line, column
+        new.end_lineno, new.end_col_offset = _position(new_starts, end + delta - 1)
+        if parent is None:
+            return new
+        _shift_after(
+            tree, node, _position(starts, hi), _position(new_starts, hi + delta)
+        )
+        if index is None:
+            setattr(parent, field, new)
+        else:
+            getattr(parent, field)[index] = new
+        if hasattr(tree, "_comments"):
+            tree._comments = tree._comments.edited(
+                new_src, start, end, delta, new_starts
+            )
+        return tree
+    return parse(new_src, mode, comments=hasattr(tree, "_comments"))
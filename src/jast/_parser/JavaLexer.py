@@ -1,5 +1,6 @@
 # Generated from antlr/java/JavaLexer.g4 by ANTLR 4.13.2
 from antlr4 import *
+from jast._parser._atn import load_atn
 from io import StringIO
 import sys
 
@@ -9888,7 +9889,7 @@ def serializedATN():
 
 
 class JavaLexer(Lexer):
-    atn = ATNDeserializer().deserialize(serializedATN())
+    atn = load_atn(serializedATN(), __file__)
 
     decisionsToDFA = [DFA(ds, i) for i, ds in enumerate(atn.decisionToState)]
 
@@ -1,6 +1,7 @@
 # Generated from antlr/java/JavaParser.g4 by ANTLR 4.13.2
 # encoding: utf-8
 from antlr4 import *
+from jast._parser._atn import load_atn
 from io import StringIO
 import sys
 
@@ -17822,7 +17823,7 @@ def serializedATN():
 class JavaParser(Parser):
     grammarFileName = "JavaParser.g4"
 
-    atn = ATNDeserializer().deserialize(serializedATN())
+    atn = load_atn(serializedATN(), __file__)
 
     decisionsToDFA = [DFA(ds, i) for i, ds in enumerate(atn.decisionToState)]
 
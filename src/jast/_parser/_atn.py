@@ -0,0 +1,105 @@
+"""
+Cache of the deserialized ATNs of the generated lexer and parser.
+
+ANTLR stores the ATN of a recognizer as a list of integers that is deserialized into
+thousands of objects whenever the recognizer is imported. Like a `.pyc` file, the cache
+keeps a pickle of the deserialized ATN next to the generated module. It is only used if
+it was written by the same Python version from the same serialized ATN, which is
+checked against a digest in a header that is read before the ATN, and it is rebuilt on
+load unless writing bytecode is disabled.
+
+Run `python -m jast._parser._atn` to rebuild the caches, e.g., after generating the
+parser.
+"""
+
+import importlib
+import os
+import pickle
+import sys
+from typing import List, Optional, Tuple
+
+from antlr4.atn.ATN import ATN
+from antlr4.atn.ATNDeserializer import ATNDeserializer, SERIALIZED_VERSION
+
+_VERSION = (sys.version_info[:2], SERIALIZED_VERSION)
+
+_MODULES = ("jast._parser.JavaLexer", "jast._parser.JavaParser")
+
+
+def _cache_path(module_file: str) -> str:
+    return os.path.splitext(module_file)[0] + ".atn"
+
+
+def _digest(serialized: List[int]) -> Tuple[int, int]:
+    # the hash of a tuple of ints does not depend on the process, and the cache is
+    # only shared by the same Python version
+    return len(serialized), hash(tuple(serialized))
+
+
+def _read(path: str, serialized: List[int]) -> Optional[ATN]:
+    try:
+        with open(path, "rb") as file:
+            if pickle.load(file) != (_VERSION, _digest(serialized)):
+                return None
+            atn, transitions = pickle.load(file)
+    except Exception:
+        # missing, truncated, or written by an incompatible runtime
+        return None
+    if not isinstance(atn, ATN):
+        return None
+    for state, outgoing in zip(atn.states, transitions):
+        state.transitions = outgoing
+    return atn
+
+
+def _write(path: str, serialized: List[int], atn: ATN):
+    # the transitions are pickled after all states, since following them from state
+    # to state would exceed the recursion limit
+    transitions = [state.transitions for state in atn.states]
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        for state in atn.states:
+            state.transitions = []
+        with open(temporary, "wb") as file:
+            pickle.dump(
+                (_VERSION, _digest(serialized)), file, protocol=pickle.HIGHEST_PROTOCOL
+            )
+            pickle.dump((atn, transitions), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+    finally:
+        for state, outgoing in zip(atn.states, transitions):
+            state.transitions = outgoing
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_atn(serialized: List[int], module_file: str) -> ATN:
+    """
+    Load the ATN of a generated recognizer from its cache, or deserialize it.
+    :param serialized:  The serialized ATN of the recognizer.
+    :param module_file: The file of the module defining the recognizer.
+    :return:            The deserialized ATN.
+    """
+    path = _cache_path(module_file)
+    atn = _read(path, serialized)
+    if atn is None:
+        atn = ATNDeserializer().deserialize(serialized)
+        if not sys.dont_write_bytecode:
+            try:
+                _write(path, serialized, atn)
+            except (OSError, pickle.PicklingError, RecursionError):
+                pass
+    return atn
+
+
+def main():
+    for name in _MODULES:
+        module = importlib.import_module(name)
+        serialized = module.serializedATN()
+        path = _cache_path(module.__file__)
+        _write(path, serialized, ATNDeserializer().deserialize(serialized))
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
-from typing import List, Dict, Optional
+from typing import List, Optional, Set
 
 from antlr4.ParserRuleContext import ParserRuleContext
-from antlr4.tree.Tree import TerminalNodeImpl
+from antlr4.Token import Token
+from antlr4.tree.Tree import ErrorNode, TerminalNodeImpl
 
 import jast._jast as jast
 from jast import typeargs
@@ -10,34 +11,33 @@ from jast._parser.JavaParserVisitor import JavaParserVisitor
 
 
 class JASTConverter(JavaParserVisitor):
+    # locations are assigned to the constructed nodes directly, which avoids building
+    # a dict per node and passing it through the chain of constructors
+
     @staticmethod
-    def _get_location_rule(ctx: ParserRuleContext) -> Dict[str, int]:
-        if ctx.stop:
-            stop = ctx.stop
-        else:
-            stop = ctx.start
-        return {
-            "lineno": ctx.start.line,
-            "col_offset": ctx.start.column,
-            "end_lineno": stop.line,
-            "end_col_offset": stop.column,
-        }
+    def _set_location(node: jast.JAST, start: Token, stop: Token) -> jast.JAST:
+        node.lineno = start.line
+        node.col_offset = start.column
+        node.end_lineno = stop.line
+        node.end_col_offset = stop.column
+        return node
 
     @staticmethod
-    def _get_location_token(token: TerminalNodeImpl) -> Dict[str, int]:
-        return {
-            "lineno": token.symbol.line,
-            "col_offset": token.symbol.start,
-            "end_lineno": token.symbol.line,
-            "end_col_offset": token.symbol.stop,
-        }
+    def _set_location_rule(node: jast.JAST, ctx: ParserRuleContext) -> jast.JAST:
+        start = ctx.start
+        stop = ctx.stop or start
+        node.lineno = start.line
+        node.col_offset = start.column
+        node.end_lineno = stop.line
+        node.end_col_offset = stop.column
+        return node
 
     @staticmethod
-    def _set_location_rule(node: jast.JAST, ctx: ParserRuleContext):
-        setattr(node, "lineno", ctx.start.line)
-        setattr(node, "col_offset", ctx.start.column)
-        setattr(node, "end_lineno", ctx.stop.line)
-        setattr(node, "end_col_offset", ctx.stop.column)
+    def _set_location_token(node: jast.JAST, token: TerminalNodeImpl) -> jast.JAST:
+        symbol = token.symbol
+        node.lineno = node.end_lineno = symbol.line
+        node.col_offset = node.end_col_offset = symbol.column
+        return node
 
     def visitCompilationUnit(self, ctx: JavaParser.CompilationUnitContext) -> jast.mod:
         if ctx.ordinaryCompilationUnit():
@@ -65,7 +65,6 @@ class JASTConverter(JavaParserVisitor):
             package=package,
             imports=imports,
             body=declarations,
-            **self._get_location_rule(ctx),
         )
 
     def visitModularCompilationUnit(
@@ -76,9 +75,7 @@ class JASTConverter(JavaParserVisitor):
             for import_declaration in ctx.importDeclaration()
         ]
         module = self.visitModuleDeclaration(ctx.moduleDeclaration())
-        return jast.ModularUnit(
-            imports=imports, body=module, **self._get_location_rule(ctx)
-        )
+        return jast.ModularUnit(imports=imports, body=module)
 
     def visitPackageDeclaration(
         self, ctx: JavaParser.PackageDeclarationContext
@@ -87,8 +84,8 @@ class JASTConverter(JavaParserVisitor):
             self.visitAnnotation(annotation) for annotation in ctx.annotation()
         ]
         name = self.visitQualifiedName(ctx.qualifiedName())
-        return jast.Package(
-            annotations=annotations, name=name, **self._get_location_rule(ctx)
+        return self._set_location_rule(
+            jast.Package(annotations=annotations, name=name), ctx
         )
 
     def visitImportDeclaration(
@@ -97,11 +94,13 @@ class JASTConverter(JavaParserVisitor):
         static = ctx.STATIC() is not None
         name = self.visitQualifiedName(ctx.qualifiedName())
         on_demand = ctx.MUL() is not None
-        return jast.Import(
-            static=static,
-            name=name,
-            on_demand=on_demand,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Import(
+                static=static,
+                name=name,
+                on_demand=on_demand,
+            ),
+            ctx,
         )
 
     def visitTypeDeclaration(
@@ -192,14 +191,16 @@ class JASTConverter(JavaParserVisitor):
             self.visitClassPermits(ctx.classPermits()) if ctx.classPermits() else None
         )
         body = self.visitClassBody(ctx.classBody())
-        return jast.Class(
-            id=identifier,
-            type_params=type_parameters,
-            extends=extends,
-            implements=implements,
-            permits=permits,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Class(
+                id=identifier,
+                type_params=type_parameters,
+                extends=extends,
+                implements=implements,
+                permits=permits,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitClassExtends(self, ctx: JavaParser.ClassExtendsContext) -> jast.jtype:
@@ -266,12 +267,14 @@ class JASTConverter(JavaParserVisitor):
             if ctx.enumBodyDeclarations()
             else None
         )
-        return jast.Enum(
-            id=identifier,
-            implements=implements,
-            constants=constants,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Enum(
+                id=identifier,
+                implements=implements,
+                constants=constants,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitEnumConstants(
@@ -324,13 +327,15 @@ class JASTConverter(JavaParserVisitor):
             else None
         )
         body = self.visitInterfaceBody(ctx.interfaceBody())
-        return jast.Interface(
-            id=identifier,
-            type_params=type_parameters,
-            extends=extends,
-            implements=implements,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Interface(
+                id=identifier,
+                type_params=type_parameters,
+                extends=extends,
+                implements=implements,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitClassBody(
@@ -353,12 +358,14 @@ class JASTConverter(JavaParserVisitor):
         self, ctx: JavaParser.ClassBodyDeclarationContext
     ) -> jast.declaration:
         if ctx.SEMI():
-            return jast.EmptyDecl(**self._get_location_rule(ctx))
+            return self._set_location_rule(jast.EmptyDecl(), ctx)
         elif ctx.block():
-            return jast.Initializer(
-                body=self.visitBlock(ctx.block()),
-                static=ctx.STATIC() is not None,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Initializer(
+                    body=self.visitBlock(ctx.block()),
+                    static=ctx.STATIC() is not None,
+                ),
+                ctx,
             )
 
         else:
@@ -402,15 +409,17 @@ class JASTConverter(JavaParserVisitor):
         dims = self.visitDims(ctx.dims()) if ctx.dims() else None
         throws = self.visitThrows_(ctx.throws_()) if ctx.throws_() else None
         body = self.visitMethodBody(ctx.methodBody())
-        return jast.Method(
-            type_params=type_parameters,
-            return_type=return_type,
-            id=identifier,
-            parameters=parameters,
-            dims=dims,
-            throws=throws,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Method(
+                type_params=type_parameters,
+                return_type=return_type,
+                id=identifier,
+                parameters=parameters,
+                dims=dims,
+                throws=throws,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitDims(self, ctx: JavaParser.DimsContext) -> List[jast.dim]:
@@ -452,13 +461,15 @@ class JASTConverter(JavaParserVisitor):
         parameters = self.visitFormalParameters(ctx.formalParameters())
         throws = self.visitThrows_(ctx.throws_()) if ctx.throws_() else None
         body = self.visitBlock(ctx.constructorBody)
-        return jast.Constructor(
-            type_params=type_parameters,
-            id=identifier,
-            parameters=parameters,
-            throws=throws,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Constructor(
+                type_params=type_parameters,
+                id=identifier,
+                parameters=parameters,
+                throws=throws,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitCompactConstructorDeclaration(
@@ -467,11 +478,13 @@ class JASTConverter(JavaParserVisitor):
         modifiers = [self.visitModifier(modifier) for modifier in ctx.modifier()]
         identifier = self.visitIdentifier(ctx.identifier())
         body = self.visitBlock(ctx.constructorBody)
-        return jast.Constructor(
-            modifiers=modifiers,
-            id=identifier,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Constructor(
+                modifiers=modifiers,
+                id=identifier,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitFieldDeclaration(
@@ -479,17 +492,19 @@ class JASTConverter(JavaParserVisitor):
     ) -> jast.Field:
         type_ = self.visitTypeType(ctx.typeType())
         declarators = self.visitVariableDeclarators(ctx.variableDeclarators())
-        return jast.Field(
-            type=type_,
-            declarators=declarators,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Field(
+                type=type_,
+                declarators=declarators,
+            ),
+            ctx,
         )
 
     def visitInterfaceBodyDeclaration(
         self, ctx: JavaParser.InterfaceBodyDeclarationContext
     ) -> jast.declaration:
         if ctx.SEMI():
-            return jast.EmptyDecl(**self._get_location_rule(ctx))
+            return self._set_location_rule(jast.EmptyDecl(), ctx)
         else:
             declaration = self.visitInterfaceMemberDeclaration(
                 ctx.interfaceMemberDeclaration()
@@ -524,10 +539,12 @@ class JASTConverter(JavaParserVisitor):
     ) -> jast.Field:
         type_ = self.visitTypeType(ctx.typeType())
         declarators = self.visitVariableDeclarators(ctx.variableDeclarators())
-        return jast.Field(
-            type=type_,
-            declarators=declarators,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Field(
+                type=type_,
+                declarators=declarators,
+            ),
+            ctx,
         )
 
     def visitInterfaceMethodModifier(
@@ -567,17 +584,19 @@ class JASTConverter(JavaParserVisitor):
         dims = self.visitDims(ctx.dims()) if ctx.dims() else None
         throws = self.visitThrows_(ctx.throws_()) if ctx.throws_() else None
         body = self.visitMethodBody(ctx.methodBody())
-        return jast.Method(
-            modifiers=modifiers,
-            type_params=type_parameters,
-            annotations=annotations,
-            return_type=return_type,
-            id=identifier,
-            parameters=parameters,
-            dims=dims,
-            throws=throws,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Method(
+                modifiers=modifiers,
+                type_params=type_parameters,
+                annotations=annotations,
+                return_type=return_type,
+                id=identifier,
+                parameters=parameters,
+                dims=dims,
+                throws=throws,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitVariableDeclarators(
@@ -891,10 +910,12 @@ class JASTConverter(JavaParserVisitor):
     ) -> jast.AnnotationDecl:
         identifier = self.visitIdentifier(ctx.identifier())
         body = self.visitAnnotationTypeBody(ctx.annotationTypeBody())
-        return jast.AnnotationDecl(
-            id=identifier,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.AnnotationDecl(
+                id=identifier,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitAnnotationTypeBody(
@@ -909,7 +930,7 @@ class JASTConverter(JavaParserVisitor):
         self, ctx: JavaParser.AnnotationTypeElementDeclarationContext
     ) -> jast.declaration:
         if ctx.SEMI():
-            return jast.EmptyDecl(**self._get_location_rule(ctx))
+            return self._set_location_rule(jast.EmptyDecl(), ctx)
         else:
             declaration = self.visitAnnotationTypeElementRest(
                 ctx.annotationTypeElementRest()
@@ -946,10 +967,12 @@ class JASTConverter(JavaParserVisitor):
     ) -> jast.Field:
         type_ = self.visitTypeType(ctx.typeType())
         declarators = self.visitVariableDeclarators(ctx.variableDeclarators())
-        return jast.Field(
-            type=type_,
-            declarators=declarators,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Field(
+                type=type_,
+                declarators=declarators,
+            ),
+            ctx,
         )
 
     def visitAnnotationMethodDeclaration(
@@ -960,11 +983,13 @@ class JASTConverter(JavaParserVisitor):
         default = (
             self.visitDefaultValue(ctx.defaultValue()) if ctx.defaultValue() else None
         )
-        return jast.AnnotationMethod(
-            type=type_,
-            id=identifier,
-            default=default,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.AnnotationMethod(
+                type=type_,
+                id=identifier,
+                default=default,
+            ),
+            ctx,
         )
 
     def visitDefaultValue(
@@ -976,11 +1001,13 @@ class JASTConverter(JavaParserVisitor):
         open_ = ctx.OPEN() is not None
         name = self.visitQualifiedName(ctx.qualifiedName())
         directives = self.visitModuleBody(ctx.moduleBody())
-        return jast.Module(
-            open=open_,
-            name=name,
-            body=directives,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Module(
+                open=open_,
+                name=name,
+                body=directives,
+            ),
+            ctx,
         )
 
     def visitModuleBody(
@@ -1000,35 +1027,45 @@ class JASTConverter(JavaParserVisitor):
                 self.visitRequiresModifier(modifier)
                 for modifier in ctx.requiresModifier()
             ]
-            return jast.Requires(
-                modifiers=modifiers,
-                name=name,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Requires(
+                    modifiers=modifiers,
+                    name=name,
+                ),
+                ctx,
             )
         elif ctx.EXPORTS():
             to = self.visitQualifiedName(ctx.qualifiedName(1)) if ctx.TO() else None
-            return jast.Exports(
-                name=name,
-                to=to,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Exports(
+                    name=name,
+                    to=to,
+                ),
+                ctx,
             )
         elif ctx.OPENS():
             to = self.visitQualifiedName(ctx.qualifiedName(1)) if ctx.TO() else None
-            return jast.Opens(
-                name=name,
-                to=to,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Opens(
+                    name=name,
+                    to=to,
+                ),
+                ctx,
             )
         elif ctx.USES():
-            return jast.Uses(
-                name=name,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Uses(
+                    name=name,
+                ),
+                ctx,
             )
         else:
-            return jast.Provides(
-                name=name,
-                with_=self.visitQualifiedName(ctx.qualifiedName(1)),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Provides(
+                    name=name,
+                    with_=self.visitQualifiedName(ctx.qualifiedName(1)),
+                ),
+                ctx,
             )
 
     def visitRequiresModifier(
@@ -1059,13 +1096,15 @@ class JASTConverter(JavaParserVisitor):
             else None
         )
         body = self.visitRecordBody(ctx.recordBody())
-        return jast.Record(
-            id=identifier,
-            type_params=type_parameters,
-            components=components,
-            implements=implements,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Record(
+                id=identifier,
+                type_params=type_parameters,
+                components=components,
+                implements=implements,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitRecordComponentList(
@@ -1105,12 +1144,14 @@ class JASTConverter(JavaParserVisitor):
             )
 
     def visitBlock(self, ctx: JavaParser.BlockContext) -> jast.Block:
-        return jast.Block(
-            body=[
-                self.visitBlockStatement(blockStatement)
-                for blockStatement in ctx.blockStatement()
-            ],
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Block(
+                body=[
+                    self.visitBlockStatement(blockStatement)
+                    for blockStatement in ctx.blockStatement()
+                ],
+            ),
+            ctx,
         )
 
     def visitBlockStatement(self, ctx: JavaParser.BlockStatementContext) -> jast.stmt:
@@ -1140,11 +1181,13 @@ class JASTConverter(JavaParserVisitor):
         else:
             type_ = self.visitTypeType(ctx.typeType())
             declarators = self.visitVariableDeclarators(ctx.variableDeclarators())
-        return jast.LocalVariable(
-            modifiers=modifiers,
-            type=type_,
-            declarators=declarators,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.LocalVariable(
+                modifiers=modifiers,
+                type=type_,
+                declarators=declarators,
+            ),
+            ctx,
         )
 
     def visitIdentifier(self, ctx: JavaParser.IdentifierContext) -> jast.identifier:
@@ -1170,160 +1213,208 @@ class JASTConverter(JavaParserVisitor):
             declaration = self.visitRecordDeclaration(ctx.recordDeclaration())
         setattr(declaration, "modifiers", modifiers)
         self._set_location_rule(declaration, ctx)
-        return jast.LocalType(
-            decl=declaration,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.LocalType(
+                decl=declaration,
+            ),
+            ctx,
         )
 
     def visitStatement(self, ctx: JavaParser.StatementContext) -> jast.stmt:
         if ctx.blockLabel:
             return self.visitBlock(ctx.blockLabel)
         elif ctx.ASSERT():
-            return jast.Assert(
-                test=self.visitExpression(ctx.expression(0)),
-                msg=self.visitExpression(ctx.expression(1)) if ctx.COLON() else None,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Assert(
+                    test=self.visitExpression(ctx.expression(0)),
+                    msg=(
+                        self.visitExpression(ctx.expression(1)) if ctx.COLON() else None
+                    ),
+                ),
+                ctx,
             )
         elif ctx.IF():
-            return jast.If(
-                test=self.visitParExpr(ctx.parExpression()),
-                body=self.visitStatement(ctx.statement(0)),
-                orelse=self.visitStatement(ctx.statement(1)) if ctx.ELSE() else None,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.If(
+                    test=self.visitParExpr(ctx.parExpression()),
+                    body=self.visitStatement(ctx.statement(0)),
+                    orelse=(
+                        self.visitStatement(ctx.statement(1)) if ctx.ELSE() else None
+                    ),
+                ),
+                ctx,
             )
         elif ctx.FOR():
             if ctx.COLON():
-                return jast.ForEach(
-                    modifiers=[
-                        self.visitVariableModifier(modifier)
-                        for modifier in ctx.variableModifier()
-                    ],
-                    type=(
-                        jast.Var() if ctx.VAR() else self.visitTypeType(ctx.typeType())
+                return self._set_location_rule(
+                    jast.ForEach(
+                        modifiers=[
+                            self.visitVariableModifier(modifier)
+                            for modifier in ctx.variableModifier()
+                        ],
+                        type=(
+                            jast.Var()
+                            if ctx.VAR()
+                            else self.visitTypeType(ctx.typeType())
+                        ),
+                        id=self.visitVariableDeclaratorId(ctx.variableDeclaratorId()),
+                        iter=self.visitExpression(ctx.expression(0)),
+                        body=self.visitStatement(ctx.statement(0)),
                     ),
-                    id=self.visitVariableDeclaratorId(ctx.variableDeclaratorId()),
-                    iter=self.visitExpression(ctx.expression(0)),
-                    body=self.visitStatement(ctx.statement(0)),
-                    **self._get_location_rule(ctx),
+                    ctx,
                 )
             else:
-                return jast.For(
-                    init=self.visitForInit(ctx.forInit()) if ctx.forInit() else None,
-                    test=(
-                        self.visitExpression(ctx.expression(0))
-                        if ctx.expression()
-                        else None
-                    ),
-                    update=(
-                        self.visitExpressionList(ctx.forUpdate)
-                        if ctx.forUpdate
-                        else None
+                return self._set_location_rule(
+                    jast.For(
+                        init=(
+                            self.visitForInit(ctx.forInit()) if ctx.forInit() else None
+                        ),
+                        test=(
+                            self.visitExpression(ctx.expression(0))
+                            if ctx.expression()
+                            else None
+                        ),
+                        update=(
+                            self.visitExpressionList(ctx.forUpdate)
+                            if ctx.forUpdate
+                            else None
+                        ),
+                        body=self.visitStatement(ctx.statement(0)),
                     ),
-                    body=self.visitStatement(ctx.statement(0)),
-                    **self._get_location_rule(ctx),
+                    ctx,
                 )
         elif ctx.DO():
-            return jast.DoWhile(
-                body=self.visitStatement(ctx.statement(0)),
-                test=self.visitParExpression(ctx.parExpression()),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.DoWhile(
+                    body=self.visitStatement(ctx.statement(0)),
+                    test=self.visitParExpression(ctx.parExpression()),
+                ),
+                ctx,
             )
         elif ctx.WHILE():
-            return jast.While(
-                test=self.visitParExpr(ctx.parExpression()),
-                body=self.visitStatement(ctx.statement(0)),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.While(
+                    test=self.visitParExpr(ctx.parExpression()),
+                    body=self.visitStatement(ctx.statement(0)),
+                ),
+                ctx,
             )
         elif ctx.TRY():
             if ctx.resourceSpecification():
-                return jast.TryWithResources(
-                    resources=self.visitResourceSpecification(
-                        ctx.resourceSpecification()
+                return self._set_location_rule(
+                    jast.TryWithResources(
+                        resources=self.visitResourceSpecification(
+                            ctx.resourceSpecification()
+                        ),
+                        body=self.visitBlock(ctx.block()),
+                        catches=[
+                            self.visitCatchClause(catchClause)
+                            for catchClause in ctx.catchClause()
+                        ],
+                        final=(
+                            self.visitFinallyBlock(ctx.finallyBlock())
+                            if ctx.finallyBlock()
+                            else None
+                        ),
                     ),
-                    body=self.visitBlock(ctx.block()),
-                    catches=[
-                        self.visitCatchClause(catchClause)
-                        for catchClause in ctx.catchClause()
-                    ],
-                    final=(
-                        self.visitFinallyBlock(ctx.finallyBlock())
-                        if ctx.finallyBlock()
-                        else None
-                    ),
-                    **self._get_location_rule(ctx),
+                    ctx,
                 )
             else:
-                return jast.Try(
-                    body=self.visitBlock(ctx.block()),
-                    catches=[
-                        self.visitCatchClause(catchClause)
-                        for catchClause in ctx.catchClause()
-                    ],
-                    final=(
-                        self.visitFinallyBlock(ctx.finallyBlock())
-                        if ctx.finallyBlock()
-                        else None
+                return self._set_location_rule(
+                    jast.Try(
+                        body=self.visitBlock(ctx.block()),
+                        catches=[
+                            self.visitCatchClause(catchClause)
+                            for catchClause in ctx.catchClause()
+                        ],
+                        final=(
+                            self.visitFinallyBlock(ctx.finallyBlock())
+                            if ctx.finallyBlock()
+                            else None
+                        ),
                     ),
-                    **self._get_location_rule(ctx),
+                    ctx,
                 )
         elif ctx.SWITCH():
-            return jast.Switch(
-                value=self.visitParExpression(ctx.parExpression()),
-                body=self.visitSwitchBlock(ctx.switchBlock()),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Switch(
+                    value=self.visitParExpression(ctx.parExpression()),
+                    body=self.visitSwitchBlock(ctx.switchBlock()),
+                ),
+                ctx,
             )
         elif ctx.SYNCHRONIZED():
-            return jast.Synch(
-                lock=self.visitParExpression(ctx.parExpression()),
-                body=self.visitBlock(ctx.block()),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Synch(
+                    lock=self.visitParExpression(ctx.parExpression()),
+                    body=self.visitBlock(ctx.block()),
+                ),
+                ctx,
             )
         elif ctx.RETURN():
-            return jast.Return(
-                value=(
-                    self.visitExpression(ctx.expression(0))
-                    if ctx.expression()
-                    else None
+            return self._set_location_rule(
+                jast.Return(
+                    value=(
+                        self.visitExpression(ctx.expression(0))
+                        if ctx.expression()
+                        else None
+                    ),
                 ),
-                **self._get_location_rule(ctx),
+                ctx,
             )
         elif ctx.THROW():
-            return jast.Throw(
-                exc=self.visitExpression(ctx.expression(0)),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Throw(
+                    exc=self.visitExpression(ctx.expression(0)),
+                ),
+                ctx,
             )
         elif ctx.BREAK():
-            return jast.Break(
-                label=(
-                    self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None
+            return self._set_location_rule(
+                jast.Break(
+                    label=(
+                        self.visitIdentifier(ctx.identifier())
+                        if ctx.identifier()
+                        else None
+                    ),
                 ),
-                **self._get_location_rule(ctx),
+                ctx,
             )
         elif ctx.CONTINUE():
-            return jast.Continue(
-                label=(
-                    self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None
+            return self._set_location_rule(
+                jast.Continue(
+                    label=(
+                        self.visitIdentifier(ctx.identifier())
+                        if ctx.identifier()
+                        else None
+                    ),
                 ),
-                **self._get_location_rule(ctx),
+                ctx,
             )
         elif ctx.YIELD():
-            return jast.Yield(
-                value=self.visitExpression(ctx.expression(0)),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Yield(
+                    value=self.visitExpression(ctx.expression(0)),
+                ),
+                ctx,
             )
         elif ctx.statementExpression:
-            return jast.Expr(
-                value=self.visitExpression(ctx.statementExpression),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Expr(
+                    value=self.visitExpression(ctx.statementExpression),
+                ),
+                ctx,
             )
         elif ctx.identifierLabel:
-            return jast.Labeled(
-                label=self.visitIdentifier(ctx.identifierLabel),
-                body=self.visitStatement(ctx.statement(0)),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Labeled(
+                    label=self.visitIdentifier(ctx.identifierLabel),
+                    body=self.visitStatement(ctx.statement(0)),
+                ),
+                ctx,
             )
         else:
-            return jast.Empty(**self._get_location_rule(ctx))
+            return self._set_location_rule(jast.Empty(), ctx)
 
     def visitSwitchBlock(self, ctx: JavaParser.SwitchBlockContext) -> jast.switchblock:
         return jast.switchblock(
@@ -1341,12 +1432,14 @@ class JASTConverter(JavaParserVisitor):
         type_ = self.visitCatchType(ctx.catchType())
         identifier = self.visitIdentifier(ctx.identifier())
         body = self.visitBlock(ctx.block())
-        return jast.catch(
-            modifiers=modifiers,
-            excs=type_,
-            id=identifier,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.catch(
+                modifiers=modifiers,
+                excs=type_,
+                id=identifier,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitCatchType(self, ctx: JavaParser.CatchTypeContext) -> List[jast.qname]:
@@ -1397,15 +1490,18 @@ class JASTConverter(JavaParserVisitor):
     def visitSwitchBlockStatementGroup(
         self, ctx: JavaParser.SwitchBlockStatementGroupContext
     ) -> jast.switchgroup:
-        return jast.switchgroup(
-            labels=[
-                self.visitSwitchLabel(switchLabel) for switchLabel in ctx.switchLabel()
-            ],
-            body=[
-                self.visitBlockStatement(blockStatement)
-                for blockStatement in ctx.blockStatement()
-            ],
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.switchgroup(
+                labels=[
+                    self.visitSwitchLabel(switchLabel)
+                    for switchLabel in ctx.switchLabel()
+                ],
+                body=[
+                    self.visitBlockStatement(blockStatement)
+                    for blockStatement in ctx.blockStatement()
+                ],
+            ),
+            ctx,
         )
 
     def visitSwitchLabel(self, ctx: JavaParser.SwitchLabelContext) -> jast.switchlabel:
@@ -1415,15 +1511,13 @@ class JASTConverter(JavaParserVisitor):
             if ctx.constantExpression:
                 expression = self.visitExpression(ctx.constantExpression)
             else:
-                start = self._get_location_rule(ctx.typeType())
-                end = self._get_location_rule(ctx.varName)
-                expression = jast.Match(
-                    type=self.visitTypeType(ctx.typeType()),
-                    id=self.visitIdentifier(ctx.varName),
-                    lineno=start["lineno"],
-                    col_offset=start["col_offset"],
-                    end_lineno=end["end_lineno"],
-                    end_col_offset=end["end_col_offset"],
+                expression = self._set_location(
+                    jast.Match(
+                        type=self.visitTypeType(ctx.typeType()),
+                        id=self.visitIdentifier(ctx.varName),
+                    ),
+                    ctx.typeType().start,
+                    ctx.varName.stop or ctx.varName.start,
                 )
             return jast.Case(
                 guard=expression,
@@ -1447,37 +1541,43 @@ class JASTConverter(JavaParserVisitor):
 
     def visitMethodCall(self, ctx: JavaParser.MethodCallContext) -> jast.Call:
         if ctx.THIS():
-            function = jast.This(**self._get_location_token(ctx.THIS()))
+            function = self._set_location_token(jast.This(), ctx.THIS())
         elif ctx.SUPER():
-            function = jast.Super(**self._get_location_token(ctx.SUPER()))
+            function = self._set_location_token(jast.Super(), ctx.SUPER())
         else:
-            function = jast.Name(
-                id=self.visitIdentifier(ctx.identifier()),
-                **self._get_location_rule(ctx.identifier()),
+            function = self._set_location_rule(
+                jast.Name(
+                    id=self.visitIdentifier(ctx.identifier()),
+                ),
+                ctx.identifier(),
             )
-        return jast.Call(
-            func=function,
-            args=self.visitArguments(ctx.arguments()),
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Call(
+                func=function,
+                args=self.visitArguments(ctx.arguments()),
+            ),
+            ctx,
         )
 
     def visitPostfixExpression(self, ctx: JavaParser.PostfixExpressionContext):
         if ctx.switchExpression():
-            return self.visitSwitchExpression(ctx.switchExpression())
+            return self._visit_cascade(ctx.switchExpression())
         else:
             if ctx.INC():
                 op = jast.PostInc()
             else:
                 op = jast.PostDec()
-            return jast.PostOp(
-                operand=self.visitPostfixExpression(ctx.postfixExpression()),
-                op=op,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.PostOp(
+                    operand=self.visitPostfixExpression(ctx.postfixExpression()),
+                    op=op,
+                ),
+                ctx,
             )
 
     def visitPrefixExpression(self, ctx: JavaParser.PrefixExpressionContext):
         if ctx.postfixExpression():
-            return self.visitPostfixExpression(ctx.postfixExpression())
+            return self._visit_cascade(ctx.postfixExpression())
         else:
             if ctx.ADD():
                 op = jast.UAdd()
@@ -1491,27 +1591,34 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.Invert()
             else:
                 op = jast.Not()
-            return jast.UnaryOp(
-                operand=self.visitPrefixExpression(ctx.prefixExpression()),
-                op=op,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.UnaryOp(
+                    operand=self.visitPrefixExpression(ctx.prefixExpression()),
+                    op=op,
+                ),
+                ctx,
             )
 
     def visitTypeExpression(self, ctx: JavaParser.TypeExpressionContext) -> jast.expr:
         if ctx.prefixExpression():
-            return self.visitPrefixExpression(ctx.prefixExpression())
+            return self._visit_cascade(ctx.prefixExpression())
         elif ctx.NEW():
             return self.visitCreator(ctx.creator())
         else:
-            return jast.Cast(
-                annotations=[
-                    self.visitAnnotation(annotation) for annotation in ctx.annotation()
-                ],
-                type=jast.typebound(
-                    types=[self.visitTypeType(typeType) for typeType in ctx.typeType()],
+            return self._set_location_rule(
+                jast.Cast(
+                    annotations=[
+                        self.visitAnnotation(annotation)
+                        for annotation in ctx.annotation()
+                    ],
+                    type=jast.typebound(
+                        types=[
+                            self.visitTypeType(typeType) for typeType in ctx.typeType()
+                        ],
+                    ),
+                    value=self.visitTypeExpression(ctx.typeExpression()),
                 ),
-                value=self.visitTypeExpression(ctx.typeExpression()),
-                **self._get_location_rule(ctx),
+                ctx,
             )
 
     def visitMultiplicativeExpression(
@@ -1524,14 +1631,18 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.Div()
             else:
                 op = jast.Mod()
-            return jast.BinOp(
-                left=self.visitMultiplicativeExpression(ctx.multiplicativeExpression()),
-                right=self.visitTypeExpression(ctx.typeExpression()),
-                op=op,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitMultiplicativeExpression(
+                        ctx.multiplicativeExpression()
+                    ),
+                    right=self.visitTypeExpression(ctx.typeExpression()),
+                    op=op,
+                ),
+                ctx,
             )
         else:
-            return self.visitTypeExpression(ctx.typeExpression())
+            return self._visit_cascade(ctx.typeExpression())
 
     def visitAdditiveExpression(
         self, ctx: JavaParser.AdditiveExpressionContext
@@ -1541,16 +1652,18 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.Add()
             else:
                 op = jast.Sub()
-            return jast.BinOp(
-                left=self.visitAdditiveExpression(ctx.additiveExpression()),
-                right=self.visitMultiplicativeExpression(
-                    ctx.multiplicativeExpression()
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitAdditiveExpression(ctx.additiveExpression()),
+                    right=self.visitMultiplicativeExpression(
+                        ctx.multiplicativeExpression()
+                    ),
+                    op=op,
                 ),
-                op=op,
-                **self._get_location_rule(ctx),
+                ctx,
             )
         else:
-            return self.visitMultiplicativeExpression(ctx.multiplicativeExpression())
+            return self._visit_cascade(ctx.multiplicativeExpression())
 
     def visitShiftExpression(self, ctx: JavaParser.ShiftExpressionContext) -> jast.expr:
         if ctx.shiftExpression():
@@ -1560,28 +1673,34 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.RShift()
             else:
                 op = jast.URShift()
-            return jast.BinOp(
-                left=self.visitShiftExpression(ctx.shiftExpression()),
-                right=self.visitAdditiveExpression(ctx.additiveExpression()),
-                op=op,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitShiftExpression(ctx.shiftExpression()),
+                    right=self.visitAdditiveExpression(ctx.additiveExpression()),
+                    op=op,
+                ),
+                ctx,
             )
         else:
-            return self.visitAdditiveExpression(ctx.additiveExpression())
+            return self._visit_cascade(ctx.additiveExpression())
 
     def visitRelationalExpression(
         self, ctx: JavaParser.RelationalExpressionContext
     ) -> jast.expr:
         if ctx.bop:
             if ctx.INSTANCEOF():
-                return jast.InstanceOf(
-                    value=self.visitRelationalExpression(ctx.relationalExpression()),
-                    type=(
-                        self.visitTypeType(ctx.typeType())
-                        if ctx.typeType()
-                        else self.visitPattern(ctx.pattern())
+                return self._set_location_rule(
+                    jast.InstanceOf(
+                        value=self.visitRelationalExpression(
+                            ctx.relationalExpression()
+                        ),
+                        type=(
+                            self.visitTypeType(ctx.typeType())
+                            if ctx.typeType()
+                            else self.visitPattern(ctx.pattern())
+                        ),
                     ),
-                    **self._get_location_rule(ctx),
+                    ctx,
                 )
             else:
                 if ctx.LT():
@@ -1592,14 +1711,16 @@ class JASTConverter(JavaParserVisitor):
                     op = jast.LtE()
                 else:
                     op = jast.GtE()
-                return jast.BinOp(
-                    left=self.visitRelationalExpression(ctx.relationalExpression()),
-                    right=self.visitShiftExpression(ctx.shiftExpression()),
-                    op=op,
-                    **self._get_location_rule(ctx),
+                return self._set_location_rule(
+                    jast.BinOp(
+                        left=self.visitRelationalExpression(ctx.relationalExpression()),
+                        right=self.visitShiftExpression(ctx.shiftExpression()),
+                        op=op,
+                    ),
+                    ctx,
                 )
         else:
-            return self.visitShiftExpression(ctx.shiftExpression())
+            return self._visit_cascade(ctx.shiftExpression())
 
     def visitEqualityExpression(
         self, ctx: JavaParser.EqualityExpressionContext
@@ -1609,79 +1730,91 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.Eq()
             else:
                 op = jast.NotEq()
-            return jast.BinOp(
-                left=self.visitEqualityExpression(ctx.equalityExpression()),
-                right=self.visitRelationalExpression(ctx.relationalExpression()),
-                op=op,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitEqualityExpression(ctx.equalityExpression()),
+                    right=self.visitRelationalExpression(ctx.relationalExpression()),
+                    op=op,
+                ),
+                ctx,
             )
         else:
-            return self.visitRelationalExpression(ctx.relationalExpression())
+            return self._visit_cascade(ctx.relationalExpression())
 
     def visitBitwiseAndExpression(
         self, ctx: JavaParser.BitwiseAndExpressionContext
     ) -> jast.expr:
         if ctx.BITAND():
-            return jast.BinOp(
-                left=self.visitBitwiseAndExpression(ctx.bitwiseAndExpression()),
-                right=self.visitEqualityExpression(ctx.equalityExpression()),
-                op=jast.BitAnd(),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitBitwiseAndExpression(ctx.bitwiseAndExpression()),
+                    right=self.visitEqualityExpression(ctx.equalityExpression()),
+                    op=jast.BitAnd(),
+                ),
+                ctx,
             )
         else:
-            return self.visitEqualityExpression(ctx.equalityExpression())
+            return self._visit_cascade(ctx.equalityExpression())
 
     def visitBitwiseXorExpression(
         self, ctx: JavaParser.BitwiseXorExpressionContext
     ) -> jast.expr:
         if ctx.CARET():
-            return jast.BinOp(
-                left=self.visitBitwiseXorExpression(ctx.bitwiseXorExpression()),
-                right=self.visitBitwiseAndExpression(ctx.bitwiseAndExpression()),
-                op=jast.BitXor(),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitBitwiseXorExpression(ctx.bitwiseXorExpression()),
+                    right=self.visitBitwiseAndExpression(ctx.bitwiseAndExpression()),
+                    op=jast.BitXor(),
+                ),
+                ctx,
             )
         else:
-            return self.visitBitwiseAndExpression(ctx.bitwiseAndExpression())
+            return self._visit_cascade(ctx.bitwiseAndExpression())
 
     def visitBitwiseOrExpression(
         self, ctx: JavaParser.BitwiseOrExpressionContext
     ) -> jast.expr:
         if ctx.BITOR():
-            return jast.BinOp(
-                left=self.visitBitwiseOrExpression(ctx.bitwiseOrExpression()),
-                right=self.visitBitwiseXorExpression(ctx.bitwiseXorExpression()),
-                op=jast.BitOr(),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitBitwiseOrExpression(ctx.bitwiseOrExpression()),
+                    right=self.visitBitwiseXorExpression(ctx.bitwiseXorExpression()),
+                    op=jast.BitOr(),
+                ),
+                ctx,
             )
         else:
-            return self.visitBitwiseXorExpression(ctx.bitwiseXorExpression())
+            return self._visit_cascade(ctx.bitwiseXorExpression())
 
     def visitLogicalAndExpression(
         self, ctx: JavaParser.LogicalAndExpressionContext
     ) -> jast.expr:
         if ctx.AND():
-            return jast.BinOp(
-                left=self.visitLogicalAndExpression(ctx.logicalAndExpression()),
-                right=self.visitBitwiseOrExpression(ctx.bitwiseOrExpression()),
-                op=jast.And(),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitLogicalAndExpression(ctx.logicalAndExpression()),
+                    right=self.visitBitwiseOrExpression(ctx.bitwiseOrExpression()),
+                    op=jast.And(),
+                ),
+                ctx,
             )
         else:
-            return self.visitBitwiseOrExpression(ctx.bitwiseOrExpression())
+            return self._visit_cascade(ctx.bitwiseOrExpression())
 
     def visitLogicalOrExpression(
         self, ctx: JavaParser.LogicalOrExpressionContext
     ) -> jast.expr:
         if ctx.OR():
-            return jast.BinOp(
-                left=self.visitLogicalOrExpression(ctx.logicalOrExpression()),
-                right=self.visitLogicalAndExpression(ctx.logicalAndExpression()),
-                op=jast.Or(),
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.BinOp(
+                    left=self.visitLogicalOrExpression(ctx.logicalOrExpression()),
+                    right=self.visitLogicalAndExpression(ctx.logicalAndExpression()),
+                    op=jast.Or(),
+                ),
+                ctx,
             )
         else:
-            return self.visitLogicalAndExpression(ctx.logicalAndExpression())
+            return self._visit_cascade(ctx.logicalAndExpression())
 
     def visitTernaryExpression(
         self, ctx: JavaParser.TernaryExpressionContext
@@ -1691,14 +1824,16 @@ class JASTConverter(JavaParserVisitor):
                 orelse = self.visitTernaryExpression(ctx.ternaryExpression())
             else:
                 orelse = self.visitLambdaExpression(ctx.lambdaExpression())
-            return jast.IfExp(
-                test=self.visitLogicalOrExpression(ctx.logicalOrExpression()),
-                body=self.visitExpression(ctx.expression()),
-                orelse=orelse,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.IfExp(
+                    test=self.visitLogicalOrExpression(ctx.logicalOrExpression()),
+                    body=self.visitExpression(ctx.expression()),
+                    orelse=orelse,
+                ),
+                ctx,
             )
         else:
-            return self.visitLogicalOrExpression(ctx.logicalOrExpression())
+            return self._visit_cascade(ctx.logicalOrExpression())
 
     def visitAssignmentExpression(
         self, ctx: JavaParser.AssignmentExpressionContext
@@ -1728,20 +1863,48 @@ class JASTConverter(JavaParserVisitor):
                 op = jast.RShift()
             else:
                 op = jast.URShift()
-            return jast.Assign(
-                target=self.visitTernaryExpression(ctx.ternaryExpression()),
-                op=op,
-                value=self.visitExpression(ctx.expression()),
-                **self._get_location_rule(ctx),
-            )
-        else:
-            return self.visitTernaryExpression(ctx.ternaryExpression())
+            return self._set_location_rule(
+                jast.Assign(
+                    target=self.visitTernaryExpression(ctx.ternaryExpression()),
+                    op=op,
+                    value=self.visitExpression(ctx.expression()),
+                ),
+                ctx,
+            )
+        else:
+            return self._visit_cascade(ctx.ternaryExpression())
+
+    _CASCADE = frozenset(
+        {
+            JavaParser.AssignmentExpressionContext,
+            JavaParser.TernaryExpressionContext,
+            JavaParser.LogicalOrExpressionContext,
+            JavaParser.LogicalAndExpressionContext,
+            JavaParser.BitwiseOrExpressionContext,
+            JavaParser.BitwiseXorExpressionContext,
+            JavaParser.BitwiseAndExpressionContext,
+            JavaParser.EqualityExpressionContext,
+            JavaParser.RelationalExpressionContext,
+            JavaParser.ShiftExpressionContext,
+            JavaParser.AdditiveExpressionContext,
+            JavaParser.MultiplicativeExpressionContext,
+            JavaParser.TypeExpressionContext,
+            JavaParser.PrefixExpressionContext,
+            JavaParser.PostfixExpressionContext,
+            JavaParser.SwitchExpressionContext,
+        }
+    )
+
+    def _visit_cascade(self, ctx: ParserRuleContext) -> jast.expr:
+        # skip all levels of the expression precedence cascade that only wrap a single
+        # sub-expression, which is the case for most operands
+        cascade = self._CASCADE
+        while type(ctx) in cascade and ctx.children and len(ctx.children) == 1:
+            ctx = ctx.children[0]
+        return ctx.accept(self)
 
     def visitExpression(self, ctx: JavaParser.ExpressionContext) -> jast.expr:
-        if ctx.assignmentExpression():
-            return self.visitAssignmentExpression(ctx.assignmentExpression())
-        else:
-            return self.visitLambdaExpression(ctx.lambdaExpression())
+        return self._visit_cascade(ctx.getChild(0))
 
     def visitPattern(self, ctx: JavaParser.PatternContext) -> jast.pattern:
         return jast.pattern(
@@ -1759,10 +1922,12 @@ class JASTConverter(JavaParserVisitor):
     def visitLambdaExpression(self, ctx: JavaParser.LambdaExpressionContext):
         parameters = self.visitLambdaParameters(ctx.lambdaParameters())
         body = self.visitLambdaBody(ctx.lambdaBody())
-        return jast.Lambda(
-            args=parameters,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Lambda(
+                args=parameters,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitLambdaParameters(
@@ -1796,100 +1961,111 @@ class JASTConverter(JavaParserVisitor):
         return self.visitExpression(ctx.expression())
 
     def visitThisExpression(self, ctx: JavaParser.ThisExpressionContext) -> jast.This:
-        return jast.This(**self._get_location_rule(ctx))
+        return self._set_location_rule(jast.This(), ctx)
 
     def visitSuperExpression(
         self, ctx: JavaParser.SuperExpressionContext
     ) -> jast.Super:
-        return jast.Super(**self._get_location_rule(ctx))
+        return self._set_location_rule(jast.Super(), ctx)
 
     def visitLiteralExpression(
         self, ctx: JavaParser.LiteralExpressionContext
     ) -> jast.Constant:
-        return jast.Constant(
-            value=self.visitLiteral(ctx.literal()),
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Constant(
+                value=self.visitLiteral(ctx.literal()),
+            ),
+            ctx,
         )
 
     def visitIdentifierExpression(
         self, ctx: JavaParser.IdentifierExpressionContext
     ) -> jast.Name:
-        return jast.Name(
-            id=self.visitIdentifier(ctx.identifier()),
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Name(
+                id=self.visitIdentifier(ctx.identifier()),
+            ),
+            ctx,
         )
 
     def visitClassExpression(
         self, ctx: JavaParser.ClassExpressionContext
     ) -> jast.ClassExpr:
-        return jast.ClassExpr(
-            type=self.visitTypeTypeOrVoid(ctx.typeTypeOrVoid()),
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.ClassExpr(
+                type=self.visitTypeTypeOrVoid(ctx.typeTypeOrVoid()),
+            ),
+            ctx,
         )
 
     def visitExplicitGenericInvocationExpression(
         self, ctx: JavaParser.ExplicitGenericInvocationExpressionContext
     ) -> jast.ExplicitGenericInvocation:
         if ctx.THIS():
-            location = self._get_location_rule(ctx)
-            start = self._get_location_token(ctx.THIS())
-            location["lineno"] = start["lineno"]
-            location["col_offset"] = start["col_offset"]
-            expression = jast.Call(
-                func=jast.This(
-                    **start,
+            expression = self._set_location(
+                jast.Call(
+                    func=self._set_location_token(jast.This(), ctx.THIS()),
+                    args=self.visitArguments(ctx.arguments()),
                 ),
-                args=self.visitArguments(ctx.arguments()),
-                **location,
+                ctx.THIS().symbol,
+                ctx.stop or ctx.start,
             )
         else:
             expression = self.visitExplicitGenericInvocationSuffix(
                 ctx.explicitGenericInvocationSuffix()
             )
-        return jast.ExplicitGenericInvocation(
-            type_args=self.visitNonWildcardTypeArguments(
-                ctx.nonWildcardTypeArguments()
+        return self._set_location_rule(
+            jast.ExplicitGenericInvocation(
+                type_args=self.visitNonWildcardTypeArguments(
+                    ctx.nonWildcardTypeArguments()
+                ),
+                value=expression,
             ),
-            value=expression,
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitArrayAccessExpression(self, ctx: JavaParser.ArrayAccessExpressionContext):
-        return jast.Subscript(
-            value=self.visit(ctx.primary()),
-            index=self.visitExpression(ctx.expression()),
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Subscript(
+                value=self.visit(ctx.primary()),
+                index=self.visitExpression(ctx.expression()),
+            ),
+            ctx,
         )
 
     def visitMemberReferenceExpression(
         self, ctx: JavaParser.MemberReferenceExpressionContext
     ):
         if ctx.THIS():
-            expr = jast.This(**self._get_location_token(ctx.THIS()))
+            expr = self._set_location_token(jast.This(), ctx.THIS())
         elif ctx.superSuffix():
             expr = self.visitSuperSuffix(ctx.superSuffix())
         elif ctx.NEW():
-            start = self._get_location_token(ctx.NEW())
             expr = self.visitInnerCreator(ctx.innerCreator())
             if ctx.nonWildcardTypeArguments():
                 expr.type_args = self.visitNonWildcardTypeArguments(
                     ctx.nonWildcardTypeArguments()
                 )
-            expr.lineno = start["lineno"]
-            expr.col_offset = start["col_offset"]
+            start = ctx.NEW().symbol
+            expr.lineno = start.line
+            expr.col_offset = start.column
         elif ctx.identifier():
-            expr = jast.Name(
-                id=self.visitIdentifier(ctx.identifier()),
-                **self._get_location_rule(ctx.identifier()),
+            expr = self._set_location_rule(
+                jast.Name(
+                    id=self.visitIdentifier(ctx.identifier()),
+                ),
+                ctx.identifier(),
             )
         elif ctx.methodCall():
             expr = self.visitMethodCall(ctx.methodCall())
         else:
             expr = self.visitExplicitGenericInvocation(ctx.explicitGenericInvocation())
-        return jast.Member(
-            value=self.visit(ctx.primary()),
-            member=expr,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.Member(
+                value=self.visit(ctx.primary()),
+                member=expr,
+            ),
+            ctx,
         )
 
     def visitMethodCallExpression(
@@ -1906,16 +2082,18 @@ class JASTConverter(JavaParserVisitor):
             expr = self.visitTypeType(ctx.typeType())
         else:
             expr = self.visitClassType(ctx.classType())
-        return jast.Reference(
-            type=expr,
-            type_args=(
-                self.visitTypeArguments(ctx.typeArguments())
-                if ctx.typeArguments()
-                else None
+        return self._set_location_rule(
+            jast.Reference(
+                type=expr,
+                type_args=(
+                    self.visitTypeArguments(ctx.typeArguments())
+                    if ctx.typeArguments()
+                    else None
+                ),
+                id=self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None,
+                new=ctx.NEW() is not None,
             ),
-            id=self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None,
-            new=ctx.NEW() is not None,
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitSwitchExpression(
@@ -1924,13 +2102,15 @@ class JASTConverter(JavaParserVisitor):
         if ctx.primary():
             return self.visit(ctx.primary())
         else:
-            return jast.SwitchExp(
-                value=self.visitParExpression(ctx.parExpression()),
-                rules=[
-                    self.visitSwitchLabeledRule(switchRule)
-                    for switchRule in ctx.switchLabeledRule()
-                ],
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.SwitchExp(
+                    value=self.visitParExpression(ctx.parExpression()),
+                    rules=[
+                        self.visitSwitchLabeledRule(switchRule)
+                        for switchRule in ctx.switchLabeledRule()
+                    ],
+                ),
+                ctx,
             )
 
     def visitSwitchLabeledRule(
@@ -1946,11 +2126,13 @@ class JASTConverter(JavaParserVisitor):
             cases = None
             label = jast.ExpDefault()
         body = self.visitSwitchRuleOutcome(ctx.switchRuleOutcome())
-        return jast.switchexprule(
-            label=label,
-            cases=cases,
-            body=body,
-            **self._get_location_rule(ctx),
+        return self._set_location_rule(
+            jast.switchexprule(
+                label=label,
+                cases=cases,
+                body=body,
+            ),
+            ctx,
         )
 
     def visitGuardedPattern(
@@ -2023,16 +2205,18 @@ class JASTConverter(JavaParserVisitor):
     def visitObjectCreator(
         self, ctx: JavaParser.ObjectCreatorContext
     ) -> jast.NewObject:
-        return jast.NewObject(
-            type_args=(
-                self.visitNonWildcardTypeArguments(ctx.nonWildcardTypeArguments())
-                if ctx.nonWildcardTypeArguments()
-                else None
+        return self._set_location_rule(
+            jast.NewObject(
+                type_args=(
+                    self.visitNonWildcardTypeArguments(ctx.nonWildcardTypeArguments())
+                    if ctx.nonWildcardTypeArguments()
+                    else None
+                ),
+                type=self.visitCreatedName(ctx.createdName()),
+                args=self.visitArguments(ctx.arguments()),
+                body=self.visitClassBody(ctx.classBody()) if ctx.classBody() else None,
             ),
-            type=self.visitCreatedName(ctx.createdName()),
-            args=self.visitArguments(ctx.arguments()),
-            body=self.visitClassBody(ctx.classBody()) if ctx.classBody() else None,
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitCreatedName(self, ctx: JavaParser.CreatedNameContext) -> jast.jtype:
@@ -2056,49 +2240,55 @@ class JASTConverter(JavaParserVisitor):
         )
 
     def visitInnerCreator(self, ctx: JavaParser.InnerCreatorContext) -> jast.NewObject:
-        return jast.NewObject(
-            type=jast.Coit(
-                id=self.visitIdentifier(ctx.identifier()),
-                type_args=(
-                    self.visitNonWildcardTypeArgumentsOrDiamond(
-                        ctx.nonWildcardTypeArgumentsOrDiamond()
-                    )
-                    if ctx.nonWildcardTypeArgumentsOrDiamond()
-                    else None
+        return self._set_location_rule(
+            jast.NewObject(
+                type=jast.Coit(
+                    id=self.visitIdentifier(ctx.identifier()),
+                    type_args=(
+                        self.visitNonWildcardTypeArgumentsOrDiamond(
+                            ctx.nonWildcardTypeArgumentsOrDiamond()
+                        )
+                        if ctx.nonWildcardTypeArgumentsOrDiamond()
+                        else None
+                    ),
                 ),
+                args=self.visitArguments(ctx.arguments()),
+                body=self.visitClassBody(ctx.classBody()) if ctx.classBody() else None,
             ),
-            args=self.visitArguments(ctx.arguments()),
-            body=self.visitClassBody(ctx.classBody()) if ctx.classBody() else None,
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitDimExpr(self, ctx: JavaParser.DimExprContext) -> jast.expr:
         return self.visitExpression(ctx.expression())
 
     def visitArrayCreator(self, ctx: JavaParser.ArrayCreatorContext) -> jast.NewArray:
-        return jast.NewArray(
-            type=self.visitCreatedName(ctx.createdName()),
-            expr_dims=[self.visitDimExpr(dimExpr) for dimExpr in ctx.dimExpr()],
-            dims=self.visitDims(ctx.dims()) if ctx.dims() else None,
-            init=(
-                self.visitArrayInitializer(ctx.arrayInitializer())
-                if ctx.arrayInitializer()
-                else None
+        return self._set_location_rule(
+            jast.NewArray(
+                type=self.visitCreatedName(ctx.createdName()),
+                expr_dims=[self.visitDimExpr(dimExpr) for dimExpr in ctx.dimExpr()],
+                dims=self.visitDims(ctx.dims()) if ctx.dims() else None,
+                init=(
+                    self.visitArrayInitializer(ctx.arrayInitializer())
+                    if ctx.arrayInitializer()
+                    else None
+                ),
             ),
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitExplicitGenericInvocation(
         self, ctx: JavaParser.ExplicitGenericInvocationContext
     ) -> jast.ExplicitGenericInvocation:
-        return jast.ExplicitGenericInvocation(
-            type_args=self.visitNonWildcardTypeArguments(
-                ctx.nonWildcardTypeArguments()
-            ),
-            value=self.visitExplicitGenericInvocationSuffix(
-                ctx.explicitGenericInvocationSuffix()
+        return self._set_location_rule(
+            jast.ExplicitGenericInvocation(
+                type_args=self.visitNonWildcardTypeArguments(
+                    ctx.nonWildcardTypeArguments()
+                ),
+                value=self.visitExplicitGenericInvocationSuffix(
+                    ctx.explicitGenericInvocationSuffix()
+                ),
             ),
-            **self._get_location_rule(ctx),
+            ctx,
         )
 
     def visitTypeArgumentsOrDiamond(
@@ -2176,25 +2366,30 @@ class JASTConverter(JavaParserVisitor):
         )
 
     def visitSuperSuffix(self, ctx: JavaParser.SuperSuffixContext) -> jast.Super:
-        location = self._get_location_token(ctx.SUPER())
+        start = ctx.SUPER().symbol
         if ctx.identifier():
-            end = self._get_location_rule(ctx.identifier())
-            location["end_lineno"] = end["end_lineno"]
-            location["end_col_offset"] = end["end_col_offset"]
-        expr = jast.Super(
-            type_args=(
-                self.visitTypeArguments(ctx.typeArguments())
-                if ctx.typeArguments()
-                else None
+            stop = ctx.identifier().stop or ctx.identifier().start
+        else:
+            stop = start
+        expr = self._set_location(
+            jast.Super(
+                type_args=(
+                    self.visitTypeArguments(ctx.typeArguments())
+                    if ctx.typeArguments()
+                    else None
+                ),
+                id=self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None,
             ),
-            id=self.visitIdentifier(ctx.identifier()) if ctx.identifier() else None,
-            **location,
+            start,
+            stop,
         )
         if ctx.arguments():
-            expr = jast.Call(
-                func=expr,
-                args=self.visitArguments(ctx.arguments()),
-                **self._get_location_rule(ctx),
+            expr = self._set_location_rule(
+                jast.Call(
+                    func=expr,
+                    args=self.visitArguments(ctx.arguments()),
+                ),
+                ctx,
             )
         return expr
 
@@ -2204,13 +2399,17 @@ class JASTConverter(JavaParserVisitor):
         if ctx.superSuffix():
             return self.visitSuperSuffix(ctx.superSuffix())
         else:
-            return jast.Call(
-                func=jast.Name(
-                    id=self.visitIdentifier(ctx.identifier()),
-                    **self._get_location_rule(ctx.identifier()),
+            return self._set_location_rule(
+                jast.Call(
+                    func=self._set_location_rule(
+                        jast.Name(
+                            id=self.visitIdentifier(ctx.identifier()),
+                        ),
+                        ctx.identifier(),
+                    ),
+                    args=self.visitArguments(ctx.arguments()),
                 ),
-                args=self.visitArguments(ctx.arguments()),
-                **self._get_location_rule(ctx),
+                ctx,
             )
 
     def visitArguments(self, ctx: JavaParser.ArgumentsContext) -> List[jast.expr]:
@@ -2238,10 +2437,12 @@ class JASTConverter(JavaParserVisitor):
                 ctx.interfaceMethodDeclaration()
             )
         elif ctx.block():
-            return jast.Initializer(
-                body=self.visitBlock(ctx.block()),
-                static=ctx.STATIC() is not None,
-                **self._get_location_rule(ctx),
+            return self._set_location_rule(
+                jast.Initializer(
+                    body=self.visitBlock(ctx.block()),
+                    static=ctx.STATIC() is not None,
+                ),
+                ctx,
             )
         elif ctx.constructorDeclaration():
             decl = self.visitConstructorDeclaration(ctx.constructorDeclaration())
@@ -2264,7 +2465,7 @@ class JASTConverter(JavaParserVisitor):
         elif ctx.recordDeclaration():
             decl = self.visitRecordDeclaration(ctx.recordDeclaration())
         else:
-            decl = jast.EmptyDecl(**self._get_location_rule(ctx))
+            decl = self._set_location_rule(jast.EmptyDecl(), ctx)
         if ctx.modifier():
             modifiers = [self.visitModifier(modifier) for modifier in ctx.modifier()]
             setattr(decl, "modifiers", modifiers)
@@ -2278,3 +2479,112 @@ class JASTConverter(JavaParserVisitor):
 
     def visitDirectiveStart(self, ctx: JavaParser.DirectiveStartContext):
         return self.visitModuleDirective(ctx.moduleDirective())
+
+
+class JASTRecoveringConverter(JASTConverter):
+    """
+    Converts parse trees that were recovered from syntax errors. Every member that
+    contains an error is converted into an `ErrorDecl` keeping its source text.
+    """
+
+    MEMBERS = (
+        JavaParser.PackageDeclarationContext,
+        JavaParser.ImportDeclarationContext,
+        JavaParser.ModuleDeclarationContext,
+        JavaParser.TypeDeclarationContext,
+        JavaParser.ClassBodyDeclarationContext,
+        JavaParser.InterfaceBodyDeclarationContext,
+        JavaParser.AnnotationTypeElementDeclarationContext,
+        JavaParser.RecordBodyDeclarationContext,
+        JavaParser.DeclarationStartContext,
+    )
+
+    BODIES = (
+        JavaParser.OrdinaryCompilationUnitContext,
+        JavaParser.ModularCompilationUnitContext,
+        JavaParser.ClassBodyContext,
+        JavaParser.InterfaceBodyContext,
+        JavaParser.EnumBodyDeclarationsContext,
+        JavaParser.AnnotationTypeBodyContext,
+        JavaParser.RecordBodyContext,
+    )
+
+    def __init__(self, errors: Set[int]):
+        """
+        :param errors:  The ids of the member contexts that contain an error.
+        """
+        self.errors = errors
+
+    @staticmethod
+    def _error(ctx: ParserRuleContext) -> jast.ErrorDecl:
+        start = ctx.start
+        stop = ctx.stop
+        if stop is None or stop.tokenIndex < start.tokenIndex:
+            stop = start
+        return jast.ErrorDecl(
+            text=start.getInputStream().getText(start.start, stop.stop),
+            lineno=start.line,
+            col_offset=start.column,
+            end_lineno=stop.line,
+            end_col_offset=stop.column,
+        )
+
+    # the errors of converting a parse tree with missing children
+    INCOMPLETE = (AttributeError, TypeError, IndexError)
+
+    @staticmethod
+    def incomplete(ctx: ParserRuleContext) -> bool:
+        """
+        Whether a parse tree contains a token or a rule that the error strategy
+        inserted, skipped or could not match.
+        """
+        stack = [ctx]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ErrorNode):
+                return True
+            if isinstance(node, ParserRuleContext):
+                if node.exception is not None:
+                    return True
+                stack.extend(node.children or ())
+        return False
+
+    def _recover(self, visit, ctx: ParserRuleContext) -> jast.JAST:
+        if id(ctx) in self.errors:
+            return self._error(ctx)
+        try:
+            return visit(self, ctx)
+        except self.INCOMPLETE:
+            # the recovered parse tree may still be incomplete in ways the error
+            # strategy did not attribute to this member, e.g., a missing child after
+            # a resync, but a complete member failing to convert is a bug
+            if not self.incomplete(ctx):
+                raise
+            return self._error(ctx)
+
+    def visitPackageDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitPackageDeclaration, ctx)
+
+    def visitImportDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitImportDeclaration, ctx)
+
+    def visitModuleDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitModuleDeclaration, ctx)
+
+    def visitTypeDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitTypeDeclaration, ctx)
+
+    def visitClassBodyDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitClassBodyDeclaration, ctx)
+
+    def visitInterfaceBodyDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitInterfaceBodyDeclaration, ctx)
+
+    def visitAnnotationTypeElementDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitAnnotationTypeElementDeclaration, ctx)
+
+    def visitRecordBodyDeclaration(self, ctx):
+        return self._recover(JASTConverter.visitRecordBodyDeclaration, ctx)
+
+    def visitDeclarationStart(self, ctx):
+        return self._recover(JASTConverter.visitDeclarationStart, ctx)
@@ -0,0 +1,157 @@
+"""
+Profiling of the decisions of the generated parser.
+
+ANTLR's Python runtime has no profiling simulator, so `ProfilingATNSimulator` records
+what its Java counterpart does: the time spent in each decision, the lookahead depth
+of SLL and full LL prediction, and the fallbacks to full LL prediction, ambiguities
+and context sensitivities.
+"""
+
+import time
+from typing import Iterable, List
+
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.InputStream import InputStream
+from antlr4.PredictionContext import PredictionContextCache
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.dfa.DFA import DFA
+from antlr4.error.Errors import RecognitionException
+
+from jast._parse import ParseMode, _ENTRY_RULES, _SimpleErrorListener, _parse_mode
+from jast._parser.JavaParser import JavaParser
+from jast._parser._sync import java_lexer
+
+
+class DecisionInfo:
+    """
+    The profile of a single decision of the parser. The times are in nanoseconds and
+    the lookahead depths in tokens.
+    """
+
+    def __init__(self, decision: int, rule: str, alternatives: int):
+        """
+        :param decision:        The decision number in the ATN of the parser.
+        :param rule:            The name of the grammar rule containing the decision.
+        :param alternatives:    The number of alternatives of the decision.
+        """
+        self.decision = decision
+        self.rule = rule
+        self.alternatives = alternatives
+        self.invocations = 0
+        self.time = 0
+        self.sll_lookahead = 0
+        self.sll_max_lookahead = 0
+        self.ll_fallbacks = 0
+        self.ll_lookahead = 0
+        self.ll_max_lookahead = 0
+        self.ambiguities = 0
+        self.context_sensitivities = 0
+        self.errors = 0
+
+    @property
+    def mean_lookahead(self) -> float:
+        return self.sll_lookahead / self.invocations if self.invocations else 0.0
+
+    @property
+    def max_lookahead(self) -> int:
+        return max(self.sll_max_lookahead, self.ll_max_lookahead)
+
+    def __repr__(self):
+        return (
+            f"DecisionInfo({self.decision}, {self.rule!r}, "
+            f"invocations={self.invocations}, time={self.time}, "
+            f"max_lookahead={self.max_lookahead}, ll_fallbacks={self.ll_fallbacks})"
+        )
+
+
+class ProfilingATNSimulator(ParserATNSimulator):
+    def __init__(self, parser: JavaParser, decisions: List[DecisionInfo], dfas: list):
+        super().__init__(parser, parser.atn, dfas, PredictionContextCache())
+        self.decisions = decisions
+        self._sll_stop = -1
+        self._ll_stop = -1
+
+    def adaptivePredict(self, input, decision, outerContext):
+        info = self.decisions[decision]
+        self._sll_stop = self._ll_stop = -1
+        start = time.perf_counter_ns()
+        try:
+            return super().adaptivePredict(input, decision, outerContext)
+        except RecognitionException:
+            info.errors += 1
+            raise
+        finally:
+            info.time += time.perf_counter_ns() - start
+            info.invocations += 1
+            if self._sll_stop >= 0:
+                lookahead = self._sll_stop - self._startIndex + 1
+                info.sll_lookahead += lookahead
+                info.sll_max_lookahead = max(info.sll_max_lookahead, lookahead)
+            if self._ll_stop >= 0:
+                lookahead = self._ll_stop - self._startIndex + 1
+                info.ll_lookahead += lookahead
+                info.ll_max_lookahead = max(info.ll_max_lookahead, lookahead)
+
+    def execATN(self, dfa, s0, input, startIndex, outerContext):
+        alt = super().execATN(dfa, s0, input, startIndex, outerContext)
+        if self._sll_stop < 0:
+            self._sll_stop = input.index
+        return alt
+
+    def execATNWithFullContext(self, dfa, D, s0, input, startIndex, outerContext):
+        alt = super().execATNWithFullContext(
+            dfa, D, s0, input, startIndex, outerContext
+        )
+        self._ll_stop = input.index
+        return alt
+
+    def reportAttemptingFullContext(
+        self, dfa, conflictingAlts, configs, startIndex, stopIndex
+    ):
+        self.decisions[dfa.decision].ll_fallbacks += 1
+        self._sll_stop = stopIndex
+        super().reportAttemptingFullContext(
+            dfa, conflictingAlts, configs, startIndex, stopIndex
+        )
+
+    def reportContextSensitivity(self, dfa, prediction, configs, startIndex, stopIndex):
+        self.decisions[dfa.decision].context_sensitivities += 1
+        super().reportContextSensitivity(
+            dfa, prediction, configs, startIndex, stopIndex
+        )
+
+    def reportAmbiguity(self, dfa, D, startIndex, stopIndex, exact, ambigAlts, configs):
+        self.decisions[dfa.decision].ambiguities += 1
+        super().reportAmbiguity(
+            dfa, D, startIndex, stopIndex, exact, ambigAlts, configs
+        )
+
+
+def profile(
+    sources: Iterable[str], mode: ParseMode | str | int = ParseMode.UNIT
+) -> List[DecisionInfo]:
+    """
+    Profile the decisions of the parser while parsing sources. The parser starts with
+    empty DFA caches, which are shared by all sources, so the profile includes building
+    the caches and does not depend on earlier parses.
+    :param sources: The Java sources.
+    :param mode:    The parse mode used to identify the java code.
+    :return:        The profile of every decision, indexed by decision number.
+    """
+    atn = JavaParser.atn
+    decisions = [
+        DecisionInfo(
+            decision, JavaParser.ruleNames[state.ruleIndex], len(state.transitions)
+        )
+        for decision, state in enumerate(atn.decisionToState)
+    ]
+    dfas = [DFA(state, decision) for decision, state in enumerate(atn.decisionToState)]
+    entry_rule_name = _ENTRY_RULES[_parse_mode(mode)]
+    listener = _SimpleErrorListener()
+    for src in sources:
+        parser = JavaParser(CommonTokenStream(java_lexer(InputStream(src), listener)))
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+        parser._interp = ProfilingATNSimulator(parser, decisions, dfas)
+        getattr(parser, entry_rule_name)()
+    return decisions
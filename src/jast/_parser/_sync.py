@@ -0,0 +1,78 @@
+"""
+Thread-safe construction of the generated lexer and parser.
+
+All instances of the generated recognizers share the DFA caches of their class and the
+prediction context cache of the parser. ANTLR's Python runtime grows these caches
+without synchronization, so the simulators installed here serialize all writes behind
+one lock. Predictions that hit the DFA only read the caches and never take the lock.
+"""
+
+import threading
+
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.InputStream import InputStream
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.error.ErrorListener import ErrorListener
+
+from jast._parser.JavaLexer import JavaLexer
+from jast._parser.JavaParser import JavaParser
+
+# reentrant, since adding an edge adds its target state
+_lock = threading.RLock()
+
+
+class _LockingLexerATNSimulator(LexerATNSimulator):
+    def addDFAEdge(self, from_, tk, to=None, cfgs=None):
+        with _lock:
+            return super().addDFAEdge(from_, tk, to, cfgs)
+
+    def addDFAState(self, configs):
+        with _lock:
+            return super().addDFAState(configs)
+
+
+class _LockingParserATNSimulator(ParserATNSimulator):
+    def addDFAEdge(self, dfa, from_, t, to):
+        with _lock:
+            return super().addDFAEdge(dfa, from_, t, to)
+
+    def addDFAState(self, dfa, D):
+        with _lock:
+            return super().addDFAState(dfa, D)
+
+
+def java_lexer(stream: InputStream, listener: ErrorListener = None) -> JavaLexer:
+    """
+    Create a lexer that can run concurrently with other lexers.
+    :param stream:      The input stream to lex.
+    :param listener:    The error listener replacing the default console listener.
+    :return:            The lexer.
+    """
+    lexer = JavaLexer(stream)
+    lexer._interp = _LockingLexerATNSimulator(
+        lexer, lexer.atn, lexer.decisionsToDFA, lexer._interp.sharedContextCache
+    )
+    if listener is not None:
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(listener)
+    return lexer
+
+
+def java_parser(
+    tokens: CommonTokenStream, listener: ErrorListener = None
+) -> JavaParser:
+    """
+    Create a parser that can run concurrently with other parsers.
+    :param tokens:      The token stream to parse.
+    :param listener:    The error listener replacing the default console listener.
+    :return:            The parser.
+    """
+    parser = JavaParser(tokens)
+    parser._interp = _LockingParserATNSimulator(
+        parser, parser.atn, parser.decisionsToDFA, parser.sharedContextCache
+    )
+    if listener is not None:
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+    return parser
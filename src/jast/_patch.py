@@ -0,0 +1,249 @@
+"""
+Batched rendering of many variants of a single base tree.
+
+Variants are described as lists of edits against the nodes of the base tree. Only the
+path from the root to the edited nodes is copied for each variant, and the rendered
+text of every unchanged statement and declaration is reused from a cache.
+"""
+
+from copy import copy
+from typing import List, Iterable, Dict, Tuple, Optional
+
+import jast._jast as jast
+
+from jast._unparse import _Unparser
+
+
+class Edit:
+    """
+    Abstract base class for edits applied to a base tree.
+    """
+
+    pass
+
+
+class Replacement(Edit):
+    """
+    Replace a node of the base tree with another node.
+    """
+
+    def __init__(self, target: jast.JAST, node: jast.JAST):
+        """
+        :param target:  The node of the base tree to replace.
+        :param node:    The replacement node.
+        """
+        self.target = target
+        self.node = node
+
+
+class Deletion(Edit):
+    """
+    Delete a node of the base tree. Deleting a node that is not part of a list field
+    sets the field to None.
+    """
+
+    def __init__(self, target: jast.JAST):
+        """
+        :param target:  The node of the base tree to delete.
+        """
+        self.target = target
+
+
+class Insertion(Edit):
+    """
+    Insert a node into a list field of a node of the base tree.
+    """
+
+    def __init__(self, parent: jast.JAST, field: str, index: int, node: jast.JAST):
+        """
+        :param parent:  The node of the base tree holding the list.
+        :param field:   The name of the list field.
+        :param index:   The index in the original list before which the node is
+                        inserted.
+        :param node:    The node to insert.
+        """
+        self.parent = parent
+        self.field = field
+        self.index = index
+        self.node = node
+
+
+_CACHED = (
+    jast.stmt,
+    jast.declaration,
+    jast.directive,
+    jast.switchgroup,
+    jast.switchexprule,
+)
+
+
+class _CachingUnparser(_Unparser):
+    def __init__(self, indent: int, base: Dict[int, jast.JAST]):
+        super().__init__(indent=indent)
+        self._base = base
+        self._cache = {}
+
+    def reset(self):
+        self._source = []
+        self._indent = 0
+        self._precedences = {}
+        self._no_fill = False
+        self._double_fill = False
+
+    def visit(self, node):
+        if node is None:
+            return
+        if not isinstance(node, _CACHED) or id(node) not in self._base:
+            return super().visit(node)
+        key = (
+            id(node),
+            self._indent,
+            self._no_fill,
+            self._double_fill,
+            bool(self._source),
+        )
+        hit = self._cache.get(key)
+        if hit is not None:
+            text, self._double_fill = hit
+            self.write(text)
+            return
+        source, start = self._source, len(self._source)
+        super().visit(node)
+        if self._source is source:
+            text = "".join(source[start:])
+            del source[start:]
+            self.write(text)
+            self._cache[key] = text, self._double_fill
+
+
+class PatchRenderer:
+    """
+    Renders variants of a base tree, reusing the output of unchanged regions.
+
+    The base tree must not be modified while the renderer is in use.
+    """
+
+    def __init__(self, tree: jast.JAST, indent: int = 4):
+        """
+        :param tree:    The base tree.
+        :param indent:  The indent used for unparsing.
+        """
+        self.tree = tree
+        self._nodes: Dict[int, jast.JAST] = {}
+        self._parents: Dict[int, Tuple[jast.JAST, str, Optional[int]]] = {}
+        self._index(tree)
+        self._unparser = _CachingUnparser(indent, self._nodes)
+
+    def _index(self, tree: jast.JAST):
+        self._nodes[id(tree)] = tree
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            for field, value in list(vars(node).items()):
+                if isinstance(value, list):
+                    for index, child in enumerate(value):
+                        if (
+                            isinstance(child, jast.JAST)
+                            and id(child) not in self._nodes
+                        ):
+                            self._nodes[id(child)] = child
+                            self._parents[id(child)] = node, field, index
+                            stack.append(child)
+                elif isinstance(value, jast.JAST) and id(value) not in self._nodes:
+                    self._nodes[id(value)] = value
+                    self._parents[id(value)] = node, field, None
+                    stack.append(value)
+
+    def _locate(self, target: jast.JAST) -> Tuple[jast.JAST, str, Optional[int]]:
+        try:
+            return self._parents[id(target)]
+        except KeyError:
+            raise jast.JASTError(f"{target!r} is not a child node of the base tree")
+
+    def apply(self, edits: Iterable[Edit]) -> jast.JAST:
+        """
+        Apply edits to the base tree without modifying it. Only the nodes on the paths
+        from the root to the edited nodes are copied, all other nodes are shared.
+        :param edits:   The edits to apply.
+        :return:        The root of the variant tree.
+        """
+        # (id(parent), field) -> index -> (inserted nodes, replacements), where the
+        # index is None for fields that do not hold a list
+        changes: Dict[Tuple[int, str], Dict[Optional[int], Tuple[List, List]]] = {}
+        affected = set()
+        for edit in edits:
+            if isinstance(edit, Insertion):
+                parent, field, index = edit.parent, edit.field, edit.index
+                if id(parent) not in self._nodes:
+                    raise jast.JASTError(f"{parent!r} is not a node of the base tree")
+                if not isinstance(getattr(parent, field, None), list):
+                    raise jast.JASTError(f"{field} is not a list field of {parent!r}")
+            elif isinstance(edit, (Replacement, Deletion)):
+                parent, field, index = self._locate(edit.target)
+            else:
+                raise jast.JASTError(f"unsupported edit {edit!r}")
+            inserted, replaced = changes.setdefault((id(parent), field), {}).setdefault(
+                index, ([], [])
+            )
+            if isinstance(edit, Insertion):
+                inserted.append(edit.node)
+            elif isinstance(edit, Replacement):
+                replaced.append(edit.node)
+            else:
+                replaced.append(None)
+            while id(parent) not in affected:
+                affected.add(id(parent))
+                if parent is self.tree:
+                    break
+                parent = self._locate(parent)[0]
+        return self._rebuild(self.tree, changes, affected)
+
+    def _rebuild(self, node: jast.JAST, changes: Dict, affected: set) -> jast.JAST:
+        if id(node) not in affected:
+            return node
+        new = copy(node)
+        for field, value in list(vars(node).items()):
+            change = changes.get((id(node), field), {})
+            if isinstance(value, list):
+                new_value = []
+                for index, child in enumerate(value):
+                    inserted, replaced = change.get(index, ((), ()))
+                    new_value.extend(inserted)
+                    if replaced:
+                        if replaced[-1] is not None:
+                            new_value.append(replaced[-1])
+                    else:
+                        new_value.append(self._rebuild(child, changes, affected))
+                new_value.extend(change.get(len(value), ((), ()))[0])
+                setattr(new, field, new_value)
+            elif isinstance(value, jast.JAST):
+                if None in change:
+                    setattr(new, field, change[None][1][-1])
+                else:
+                    setattr(new, field, self._rebuild(value, changes, affected))
+        return new
+
+    def render(self, edits: Iterable[Edit] = ()) -> str:
+        """
+        Render the source text of a variant of the base tree.
+        :param edits:   The edits describing the variant.
+        :return:        The unparsed source of the variant.
+        """
+        self._unparser.reset()
+        return self._unparser.unparse(self.apply(edits))
+
+
+def unparse_variants(
+    tree: jast.JAST, variants: Iterable[Iterable[Edit]], indent: int = 4
+) -> List[str]:
+    """
+    Unparse many variants of a base tree. The result is identical to applying the edits
+    of each variant to a copy of the tree and unparsing it, but shared regions are only
+    rendered once.
+    :param tree:        The base tree.
+    :param variants:    The variants, each given as a list of edits.
+    :param indent:      The indent used for unparsing.
+    :return:            The source of each variant.
+    """
+    renderer = PatchRenderer(tree, indent=indent)
+    return [renderer.render(edits) for edits in variants]
@@ -0,0 +1,307 @@
+"""
+Declarative pattern matching for jAST trees.
+
+A pattern is a jAST template in which `Capture` matches any node and binds it to a
+name, and `Many` matches any number of elements of a list. Templates can also be
+parsed from Java code, where `$x` is a capture and `$$x` matches many elements. The
+templates are compiled into matcher functions, and a `PatternMatcher` indexes its
+patterns by the class of their root node, so that all patterns are matched in a
+single traversal of a tree.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from jast._jast import JAST, Coit, Expr, Name, _ATTRIBUTES, dump, identifier, literal
+
+# a compiled pattern, which tests a value and adds the captured values to a dict
+_Matcher = Callable[[Any, Dict[str, Any]], bool]
+
+
+class Capture:
+    """
+    Matches any value, or any value matching a pattern, in a template and binds it to
+    a name. A name captured more than once requires structurally equal values, a
+    capture without a name is a wildcard.
+    """
+
+    def __init__(self, name: str = None, pattern: JAST = None):
+        """
+        :param name:    The name to bind the value to.
+        :param pattern: The template the value needs to match.
+        """
+        self.name = name
+        self.pattern = pattern
+
+    def __repr__(self):
+        return f"Capture({self.name!r})"
+
+
+class Many:
+    """
+    Matches any number of elements, including none, of a list in a template and binds
+    them to a name as a list.
+    """
+
+    def __init__(self, name: str = None):
+        """
+        :param name:    The name to bind the elements to.
+        """
+        self.name = name
+
+    def __repr__(self):
+        return f"Many({self.name!r})"
+
+
+def _placeholder(template: Any) -> Optional[str]:
+    """
+    The placeholder of a parsed template, i.e., `$x` as an identifier, a name, an
+    expression statement, or a class type without arguments.
+    """
+    if isinstance(template, Expr):
+        template = template.value
+    if isinstance(template, Name) or (
+        isinstance(template, Coit)
+        and not template.annotations
+        and template.type_args is None
+    ):
+        template = template.id
+    if isinstance(template, identifier) and template.startswith("$"):
+        return template
+    return None
+
+
+def _bind(name: Optional[str], value: Any, captures: Dict[str, Any]) -> bool:
+    if name is None or name == "_":
+        return True
+    if name in captures:
+        return dump(captures[name]) == dump(value)
+    captures[name] = value
+    return True
+
+
+def _compile(template: Any) -> _Matcher:
+    placeholder = _placeholder(template)
+    if placeholder is not None:
+        template = Capture(placeholder.lstrip("$"))
+    if isinstance(template, Capture):
+        name = template.name
+        sub = None if template.pattern is None else _compile(template.pattern)
+
+        def match_capture(node, captures):
+            if sub is not None and not sub(node, captures):
+                return False
+            return _bind(name, node, captures)
+
+        return match_capture
+    if isinstance(template, identifier):
+        value = str(template)
+
+        def match_identifier(node, captures):
+            return type(node) is identifier and node == value
+
+        return match_identifier
+    if isinstance(template, literal):
+        cls, expected = type(template), dump(template)
+
+        def match_literal(node, captures):
+            return type(node) is cls and dump(node) == expected
+
+        return match_literal
+    if isinstance(template, JAST):
+        cls = type(template)
+        fields = [
+            (field, _compile(value))
+            for field, value in vars(template).items()
+            if field not in _ATTRIBUTES and not field.startswith("_")
+        ]
+
+        def match_node(node, captures):
+            if type(node) is not cls:
+                return False
+            for field, sub in fields:
+                if not sub(getattr(node, field, None), captures):
+                    return False
+            return True
+
+        return match_node
+    if isinstance(template, list):
+        return _compile_list(template)
+
+    def match_value(node, captures):
+        return node is None if template is None else node == template
+
+    return match_value
+
+
+def _compile_list(template: list) -> _Matcher:
+    items = []
+    for item in template:
+        placeholder = _placeholder(item)
+        if placeholder is not None and placeholder.startswith("$$"):
+            item = Many(placeholder[2:])
+        items.append(item if isinstance(item, Many) else _compile(item))
+    if not any(isinstance(item, Many) for item in items):
+
+        def match_fixed(nodes, captures):
+            return (
+                isinstance(nodes, list)
+                and len(nodes) == len(items)
+                and all(sub(node, captures) for sub, node in zip(items, nodes))
+            )
+
+        return match_fixed
+
+    def match_items(nodes, start, index, captures):
+        if index == len(items):
+            return start == len(nodes)
+        item = items[index]
+        if not isinstance(item, Many):
+            return (
+                start < len(nodes)
+                and item(nodes[start], captures)
+                and match_items(nodes, start + 1, index + 1, captures)
+            )
+        for end in range(start, len(nodes) + 1):
+            attempt = dict(captures)
+            if _bind(item.name, nodes[start:end], attempt) and match_items(
+                nodes, end, index + 1, attempt
+            ):
+                captures.update(attempt)
+                return True
+        return False
+
+    def match_list(nodes, captures):
+        return isinstance(nodes, list) and match_items(nodes, 0, 0, captures)
+
+    return match_list
+
+
+class TreePattern:
+    """
+    A pattern compiled from a jAST template.
+    """
+
+    def __init__(self, template: JAST | str, mode: str = "expr", name: str = None):
+        """
+        :param template:    The template, either a jAST or Java code that is parsed.
+        :param mode:        The parse mode of a template given as Java code.
+        :param name:        The name of the pattern, e.g., of a check it belongs to.
+        """
+        if isinstance(template, str):
+            from jast._parse import parse
+
+            template = parse(template, mode)
+        self.template = template
+        self.name = name
+        placeholder = _placeholder(template)
+        if isinstance(template, Capture) or placeholder is not None:
+            # the root of the pattern can be any node
+            self.root = None
+        else:
+            self.root = type(template)
+        self._match = _compile(template)
+
+    def match(self, node: JAST) -> Optional[Dict[str, Any]]:
+        """
+        Match the pattern against a node.
+        :param node:    The node to match.
+        :return:        The captured values by name, or None if the node does not match.
+        """
+        captures = {}
+        return captures if self._match(node, captures) else None
+
+    def findall(self, tree: JAST) -> List["PatternMatch"]:
+        """
+        Find all nodes in a tree that match the pattern.
+        :param tree:    The tree to search.
+        :return:        The matches in the order of the nodes in the tree.
+        """
+        return list(PatternMatcher([self]).finditer(tree))
+
+    def __repr__(self):
+        return f"TreePattern({self.name or type(self.template).__name__!r})"
+
+
+class PatternMatch:
+    """
+    A node that matches a pattern, with the captured values by name.
+    """
+
+    def __init__(self, pattern: TreePattern, node: JAST, captures: Dict[str, Any]):
+        self.pattern = pattern
+        self.node = node
+        self.captures = captures
+
+    def __getitem__(self, name: str) -> Any:
+        return self.captures[name]
+
+    def __repr__(self):
+        return (
+            f"PatternMatch({self.pattern!r}, {type(self.node).__name__}, "
+            f"{sorted(self.captures)})"
+        )
+
+
+class PatternMatcher:
+    """
+    Matches many patterns in a single traversal of a tree. The patterns are indexed
+    by the class of their root node, so each node is only tested against the
+    patterns that can match it.
+    """
+
+    def __init__(self, patterns: Iterable[TreePattern | JAST | str] = ()):
+        """
+        :param patterns:    The patterns, or templates to compile into patterns.
+        """
+        self.patterns: List[TreePattern] = []
+        self._index: Dict[type, List[TreePattern]] = {}
+        self._any: List[TreePattern] = []
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: TreePattern | JAST | str) -> TreePattern:
+        """
+        Add a pattern to the matcher.
+        :param pattern: The pattern, or a template to compile into a pattern.
+        :return:        The added pattern.
+        """
+        if not isinstance(pattern, TreePattern):
+            pattern = TreePattern(pattern)
+        self.patterns.append(pattern)
+        if pattern.root is None:
+            self._any.append(pattern)
+            for patterns in self._index.values():
+                patterns.append(pattern)
+        else:
+            self._index.setdefault(pattern.root, list(self._any)).append(pattern)
+        return pattern
+
+    def finditer(self, tree: JAST) -> Iterator[PatternMatch]:
+        """
+        Find all matches of all patterns in a tree.
+        :param tree:    The tree to search.
+        :return:        The matches, in the order of the nodes in the tree.
+        """
+        index, default = self._index, self._any
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            for pattern in index.get(type(node), default):
+                captures = {}
+                if pattern._match(node, captures):
+                    yield PatternMatch(pattern, node, captures)
+            children = []
+            for field, value in node:
+                if isinstance(value, list):
+                    children.extend(item for item in value if isinstance(item, JAST))
+                elif isinstance(value, JAST):
+                    children.append(value)
+            stack.extend(reversed(children))
+
+    def findall(self, tree: JAST) -> List[PatternMatch]:
+        """
+        Find all matches of all patterns in a tree.
+        :param tree:    The tree to search.
+        :return:        The matches, in the order of the nodes in the tree.
+        """
+        return list(self.finditer(tree))
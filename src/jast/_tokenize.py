@@ -0,0 +1,199 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Tuple, Optional
+
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+
+import jast._jast as jast
+from jast._parse import _SimpleErrorListener, _line_starts, _children
+from jast._parser.JavaLexer import JavaLexer
+from jast._parser._sync import java_lexer
+
+
+class Tokens:
+    """
+    A sequence of tokens stored in compact columns.
+
+    Each token is described by its type, its start and stop offset in the source, such
+    that `src[start:stop]` is the text of the token, and its line and column.
+    """
+
+    def __init__(self, src: str):
+        """
+        :param src: The source the tokens belong to.
+        """
+        self.src = src
+        self.types = array("i")
+        self.starts = array("i")
+        self.stops = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Tuple[int, int, int, int, int]:
+        return (
+            self.types[index],
+            self.starts[index],
+            self.stops[index],
+            self.lines[index],
+            self.columns[index],
+        )
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        return zip(self.types, self.starts, self.stops, self.lines, self.columns)
+
+    def text(self, index: int) -> str:
+        """
+        :param index:   The index of a token.
+        :return:        The text of the token.
+        """
+        return self.src[self.starts[index] : self.stops[index]]
+
+    def name(self, index: int) -> str:
+        """
+        :param index:   The index of a token.
+        :return:        The symbolic name of the token type, e.g., `IDENTIFIER`.
+        """
+        return JavaLexer.symbolicNames[self.types[index]]
+
+    def texts(self) -> Iterator[str]:
+        """
+        :return:    The texts of all tokens.
+        """
+        src = self.src
+        return (src[start:stop] for start, stop in zip(self.starts, self.stops))
+
+
+def tokenize(src: str, include_hidden: bool = False) -> Tokens:
+    """
+    Tokenize Java source code without parsing it.
+
+    :param src:             The Java source code.
+    :param include_hidden:  If True, whitespace and comments are included.
+    :return:                The tokens of the source code.
+    """
+    lexer = java_lexer(InputStream(src), _SimpleErrorListener())
+    tokens = Tokens(src)
+    types, starts, stops = tokens.types, tokens.starts, tokens.stops
+    lines, columns = tokens.lines, tokens.columns
+    next_token = lexer.nextToken
+    eof, default = Token.EOF, Token.DEFAULT_CHANNEL
+    token = next_token()
+    while token.type != eof:
+        if include_hidden or token.channel == default:
+            types.append(token.type)
+            starts.append(token.start)
+            stops.append(token.stop + 1)
+            lines.append(token.line)
+            columns.append(token.column)
+        token = next_token()
+    return tokens
+
+
+class Positions:
+    """
+    Exact character offsets for the nodes of a tree parsed from a source.
+
+    The offsets are derived from the locations of the nodes and a table of the tokens
+    and line starts of the source, which is shared by all nodes of the tree.
+    """
+
+    def __init__(self, src: str, tokens: Tokens = None):
+        """
+        :param src:     The source the tree was parsed from.
+        :param tokens:  The tokens of the source, if already available.
+        """
+        self.src = src
+        self.tokens = tokens if tokens is not None else tokenize(src)
+        self.line_starts = _line_starts(src)
+
+    def offset(self, lineno: int, col_offset: int) -> int:
+        """
+        :param lineno:      A line, starting at 1.
+        :param col_offset:  A column, starting at 0.
+        :return:            The offset of the position in the source.
+        """
+        return self.line_starts[lineno - 1] + col_offset
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        :param offset:  An offset in the source.
+        :return:        The line and column of the offset.
+        """
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+    def span(self, node: jast.JAST) -> Optional[Tuple[int, int]]:
+        """
+        :param node:    A node of the tree.
+        :return:        The start and end offset of the node, such that
+                        `src[start:end]` is its exact source text, or None if the
+                        node has no location.
+        """
+        lineno = getattr(node, "lineno", None)
+        end_lineno = getattr(node, "end_lineno", None)
+        if lineno is None or end_lineno is None:
+            return None
+        start = self.line_starts[lineno - 1] + node.col_offset
+        # the end location is the start of the last token of the node
+        end = self.line_starts[end_lineno - 1] + node.end_col_offset
+        starts = self.tokens.starts
+        index = bisect_left(starts, end)
+        if index < len(starts) and starts[index] == end:
+            end = self.tokens.stops[index]
+        else:
+            end += 1
+        return start, end
+
+    def text(self, node: jast.JAST) -> Optional[str]:
+        """
+        :param node:    A node of the tree.
+        :return:        The exact source text of the node, or None if the node has no
+                        location.
+        """
+        span = self.span(node)
+        return None if span is None else self.src[span[0] : span[1]]
+
+    def nodes_in(self, tree: jast.JAST, start: int, end: int) -> Iterator[jast.JAST]:
+        """
+        Find all nodes of a tree that lie within a range of the source. Subtrees that
+        do not overlap the range are skipped.
+        :param tree:    The tree.
+        :param start:   The start offset of the range.
+        :param end:     The end offset of the range, exclusive.
+        :return:        The located nodes within the range in pre-order.
+        """
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            span = self.span(node)
+            if span is not None:
+                if span[1] <= start or end <= span[0]:
+                    continue
+                if start <= span[0] and span[1] <= end:
+                    yield node
+            stack.extend(reversed([child for child, _, _ in _children(node)]))
+
+    def node_at(self, tree: jast.JAST, offset: int) -> Optional[jast.JAST]:
+        """
+        :param tree:    The tree.
+        :param offset:  An offset in the source.
+        :return:        The innermost located node containing the offset, or None.
+        """
+        found = None
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            span = self.span(node)
+            if span is not None:
+                if not span[0] <= offset < span[1]:
+                    continue
+                # siblings do not overlap, so only the children of this node remain
+                found = node
+                stack = [child for child, _, _ in _children(node)]
+            else:
+                stack.extend(child for child, _, _ in _children(node))
+        return found
@@ -1,10 +1,19 @@
+import os
+import time
+from array import array
+from bisect import bisect_right
 from contextlib import contextmanager, nullcontext
 from enum import IntEnum, auto
+from functools import partial
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 import jast._jast as jast
 
 from jast._visitors import JNodeVisitor
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 class _Precedence(IntEnum):
     """
@@ -727,7 +736,7 @@ class _Unparser(JNodeVisitor):
         self.visit_variabledeclaratorid(node.id)
 
     def visit_params(self, node: jast.params):
-        self.items_view(filter(None, [node.receiver_param] + node.parameters))
+        self.items_view(list(filter(None, [node.receiver_param] + node.parameters)))
 
     def visit_LocalType(self, node: jast.LocalType):
         self.visit(node.decl)
@@ -961,6 +970,9 @@ class _Unparser(JNodeVisitor):
     def visit_EmptyDecl(self, node: jast.EmptyDecl):
         self.fill(";")
 
+    def visit_ErrorDecl(self, node: jast.ErrorDecl):
+        self.fill(node.text)
+
     def visit_CompoundDecl(self, node):
         self.traverse(node.body)
 
@@ -1184,8 +1196,505 @@ class _Unparser(JNodeVisitor):
     def visit_ModularUnit(self, node: jast.ModularUnit):
         self.traverse(node.imports)
         self._double_fill = True
-        self.visit_Module(node.body)
+        self.visit(node.body)
+
+
+class _CommentingUnparser(_Unparser):
+    """
+    Unparser re-emitting the comments attached to declarations and statements.
+    Leading comments are written on their own lines before a node, trailing comments
+    at the end of the line a node ends unless they had a line of their own, so that
+    line comments never hide code. Inner comments of empty braces are written on their
+    own lines between the braces.
+    """
+
+    def __init__(self, indent: int, comments):
+        super().__init__(indent=indent)
+        self._comments = comments
+        self._emitted = set()
+        self._leading = []
+        self._trailing = []
+        # the nodes being visited, the last one owns the braces of a braced block
+        self._nodes = []
+
+    def unparse(self, node: jast.JAST):
+        self.visit(node)
+        self._flush_trailing()
+        for index, _ in self._leading:
+            super().fill(self._comments.text(index))
+        return "".join(self._source)
+
+    def _collect(self, indices: range, target: list):
+        for index in indices:
+            if index not in self._emitted:
+                self._emitted.add(index)
+                target.append((index, self._indent))
+
+    def visit(self, node):
+        self._nodes.append(node)
+        if isinstance(node, (jast.stmt, jast.declaration)):
+            self._collect(self._comments._leading(node), self._leading)
+            super().visit(node)
+            self._collect(self._comments._trailing(node), self._trailing)
+        else:
+            super().visit(node)
+        self._nodes.pop()
+
+    def braced_block(self, elements, double_fill=False):
+        inner = []
+        if not elements and self._nodes:
+            self._collect(self._comments._inner(self._nodes[-1]), inner)
+        if not inner:
+            super().braced_block(elements, double_fill)
+            return
+        if not self._no_fill:
+            self.fill()
+        with self.filled():
+            self.write("{")
+            with self.block():
+                for index, _ in inner:
+                    self.fill(self._comments.text(index))
+            self.fill("}")
+
+    def _flush_trailing(self):
+        if self._trailing:
+            trailing, self._trailing = self._trailing, []
+            for index, indent in trailing:
+                if self._comments._own_line(index):
+                    indent, self._indent = self._indent, indent
+                    super().fill(self._comments.text(index))
+                    self._indent = indent
+                else:
+                    self.write(" ", self._comments.text(index))
+
+    def maybe_newline(self, force_newline: bool = False):
+        self._flush_trailing()
+        super().maybe_newline(force_newline)
 
+    def fill(self, text="", force_newline: bool = False):
+        if self._leading:
+            leading, self._leading = self._leading, []
+            for index, _ in leading:
+                super().fill(self._comments.text(index), force_newline)
+        super().fill(text, force_newline)
+
+    def double_fill(self):
+        if self._double_fill:
+            super().fill()
+        self.fill()
+
+
+class _MinUnparser(_Unparser):
+    """
+    Unparser emitting a minified canonical form without any layout.
+    Whitespace is only inserted between two chunks if they would otherwise merge into
+    different tokens.
+    """
+
+    def __init__(self):
+        super().__init__(indent=-1)
+        self._last = ""
+
+    def write(self, *text):
+        for chunk in text:
+            if chunk:
+                chunk = chunk.strip()
+                if chunk:
+                    if self._last and self._needs_space(self._last, chunk[0]):
+                        self._source.append(" ")
+                    self._source.append(chunk)
+                    self._last = chunk[-1]
+
+    @staticmethod
+    def _needs_space(last, first):
+        if (last.isalnum() or last in "_$") and (first.isalnum() or first in "_$"):
+            return True
+        return (last == first and last in "+-") or (last == "/" and first in "/*")
+
+    def seperator(self):
+        pass
+
+    def maybe_newline(self, force_newline: bool = False):
+        pass
+
+    def fill(self, text="", force_newline: bool = False):
+        self.write(text)
+
+    def block(self):
+        return nullcontext()
+
+    def double_fill(self):
+        pass
+
+    def visit_IntLiteral(self, node: jast.IntLiteral):
+        self.write(str(node.value) + ("l" if node.long else ""))
+
+    def visit_FloatLiteral(self, node: jast.FloatLiteral):
+        self.write(str(node.value) + ("d" if node.double else ""))
 
-def unparse(node, indent=4):
+    def visit_TextBlock(self, node: jast.TextBlock):
+        self.write('"""' + "".join("\n" + line for line in node.value) + '"""')
+
+
+class SourceMap:
+    """
+    Maps offsets in unparsed source code to the nodes that were rendered there.
+
+    Nodes are numbered in the order they were visited. For each node, the offsets of
+    its first non-whitespace character and the end of its text are stored, and the
+    output is partitioned into segments mapped to the innermost node.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        nodes: List[jast.JAST],
+        starts: array,
+        ends: array,
+        offsets: array,
+        segments: array,
+    ):
+        self.text = text
+        self.nodes = nodes
+        self.starts = starts
+        self.ends = ends
+        self._offsets = offsets
+        self._segments = segments
+        self._ids = None
+        self._lines = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node_id(self, node: jast.JAST) -> int:
+        """
+        :param node:    A rendered node.
+        :return:        The id of the node in this source map.
+        """
+        if self._ids is None:
+            self._ids = {id(n): i for i, n in reversed(list(enumerate(self.nodes)))}
+        try:
+            return self._ids[id(node)]
+        except KeyError:
+            raise jast.JASTError(f"{node!r} was not rendered")
+
+    def span(self, node: jast.JAST) -> Tuple[int, int]:
+        """
+        :param node:    A rendered node.
+        :return:        The start and end offset of the node in the text.
+        """
+        index = self.node_id(node)
+        return self.starts[index], self.ends[index]
+
+    def node_at(self, offset: int) -> Optional[jast.JAST]:
+        """
+        :param offset:  An offset in the text.
+        :return:        The innermost node rendered at the offset.
+        """
+        if offset < 0 or offset >= len(self.text):
+            return None
+        index = self._segments[bisect_right(self._offsets, offset) - 1]
+        return self.nodes[index] if index >= 0 else None
+
+    def offset(self, line: int, column: int) -> int:
+        """
+        :param line:    A line number, starting at 1.
+        :param column:  A column offset, starting at 0.
+        :return:        The corresponding offset in the text.
+        """
+        if self._lines is None:
+            self._lines = array("i", [0])
+            start = self.text.find("\n")
+            while start >= 0:
+                self._lines.append(start + 1)
+                start = self.text.find("\n", start + 1)
+        return self._lines[line - 1] + column
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        :param offset:  An offset in the text.
+        :return:        The line number and column offset of the offset.
+        """
+        self.offset(1, 0)
+        line = bisect_right(self._lines, offset)
+        return line, offset - self._lines[line - 1]
+
+    def node_at_position(self, line: int, column: int) -> Optional[jast.JAST]:
+        """
+        :param line:    A line number, starting at 1.
+        :param column:  A column offset, starting at 0.
+        :return:        The innermost node rendered at the position.
+        """
+        return self.node_at(self.offset(line, column))
+
+
+class _MappingUnparser(_Unparser):
+    def __init__(self, indent=4):
+        super().__init__(indent=indent)
+        self._offset = 0
+        self._stack = []
+        self._nodes = []
+        self._starts = array("i")
+        self._ends = array("i")
+        self._offsets = array("i")
+        self._segments = array("i")
+
+    def write(self, *text):
+        for chunk in text:
+            if chunk:
+                self._source.append(chunk)
+                self._offset += len(chunk)
+
+    def _segment(self, index: int):
+        if self._offsets and self._offsets[-1] == self._offset:
+            self._segments[-1] = index
+        elif not self._segments or self._segments[-1] != index:
+            self._offsets.append(self._offset)
+            self._segments.append(index)
+
+    def visit(self, node):
+        if node is None:
+            return
+        index = len(self._nodes)
+        self._nodes.append(node)
+        self._starts.append(self._offset)
+        self._ends.append(self._offset)
+        self._segment(index)
+        self._stack.append(index)
+        super().visit(node)
+        self._stack.pop()
+        self._ends[index] = self._offset
+        self._segment(self._stack[-1] if self._stack else -1)
+
+    def source_map(self) -> SourceMap:
+        text = "".join(self._source)
+        starts, ends = self._starts, self._ends
+        for index in range(len(starts)):
+            start, end = starts[index], ends[index]
+            while start < end and text[start].isspace():
+                start += 1
+            starts[index] = start
+        return SourceMap(text, self._nodes, starts, ends, self._offsets, self._segments)
+
+
+class _Placeholder:
+    def __init__(self, index: int):
+        self.index = index
+
+
+class _SplittingUnparser(_Unparser):
+    """
+    Unparser that renders the frame of a tree and replaces independent declarations
+    by placeholders, recording the state required to render them separately.
+    """
+
+    _TYPES = (jast.Class, jast.Interface, jast.Enum, jast.Record, jast.AnnotationDecl)
+    _LOCAL = (jast.Package, jast.Import, jast.EmptyDecl, jast.CompoundDecl)
+
+    def __init__(self, indent=4):
+        super().__init__(indent=indent)
+        self.jobs = []
+        self._depth = 0
+
+    def visit(self, node):
+        if isinstance(node, jast.declaration) and not isinstance(node, self._LOCAL):
+            if self._depth > 0 or not isinstance(node, self._TYPES):
+                state = (
+                    self._indent,
+                    self._no_fill,
+                    self._double_fill,
+                    bool(self._source),
+                )
+                self._source.append(_Placeholder(len(self.jobs)))
+                self.jobs.append((node, state))
+                return
+            self._depth += 1
+            super().visit(node)
+            self._depth -= 1
+        else:
+            super().visit(node)
+
+
+def _unparse_members(indent, jobs):
+    results = []
+    for node, (level, no_fill, double_fill, started) in jobs:
+        unparser = _Unparser(indent)
+        unparser._indent = level
+        unparser._no_fill = no_fill
+        unparser._double_fill = double_fill
+        if started:
+            unparser._source.append("")
+        results.append(unparser.unparse(node))
+    return results
+
+
+def _unparse_trees(indent, nodes):
+    return [unparse(node, indent) for node in nodes]
+
+
+def _chunks(items: list, workers: int) -> List[list]:
+    size = max(1, -(-len(items) // (workers * 4)))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+# The work of the running parallel unparse. Forked workers inherit it, so that only
+# index ranges are sent to them and only the unparsed strings are sent back. Pickling
+# the trees themselves costs as much as unparsing them.
+_INHERITED = None
+
+# The estimated time of the remaining work from which it is spread across processes.
+# Starting the pool takes about 20ms and 6ms per worker, so below this two workers
+# are barely faster than one.
+_PARALLEL_SECONDS = 0.15
+
+
+def _workers(max_workers: Optional[int]) -> int:
+    # the process pool is only imported on use, it pulls in multiprocessing
+    import multiprocessing
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return 1
+    return max_workers or os.cpu_count() or 1
+
+
+def _unparse_inherited(function, indent, start, stop):
+    return function(indent, _INHERITED[start:stop])
+
+
+def _fork(function, indent: int, items: list, workers: int) -> List[str]:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _INHERITED
+    _INHERITED = items
+    try:
+        size = max(1, -(-len(items) // (workers * 4)))
+        starts = range(0, len(items), size)
+        stops = [start + size for start in starts]
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            chunks = pool.map(
+                partial(_unparse_inherited, function, indent), starts, stops
+            )
+            return [text for chunk in chunks for text in chunk]
+    finally:
+        _INHERITED = None
+
+
+def _map(function, indent: int, items: list, workers: int, executor) -> List[str]:
+    if executor is not None:
+        chunks = executor.map(partial(function, indent), _chunks(items, workers))
+        return [text for chunk in chunks for text in chunk]
+    # unparse items until the time they take tells whether the rest is worth a pool
+    results = []
+    start = time.perf_counter()
+    for index, item in enumerate(items, 1):
+        results += function(indent, [item])
+        elapsed = time.perf_counter() - start
+        if elapsed >= _PARALLEL_SECONDS / 10:
+            rest = items[index:]
+            count = min(workers, len(rest))
+            if count > 1 and elapsed / index * len(rest) >= _PARALLEL_SECONDS:
+                return results + _fork(function, indent, rest, count)
+            return results + function(indent, rest)
+    return results
+
+
+def unparse(node, indent=4, source_map=False, comments=False):
+    """
+    Unparse a JAST node.
+    :param node:        The node to unparse.
+    :param indent:      The indent used for unparsing, -1 for a single line.
+    :param source_map:  If True, a source map of the output is returned as well.
+    :param comments:    If True, re-emit the comments collected by
+                        `parse(..., comments=True)` for the node. For subtrees of such a
+                        tree, the comments of the tree can be passed instead. Comments
+                        cannot be emitted on a single line or with a source map.
+    :return:            The unparsed source code, and the source map if requested.
+    :raises ValueError: If comments are requested on a single line or with a source
+                        map.
+    """
+    if comments and (indent < 0 or source_map):
+        raise ValueError(
+            "comments cannot be emitted on a single line or with a source map"
+        )
+    if comments is True:
+        comments = getattr(node, "_comments", None)
+    if comments:
+        return _CommentingUnparser(indent, comments).unparse(node)
+    if source_map:
+        unparser = _MappingUnparser(indent)
+        unparser.visit(node)
+        mapping = unparser.source_map()
+        return mapping.text, mapping
     return _Unparser(indent).unparse(node)
+
+
+def unparse_parallel(
+    node: jast.JAST,
+    indent: int = 4,
+    max_workers: Optional[int] = None,
+    executor: Optional["Executor"] = None,
+) -> str:
+    """
+    Unparse a JAST node, rendering its top-level declarations and the members of its
+    top-level types in parallel. The result is identical to unparse(node, indent).
+    Without an executor, the members are unparsed sequentially until the time they
+    take shows that the rest is worth starting worker processes, which are forked and
+    inherit the tree.
+    :param node:        The node to unparse.
+    :param indent:      The indent used for unparsing.
+    :param max_workers: The number of worker processes if no executor is given.
+    :param executor:    An executor to use instead of the worker processes. The
+                        members are always sent to it, a process pool pickles them.
+    :return:            The unparsed source code.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if executor is None:
+        workers = _workers(max_workers)
+        if workers < 2:
+            return unparse(node, indent)
+    unparser = _SplittingUnparser(indent)
+    unparser.visit(node)
+    results = _map(_unparse_members, indent, unparser.jobs, workers, executor)
+    return "".join(
+        results[chunk.index] if isinstance(chunk, _Placeholder) else chunk
+        for chunk in unparser._source
+    )
+
+
+def unparse_many(
+    nodes: Iterable[jast.JAST],
+    indent: int = 4,
+    max_workers: Optional[int] = None,
+    executor: Optional["Executor"] = None,
+) -> List[str]:
+    """
+    Unparse many JAST nodes in parallel. Without an executor, the nodes are unparsed
+    sequentially until the time they take shows that the rest is worth starting
+    worker processes, which are forked and inherit the nodes.
+    :param nodes:       The nodes to unparse.
+    :param indent:      The indent used for unparsing.
+    :param max_workers: The number of worker processes if no executor is given.
+    :param executor:    An executor to use instead of the worker processes. The nodes
+                        are always sent to it, a process pool pickles them.
+    :return:            The unparsed source code of each node.
+    """
+    nodes = list(nodes)
+    workers = max_workers or os.cpu_count() or 1
+    if executor is None:
+        workers = _workers(max_workers)
+        if workers < 2:
+            return _unparse_trees(indent, nodes)
+    return _map(_unparse_trees, indent, nodes, workers, executor)
+
+
+def unparse_min(node):
+    """
+    Unparse a JAST node to a minified canonical form. The result only contains the
+    whitespace necessary to separate tokens and parses to a structurally equal tree.
+    :param node:    The node to unparse.
+    :return:        The minified source code.
+    """
+    return _MinUnparser().unparse(node)
@@ -1,15 +1,143 @@
 from copy import copy
-from typing import Any
+from typing import Any, Dict, List, Optional, Set, Tuple, get_args, get_type_hints
 
+import jast._jast
 from jast._jast import JAST
 
+_NODE_TYPES: Optional[Dict[str, Set[type]]] = None
+_REACHABLE: Dict[type, Optional[Set[str]]] = {}
+_VISITS: Dict[type, "_Visits"] = {}
+
+
+def _node_types() -> Dict[str, Set[type]]:
+    """
+    The node classes of the schema by name, with their subclasses, since a field typed
+    with a class can hold any of its subclasses.
+    """
+    global _NODE_TYPES
+    if _NODE_TYPES is None:
+        _NODE_TYPES = {}
+        for value in vars(jast._jast).values():
+            if isinstance(value, type) and issubclass(value, JAST):
+                for cls in value.__mro__:
+                    if issubclass(cls, JAST):
+                        _NODE_TYPES.setdefault(cls.__name__, set()).add(value)
+    return _NODE_TYPES
+
+
+def _field_types(cls: type) -> Optional[Set[type]]:
+    """
+    The node classes that the fields of a node class can hold according to the type
+    hints of its constructors, or None if a parameter has no hint.
+    """
+    # only imported when a visitor prunes, to keep the import of jast fast
+    import inspect
+
+    types = set()
+    for base in cls.__mro__:
+        if not issubclass(base, JAST) or "__init__" not in vars(base):
+            continue
+        parameters = inspect.signature(base.__init__).parameters.values()
+        if any(
+            parameter.annotation is inspect.Parameter.empty
+            and parameter.kind
+            in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+            for parameter in list(parameters)[1:]
+        ):
+            return None
+        hints = get_type_hints(base.__init__)
+        hints.pop("return", None)
+        stack = list(hints.values())
+        while stack:
+            hint = stack.pop()
+            if get_args(hint):
+                stack.extend(get_args(hint))
+            elif isinstance(hint, type) and issubclass(hint, JAST):
+                types |= _node_types().get(hint.__name__, {hint})
+    return types
+
+
+def _reachable(cls: type) -> Optional[Set[str]]:
+    """
+    The names of the node classes that can occur in the subtree below a node of a
+    class, or None if any class can.
+    """
+    if cls not in _REACHABLE:
+        names, seen, stack = set(), {cls}, [cls]
+        while stack:
+            types = _field_types(stack.pop())
+            if types is None:
+                names = None
+                break
+            for child in types - seen:
+                seen.add(child)
+                names.add(child.__name__)
+                stack.append(child)
+        _REACHABLE[cls] = names
+    return _REACHABLE[cls]
+
+
+# the methods whose overrides can depend on visiting nodes without visit methods
+_PRUNE_SENSITIVE = ("visit", "generic_visit", "default_result", "aggregate_result")
+
+
+def _defined_by(cls: type, name: str) -> type:
+    return next(base for base in cls.__mro__ if name in vars(base))
+
+
+class _Visits(dict):
+    """
+    Whether the generic visit of a visitor class needs to visit a node of a class,
+    because the visitor has a visit method for the class or for a class that can
+    occur below it. Filled in on demand.
+    `overridden` is set if the class overrides a method that pruning can change the
+    behavior of below the class that enabled pruning, i.e., a subclass that did not
+    enable pruning itself.
+    """
+
+    def __init__(self, visitor: type):
+        super().__init__()
+        self.handled = {name[6:] for name in dir(visitor) if name.startswith("visit_")}
+        enabled = _defined_by(visitor, "prune")
+        self.overridden = not all(
+            issubclass(enabled, _defined_by(visitor, name)) for name in _PRUNE_SENSITIVE
+        )
+
+    def __missing__(self, cls: type) -> bool:
+        reachable = _reachable(cls) if issubclass(cls, JAST) else None
+        self[cls] = (
+            cls.__name__ in self.handled
+            or reachable is None
+            or not self.handled.isdisjoint(reachable)
+        )
+        return self[cls]
+
+
+def _visits(visitor: "JNodeVisitor") -> Optional[_Visits]:
+    if not visitor.prune:
+        return None
+    cls = type(visitor)
+    if cls not in _VISITS:
+        _VISITS[cls] = _Visits(cls)
+    visits = _VISITS[cls]
+    if visits.overridden and "prune" not in getattr(visitor, "__dict__", ()):
+        return None
+    return visits
+
 
 class JNodeVisitor:
     """
     A base node visitor class for JAST nodes.
     This class is meant to be subclassed, with the subclass adding visit methods for different node types.
+    Set `prune` to True to let the generic visit skip the subtrees that, according to the schema of the
+    jAST, cannot contain a node with a visit method. Only enable it if visiting such a subtree has neither
+    an effect nor a result, i.e., not if `visit` or `generic_visit` handle all nodes or `default_result`
+    is aggregated into a result. Pruning enabled by a base class is ignored by subclasses that override
+    one of these methods.
     """
 
+    prune = False
+
     # noinspection PyMethodMayBeStatic
     def default_result(self) -> Any:
         """
@@ -42,12 +170,14 @@ class JNodeVisitor:
         :return:        The result of the visit.
         """
         aggregate = self.default_result()
+        visits = _visits(self)
         for field, value in node:
             if isinstance(value, list):
                 for item in value:
-                    result = self.visit(item)
-                    aggregate = self.aggregate_result(aggregate, result)
-            elif isinstance(value, JAST):
+                    if visits is None or visits[type(item)]:
+                        result = self.visit(item)
+                        aggregate = self.aggregate_result(aggregate, result)
+            elif isinstance(value, JAST) and (visits is None or visits[type(value)]):
                 result = self.visit(value)
                 aggregate = self.aggregate_result(aggregate, result)
         return aggregate
@@ -61,11 +191,14 @@ class JNodeTransformer(JNodeVisitor):
     """
 
     def generic_visit(self, node: JAST):
+        visits = _visits(self)
         for field, old_value in node:
             if isinstance(old_value, list):
                 new_values = []
                 for value in old_value:
-                    if isinstance(value, JAST):
+                    if isinstance(value, JAST) and (
+                        visits is None or visits[type(value)]
+                    ):
                         value = self.visit(value)
                         if value is None:
                             continue
@@ -74,7 +207,9 @@ class JNodeTransformer(JNodeVisitor):
                             continue
                     new_values.append(value)
                 old_value[:] = new_values
-            elif isinstance(old_value, JAST):
+            elif isinstance(old_value, JAST) and (
+                visits is None or visits[type(old_value)]
+            ):
                 new_node = self.visit(old_value)
                 if new_node is None:
                     setattr(node, field, None)
@@ -114,3 +249,176 @@ class JNodeKeepTransformer(JNodeTransformer):
                 else:
                     setattr(node, field, new_node)
         return node
+
+
+def _unchanged(node: JAST, copied: JAST) -> bool:
+    fields, copied_fields = vars(node), vars(copied)
+    if fields.keys() != copied_fields.keys():
+        return False
+    for field, value in fields.items():
+        copied_value = copied_fields[field]
+        if value is copied_value:
+            continue
+        if (
+            not isinstance(value, list)
+            or not isinstance(copied_value, list)
+            or len(value) != len(copied_value)
+            or any(a is not b for a, b in zip(value, copied_value))
+        ):
+            return False
+    return True
+
+
+class JNodeSharingTransformer(JNodeKeepTransformer):
+    """
+    A base node transformer class for JAST nodes.
+    This class is meant to be subclassed, with the subclass adding visit methods for different node types.
+    The visiting keeps the original jAST and shares its unchanged subtrees with the result, so that only
+    the nodes on the paths from the root to changed nodes are copied.
+    The visit methods receive a shallow copy of the node that they can modify, which is dropped in favor
+    of the original node if it is returned unchanged.
+    """
+
+    # unchanged subtrees are shared, so subtrees without visit methods are skipped
+    prune = True
+
+    def visit(self, node: JAST):
+        method = "visit_" + node.__class__.__name__
+        visitor = getattr(self, method, None)
+        if visitor is None:
+            return self.generic_visit(node)
+        copied = copy(node)
+        # noinspection PyArgumentList
+        result = visitor(copied)
+        if result is copied and _unchanged(node, copied):
+            return node
+        return result
+
+    def generic_visit(self, node: JAST):
+        changes = {}
+        visits = _visits(self)
+        for field, old_value in node:
+            if isinstance(old_value, list):
+                new_values = []
+                changed = False
+                for value in old_value:
+                    if isinstance(value, JAST) and (
+                        visits is None or visits[type(value)]
+                    ):
+                        new_value = self.visit(value)
+                        if new_value is not value:
+                            changed = True
+                        if new_value is None:
+                            continue
+                        elif not isinstance(new_value, JAST):
+                            new_values.extend(new_value)
+                            continue
+                        value = new_value
+                    new_values.append(value)
+                if changed:
+                    changes[field] = new_values
+            elif isinstance(old_value, JAST) and (
+                visits is None or visits[type(old_value)]
+            ):
+                new_node = self.visit(old_value)
+                if new_node is not old_value:
+                    changes[field] = new_node
+        if not changes:
+            return node
+        node = copy(node)
+        for field, value in changes.items():
+            setattr(node, field, value)
+        return node
+
+
+class CompositeVisitor(JNodeVisitor):
+    """
+    A node visitor that runs several visitors in a single traversal.
+    Each node is dispatched to the visit methods of all visitors that have one for it, the generic visit
+    of the other visitors is shared, and the results are aggregated for each visitor with its own
+    `default_result` and `aggregate_result`, so that each visitor gets the result it would get on its own.
+    A visit method that visits the children of its node traverses that subtree on its own, and visitors
+    that override `visit` or `generic_visit` are run on their own after the traversal.
+    """
+
+    def __init__(self, visitors: List[JNodeVisitor]):
+        """
+        :param visitors:    The visitors to run.
+        """
+        self.visitors = list(visitors)
+        # the visit methods and the generically visiting visitors by the indices of
+        # the visiting visitors and the node class
+        self._plans: Dict[Tuple[Tuple[int, ...], type], Tuple[list, tuple]] = {}
+        # the visitors visiting a child by the generically visiting visitors and the
+        # class of the child
+        self._children: Dict[Tuple[Tuple[int, ...], type], Tuple[int, ...]] = {}
+
+    def visit(self, node: JAST) -> List[Any]:
+        """
+        Visit a tree with all visitors.
+        :param node:    The root of the tree.
+        :return:        The results of the visitors, in their order.
+        """
+        fused = tuple(
+            index
+            for index, visitor in enumerate(self.visitors)
+            if type(visitor).visit is JNodeVisitor.visit
+            and type(visitor).generic_visit is JNodeVisitor.generic_visit
+        )
+        results = [None] * len(self.visitors)
+        if fused:
+            for index, result in self._visit(node, fused).items():
+                results[index] = result
+        for index, visitor in enumerate(self.visitors):
+            if index not in fused:
+                results[index] = visitor.visit(node)
+        return results
+
+    def _plan(self, visiting: Tuple[int, ...], cls: type) -> Tuple[list, tuple]:
+        handlers, generic = [], []
+        for index in visiting:
+            handler = getattr(self.visitors[index], "visit_" + cls.__name__, None)
+            if handler is None:
+                generic.append(index)
+            else:
+                handlers.append((index, handler))
+        self._plans[visiting, cls] = handlers, tuple(generic)
+        return handlers, tuple(generic)
+
+    def _visiting(self, generic: Tuple[int, ...], cls: type) -> Tuple[int, ...]:
+        visiting = []
+        for index in generic:
+            visits = _visits(self.visitors[index])
+            if visits is None or visits[cls]:
+                visiting.append(index)
+        self._children[generic, cls] = tuple(visiting)
+        return tuple(visiting)
+
+    def _visit(self, node: JAST, visiting: Tuple[int, ...]) -> Dict[int, Any]:
+        cls = type(node)
+        handlers, generic = self._plans.get((visiting, cls)) or self._plan(
+            visiting, cls
+        )
+        results = {index: handler(node) for index, handler in handlers}
+        if not generic:
+            return results
+        visitors = self.visitors
+        for index in generic:
+            results[index] = visitors[index].default_result()
+        for field, value in node:
+            if isinstance(value, list):
+                children = value
+            elif isinstance(value, JAST):
+                children = (value,)
+            else:
+                continue
+            for child in children:
+                child_visiting = self._children.get((generic, type(child)))
+                if child_visiting is None:
+                    child_visiting = self._visiting(generic, type(child))
+                if child_visiting:
+                    for index, result in self._visit(child, child_visiting).items():
+                        results[index] = visitors[index].aggregate_result(
+                            results[index], result
+                        )
+        return results
@@ -14,6 +14,7 @@ class JNodeVisitor:
 
     # Declarations
     def visit_EmptyDecl(self, node: jast.EmptyDecl): ...
+    def visit_ErrorDecl(self, node: jast.ErrorDecl): ...
     def visit_CompoundDecl(self, node: jast.CompoundDecl): ...
     def visit_Package(self, node: jast.Package): ...
     def visit_Import(self, node: jast.Import): ...
@@ -0,0 +1,100 @@
+import asyncio
+import gc
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from antlr4.error.Errors import ParseCancellationException
+
+import jast
+
+
+class TestAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_aparse(self):
+        tree = await jast.aparse("class A {}")
+        self.assertIsInstance(tree, jast.CompilationUnit)
+        self.assertEqual("A", tree.body[0].id)
+
+    async def test_aparse_mode(self):
+        tree = await jast.aparse("x + 1", jast.ParseMode.EXPR)
+        self.assertIsInstance(tree, jast.BinOp)
+
+    async def test_aparse_recover(self):
+        tree, diagnostics = await jast.aparse(
+            "class A { int x = ; void m() {} }", recover=True
+        )
+        self.assertTrue(diagnostics)
+        self.assertIsInstance(tree.body[0].body[0], jast.ErrorDecl)
+
+    async def test_aparse_error(self):
+        with self.assertRaises(ParseCancellationException):
+            await jast.aparse("class A {")
+
+    async def test_aparse_many(self):
+        sources = [f"x * {i}" for i in range(6)]
+        trees = [tree async for tree in jast.aparse_many(sources, "expr", limit=2)]
+        self.assertEqual(6, len(trees))
+        for i, tree in enumerate(trees):
+            self.assertEqual(i, tree.right.value)
+
+    async def test_aparse_many_async_sources(self):
+        async def sources():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield f"class A{i} {{}}"
+
+        with ThreadPoolExecutor(2) as executor:
+            names = [
+                tree.body[0].id
+                async for tree in jast.aparse_many(sources(), executor=executor)
+            ]
+        self.assertEqual(["A0", "A1", "A2"], names)
+
+    async def test_aparse_many_back_pressure(self):
+        taken = []
+
+        def sources():
+            for i in range(10):
+                taken.append(i)
+                yield f"class A{i} {{}}"
+
+        trees = jast.aparse_many(sources(), limit=3)
+        await anext(trees)
+        self.assertLessEqual(len(taken), 4)
+        await trees.aclose()
+        self.assertLess(len(taken), 10)
+
+    async def test_aparse_many_error(self):
+        trees = jast.aparse_many(["class A {}", "class B {", "class C {}"])
+        self.assertIsInstance(await anext(trees), jast.CompilationUnit)
+        with self.assertRaises(ParseCancellationException):
+            await anext(trees)
+
+    async def test_aparse_many_recover(self):
+        sources = ["class A { int x = ; }", "class B {}"]
+        results = [
+            result
+            async for result in jast.aparse_many(sources, recover=True, comments=True)
+        ]
+        tree, diagnostics = results[0]
+        self.assertTrue(diagnostics)
+        self.assertIsInstance(tree.body[0].body[0], jast.ErrorDecl)
+        self.assertEqual([], results[1][1])
+        self.assertIsNotNone(jast.get_comments(results[1][0]))
+
+    async def test_aparse_many_error_retrieved(self):
+        # the later parses fail while the first, larger one is still running
+        sources = ["class A {" + " int x;" * 2000, "class B {", "class C {"]
+        with self.assertNoLogs("asyncio", level="ERROR"):
+            with ThreadPoolExecutor(3) as executor:
+                with self.assertRaises(ParseCancellationException):
+                    async for _ in jast.aparse_many(sources, executor=executor):
+                        pass
+            gc.collect()
+
+    async def test_aparse_many_limit(self):
+        with self.assertRaises(ValueError):
+            await anext(jast.aparse_many(["class A {}"], limit=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
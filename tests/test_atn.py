@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from antlr4 import CommonTokenStream, DFA, InputStream, PredictionContextCache
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+
+import jast
+from jast._parser import _atn
+from jast._parser.JavaLexer import JavaLexer
+from jast._parser.JavaParser import JavaParser, serializedATN
+from jast._parser._convert import JASTConverter
+
+
+class TestATNCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.module_file = os.path.join(self.directory.name, "JavaParser.py")
+        self.path = os.path.join(self.directory.name, "JavaParser.atn")
+        self.serialized = serializedATN()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameATN(self, expected, actual):
+        self.assertEqual(len(expected.states), len(actual.states))
+        self.assertEqual(expected.ruleToTokenType, actual.ruleToTokenType)
+        self.assertEqual(len(expected.decisionToState), len(actual.decisionToState))
+        for state, other in zip(expected.states, actual.states):
+            self.assertIs(type(state), type(other))
+            self.assertEqual(state.stateNumber, other.stateNumber)
+            self.assertEqual(
+                [(type(t), t.target.stateNumber) for t in state.transitions],
+                [(type(t), t.target.stateNumber) for t in other.transitions],
+            )
+
+    def test_roundtrip(self):
+        atn = ATNDeserializer().deserialize(self.serialized)
+        _atn._write(self.path, self.serialized, atn)
+        self.assertTrue(any(state.transitions for state in atn.states))
+        self.assertSameATN(JavaParser.atn, _atn._read(self.path, self.serialized))
+
+    def test_stale(self):
+        atn = ATNDeserializer().deserialize(self.serialized)
+        _atn._write(self.path, self.serialized, atn)
+        self.assertIsNone(_atn._read(self.path, self.serialized[:-1] + [1]))
+
+    def test_corrupt(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a pickle")
+        self.assertIsNone(_atn._read(self.path, self.serialized))
+        self.assertSameATN(
+            JavaParser.atn, _atn.load_atn(self.serialized, self.module_file)
+        )
+
+    def test_load_writes_cache(self):
+        dont_write_bytecode = sys.dont_write_bytecode
+        try:
+            sys.dont_write_bytecode = True
+            _atn.load_atn(self.serialized, self.module_file)
+            self.assertFalse(os.path.exists(self.path))
+            sys.dont_write_bytecode = False
+            atn = _atn.load_atn(self.serialized, self.module_file)
+            self.assertTrue(os.path.exists(self.path))
+        finally:
+            sys.dont_write_bytecode = dont_write_bytecode
+        self.assertSameATN(atn, _atn.load_atn(self.serialized, self.module_file))
+
+    def test_parse_with_cached_atn(self):
+        _atn._write(
+            self.path, self.serialized, ATNDeserializer().deserialize(self.serialized)
+        )
+        atn = _atn._read(self.path, self.serialized)
+        src = "class A { int f(int a) { return a << 2 > 1 ? a : -a; } }"
+        parser = JavaParser(CommonTokenStream(JavaLexer(InputStream(src))))
+        parser.atn = atn
+        parser._interp = ParserATNSimulator(
+            parser,
+            atn,
+            [DFA(state, i) for i, state in enumerate(atn.decisionToState)],
+            PredictionContextCache(),
+        )
+        tree = JASTConverter().visit(parser.compilationUnit())
+        self.assertEqual(jast.dump(jast.parse(src)), jast.dump(tree))
+
+
+if __name__ == "__main__":
+    unittest.main()
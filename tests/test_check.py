@@ -0,0 +1,64 @@
+import unittest
+
+from antlr4.error.Errors import ParseCancellationException
+
+import jast
+
+
+class TestCheck(unittest.TestCase):
+    def test_valid(self):
+        src = (
+            "package example;\n"
+            "\n"
+            "public class Example {\n"
+            "    public int add(int a, int b) {\n"
+            "        return a + b;\n"
+            "    }\n"
+            "}\n"
+        )
+        self.assertIsNone(jast.check(src))
+        self.assertTrue(jast.is_valid(src))
+
+    def test_mismatched_token(self):
+        diagnostic = jast.check("class A {\n    int x = 1\n}\n")
+        self.assertIsInstance(diagnostic, jast.Diagnostic)
+        self.assertEqual(3, diagnostic.line)
+        self.assertEqual(0, diagnostic.column)
+        self.assertIn("expecting ';'", diagnostic.msg)
+        self.assertFalse(jast.is_valid("class A {\n    int x = 1\n}\n"))
+
+    def test_no_viable_alternative(self):
+        diagnostic = jast.check("class A { int x = ; }")
+        self.assertEqual((1, 18), (diagnostic.line, diagnostic.column))
+        self.assertIn("no viable alternative", diagnostic.msg)
+
+    def test_first_error(self):
+        diagnostic = jast.check("class A { int x = ; int y = ; }")
+        self.assertEqual((1, 18), (diagnostic.line, diagnostic.column))
+
+    def test_trailing_input(self):
+        diagnostic = jast.check("class A { } }")
+        self.assertEqual((1, 12), (diagnostic.line, diagnostic.column))
+
+    def test_token_recognition_error(self):
+        diagnostic = jast.check("class A { int x = #; }")
+        self.assertEqual((1, 18), (diagnostic.line, diagnostic.column))
+        self.assertIn("token recognition error", diagnostic.msg)
+
+    def test_modes(self):
+        self.assertTrue(jast.is_valid("a + b", mode=jast.ParseMode.EXPR))
+        self.assertFalse(jast.is_valid("a + ", mode=jast.ParseMode.EXPR))
+        self.assertTrue(jast.is_valid("return a;", mode="stmt"))
+        self.assertFalse(jast.is_valid("return a", mode="stmt"))
+        self.assertTrue(jast.is_valid("int x;", mode=jast.ParseMode.DECL))
+        self.assertFalse(jast.is_valid("int x; int y;", mode=jast.ParseMode.DECL))
+        self.assertTrue(jast.is_valid("requires a.b;", mode=jast.ParseMode.DIRE))
+
+    def test_agrees_with_parse(self):
+        for src in ("class A { void f() { g(); } }", "class A { void f() { g() } }"):
+            try:
+                jast.parse(src)
+                parsed = True
+            except ParseCancellationException:
+                parsed = False
+            self.assertEqual(parsed, jast.is_valid(src))
@@ -0,0 +1,165 @@
+import unittest
+
+import jast
+
+
+class TestComments(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "/*\n"
+            " * License header\n"
+            " */\n"
+            "package a;\n"
+            "\n"
+            "import b.C; // needed\n"
+            "\n"
+            "/**\n"
+            " * The class A.\n"
+            " */\n"
+            "public class A {\n"
+            "    // counter\n"
+            "    private int x = 0; // starts at zero\n"
+            "\n"
+            "    /** Adds. */\n"
+            "    public int add(int a, int b) {\n"
+            "        // sum them\n"
+            "        int c = a + b; /* inline */\n"
+            "        if (c > 0) { // positive\n"
+            "            return c;\n"
+            "        } else {\n"
+            "            return -c; // negative\n"
+            "        }\n"
+            "        // dangling\n"
+            "    }\n"
+            "}\n"
+        )
+
+    def test_no_comments_by_default(self):
+        tree = jast.parse(self.source)
+        self.assertIsNone(jast.get_comments(tree))
+        self.assertNotIn("//", jast.unparse(tree, comments=True))
+
+    def test_side_table(self):
+        comments = jast.get_comments(jast.parse(self.source, comments=True))
+        self.assertIsInstance(comments, jast.Comments)
+        self.assertEqual(11, len(comments))
+        self.assertEqual("/*\n * License header\n */", comments.text(0))
+        self.assertEqual("// dangling", list(comments)[-1])
+
+    def test_from_source(self):
+        comments = jast.Comments.from_source(self.source)
+        self.assertEqual(
+            list(jast.get_comments(jast.parse(self.source, comments=True))),
+            list(comments),
+        )
+
+    def test_leading(self):
+        tree = jast.parse(self.source, comments=True)
+        comments = jast.get_comments(tree)
+        cls = tree.body[0]
+        self.assertEqual(["/*\n * License header\n */"], comments.leading(tree.package))
+        self.assertEqual(["/**\n * The class A.\n */"], comments.leading(cls))
+        self.assertEqual(["// counter"], comments.leading(cls.body[0]))
+        self.assertEqual(["/** Adds. */"], comments.leading(cls.body[1]))
+        body = cls.body[1].body.body
+        self.assertEqual(["// sum them"], comments.leading(body[0]))
+        self.assertEqual(["// positive"], comments.leading(body[1].body.body[0]))
+
+    def test_trailing(self):
+        tree = jast.parse(self.source, comments=True)
+        comments = jast.get_comments(tree)
+        cls = tree.body[0]
+        self.assertEqual(["// needed"], comments.trailing(tree.imports[0]))
+        self.assertEqual(["// starts at zero"], comments.trailing(cls.body[0]))
+        body = cls.body[1].body.body
+        self.assertEqual(["/* inline */"], comments.trailing(body[0]))
+        self.assertEqual(["// dangling"], comments.trailing(body[1]))
+        self.assertEqual([], comments.trailing(cls.body[1]))
+
+    def test_unparse(self):
+        tree = jast.parse(self.source, comments=True)
+        code = jast.unparse(tree, comments=True)
+        for comment in jast.get_comments(tree):
+            self.assertIn(comment, code)
+        self.assertIn("int c = a + b; /* inline */\n", code)
+        self.assertIn("return -c; // negative\n", code)
+        self.assertIn("\n        // dangling\n    }\n", code)
+        self.assertEqual(
+            jast.dump(jast.parse(self.source)), jast.dump(jast.parse(code))
+        )
+
+    def test_unparse_without_comments(self):
+        tree = jast.parse(self.source, comments=True)
+        self.assertNotIn("//", jast.unparse(tree))
+
+    def test_unparse_explicit_comments(self):
+        tree = jast.parse(self.source)
+        code = jast.unparse(tree, comments=jast.Comments.from_source(self.source))
+        self.assertIn("private int x = 0; // starts at zero\n", code)
+
+    def test_inner(self):
+        source = (
+            "class A {\n"
+            "    void run() {\n"
+            "        // nothing\n"
+            "    }\n"
+            "\n"
+            "    void f() {\n"
+            "        try {\n"
+            "            g();\n"
+            "        } catch (Exception e) { // ignore\n"
+            "        }\n"
+            "    }\n"
+            "\n"
+            "    interface I { /* marker */ }\n"
+            "}\n"
+        )
+        tree = jast.parse(source, comments=True)
+        comments = jast.get_comments(tree)
+        cls = tree.body[0]
+        self.assertEqual(["// nothing"], comments.inner(cls.body[0].body))
+        self.assertEqual(["/* marker */"], comments.inner(cls.body[2]))
+        self.assertEqual([], comments.inner(cls))
+        code = jast.unparse(tree, comments=True)
+        self.assertIn("void run() {\n        // nothing\n    }\n", code)
+        self.assertIn(
+            "} catch (Exception e) {\n            // ignore\n        }\n", code
+        )
+        self.assertIn("interface I {\n        /* marker */\n    }\n", code)
+        self.assertEqual(jast.dump(jast.parse(source)), jast.dump(jast.parse(code)))
+
+    def test_unparse_unsupported(self):
+        tree = jast.parse(self.source, comments=True)
+        self.assertRaises(ValueError, jast.unparse, tree, indent=-1, comments=True)
+        self.assertRaises(
+            ValueError, jast.unparse, tree, source_map=True, comments=True
+        )
+
+    def test_reparse(self):
+        tree = jast.parse(self.source, comments=True)
+        start = self.source.index("// negative") + 3
+        tree = jast.reparse(tree, self.source, [(start, start + 8, "negated")])
+        self.assertIn("// negated", list(jast.get_comments(tree)))
+
+    def test_reparse_comments(self):
+        original = jast.parse(self.source, comments=True)
+        start = self.source.index("int c = a + b;")
+        text = "int c = a\n            /* plus */ + b; // sum\n        "
+        src = self.source[:start] + text + self.source[start + 14 :]
+        tree = jast.reparse(original, self.source, [(start, start + 14, text)])
+        # only the method was reparsed
+        self.assertIs(original, tree)
+        comments = jast.get_comments(tree)
+        expected = jast.Comments.from_source(src)
+        self.assertEqual(list(expected), list(comments))
+        self.assertEqual(expected.starts, comments.starts)
+        self.assertEqual(expected._code_starts, comments._code_starts)
+        self.assertEqual(expected._code_stops, comments._code_stops)
+        self.assertEqual(expected._line_starts, comments._line_starts)
+        self.assertEqual(
+            ["// dangling"], comments.trailing(tree.body[0].body[1].body.body[1])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
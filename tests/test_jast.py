@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from typing import List
 
 import jast
@@ -2877,3 +2879,98 @@ class TestJAST(BaseTest):
                 )
             ],
         )
+
+    def test_dump(self):
+        tree = jast.BinOp(
+            left=jast.Name(jast.identifier("a"), lineno=1, col_offset=0),
+            op=jast.Add(),
+            right=jast.Constant(jast.IntLiteral(1)),
+        )
+        self.assertEqual(
+            "BinOp(left=Name(id=identifier(value='a')), op=Add(), "
+            "right=Constant(value=IntLiteral(value=1, long=False)))",
+            jast.dump(tree),
+        )
+        self.assertIn(
+            "lineno=1, col_offset=0", jast.dump(tree, include_attributes=True)
+        )
+
+    def test_dump_structural_equality(self):
+        source = "class A { int f(int a) { return a * 2; } }"
+        self.assertEqual(jast.dump(jast.parse(source)), jast.dump(jast.parse(source)))
+        self.assertNotEqual(
+            jast.dump(jast.parse(source)),
+            jast.dump(jast.parse(source.replace("*", "+"))),
+        )
+
+    def test_clone(self):
+        source = (
+            "class A {\n"
+            "    @Deprecated public static int f(int a) {\n"
+            "        return a * 2 + 1000;\n"
+            "    }\n"
+            "}\n"
+        )
+        tree = jast.parse(source)
+        copied = jast.clone(tree)
+        self.assertIsNot(tree, copied)
+        self.assertEqual(
+            jast.dump(tree, include_attributes=True),
+            jast.dump(copied, include_attributes=True),
+        )
+        self.assertEqual(jast.unparse(tree), jast.unparse(copied))
+        method, copied_method = tree.body[0].body[0], copied.body[0].body[0]
+        self.assertIsNot(method, copied_method)
+        self.assertIsNot(method.body.body, copied_method.body.body)
+        self.assertIsNot(method.modifiers, copied_method.modifiers)
+        # annotations are copied, other modifiers and identifiers are shared
+        self.assertIsNot(method.modifiers[0], copied_method.modifiers[0])
+        self.assertIs(method.modifiers[1], copied_method.modifiers[1])
+        self.assertIs(method.id, copied_method.id)
+        copied_method.body.body.clear()
+        self.assertEqual(source, jast.unparse(tree, indent=4) + "\n")
+
+    def test_clone_text_block(self):
+        tree = jast.parse('String s = """\n    a\n    """;', jast.ParseMode.STMT)
+        copied = jast.clone(tree)
+        block = tree.declarators[0].init.value
+        copied_block = copied.declarators[0].init.value
+        self.assertIsInstance(copied_block, jast.TextBlock)
+        self.assertIsNot(block, copied_block)
+        self.assertEqual(block.value, copied_block.value)
+        copied_block.value.append("b")
+        self.assertNotIn("b", block.value)
+        self.assertEqual(jast.unparse(jast.clone(tree)), jast.unparse(tree))
+
+    def test_clone_leaf(self):
+        identifier = jast.identifier("a")
+        copied = jast.clone(identifier)
+        self.assertEqual(identifier, copied)
+        self.assertEqual("a", copied.value)
+        self.assertIsInstance(jast.clone(jast.Add()), jast.Add)
+
+    def test_lazy_parser_import(self):
+        script = (
+            "import sys, jast\n"
+            "assert 'jast._parse' not in sys.modules\n"
+            "jast.unparse(jast.Name(jast.identifier('x')))\n"
+            "assert 'jast._parse' not in sys.modules\n"
+            "assert jast.parse('x', 'expr').id == 'x'\n"
+            "assert 'jast._parse' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+    def test_lazy_executor_import(self):
+        script = (
+            "import sys, jast\n"
+            "for name in ('concurrent.futures', 'multiprocessing', 'inspect'):\n"
+            "    assert name not in sys.modules, name\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+    def test_lazy_attributes(self):
+        for name in jast.__all__:
+            self.assertTrue(hasattr(jast, name), name)
+        self.assertIn("parse", dir(jast))
+        with self.assertRaises(AttributeError):
+            jast.undefined
@@ -0,0 +1,115 @@
+import gc
+import unittest
+
+import jast
+
+SOURCE = """class A {
+    String a = "value";
+    String b = "value";
+
+    int f(int x) {
+        return x + 1000 + 1000;
+    }
+}
+"""
+
+
+class TestMemoryReport(unittest.TestCase):
+    def test_counts(self):
+        tree = jast.parse(SOURCE)
+        report = jast.memory_report(tree)
+        self.assertEqual(1, report.classes["CompilationUnit"][0])
+        self.assertEqual(1, report.classes["Class"][0])
+        self.assertEqual(2, report.classes["Field"][0])
+        self.assertEqual(2, report.classes["BinOp"][0])
+        self.assertEqual(report.nodes, sum(c for c, _ in report.classes.values()))
+        self.assertEqual(
+            report.node_bytes, sum(size for _, size in report.classes.values())
+        )
+        self.assertGreater(report.attribute_bytes, 0)
+        self.assertGreater(report.lists, 0)
+        self.assertEqual(
+            report.total_bytes,
+            report.node_bytes
+            + report.list_bytes
+            + report.value_bytes
+            + report.location_bytes,
+        )
+
+    def test_identifiers_and_literals(self):
+        report = jast.memory_report(jast.parse(SOURCE))
+        # A, a, b, f, x, x, String, String
+        self.assertEqual(8, report.identifiers)
+        self.assertEqual(8, report.identifier_objects)
+        self.assertEqual(6, report.identifier_values)
+        self.assertEqual(4, report.literals)
+        self.assertEqual(4, report.literal_objects)
+        self.assertEqual(2, report.literal_values)
+        self.assertGreater(report.identifier_bytes, 0)
+        self.assertGreater(report.literal_bytes, 0)
+
+    def test_shared_objects(self):
+        name = jast.identifier("x")
+        tree = jast.BinOp(
+            left=jast.Name(id=name), op=jast.Add(), right=jast.Name(id=name)
+        )
+        report = jast.memory_report(tree)
+        self.assertEqual(2, report.identifiers)
+        self.assertEqual(1, report.identifier_objects)
+        self.assertEqual(1, report.identifier_values)
+        self.assertEqual(1, report.classes["identifier"][0])
+
+    def test_locations(self):
+        small = jast.Name(
+            id=jast.identifier("x"),
+            lineno=1,
+            col_offset=2,
+            end_lineno=1,
+            end_col_offset=3,
+        )
+        report = jast.memory_report(small)
+        self.assertEqual(4, report.locations)
+        self.assertEqual(0, report.location_objects)
+        self.assertEqual(0, report.location_bytes)
+        line = int("1000")
+        large = jast.Name(
+            id=jast.identifier("x"),
+            lineno=line,
+            col_offset=int("2000"),
+            end_lineno=line,
+            end_col_offset=int("2001"),
+        )
+        report = jast.memory_report(large)
+        self.assertEqual(4, report.locations)
+        self.assertEqual(3, report.location_objects)
+        self.assertGreater(report.location_bytes, 0)
+
+    def test_compare(self):
+        tree = jast.parse(SOURCE)
+        report = jast.memory_report(tree)
+        self.assertIsNone(report.slotted_bytes)
+        self.assertIsNone(report.interned_bytes)
+        report = jast.memory_report(tree, compare=True)
+        self.assertLess(report.slotted_bytes, report.total_bytes)
+        self.assertLess(report.interned_bytes, report.total_bytes)
+
+    def test_no_dicts_materialized(self):
+        tree = jast.parse(SOURCE)
+        method = tree.body[0].body[2]
+        before = any(type(r) is dict for r in gc.get_referents(method))
+        jast.memory_report(tree, compare=True)
+        after = any(type(r) is dict for r in gc.get_referents(method))
+        self.assertEqual(before, after)
+
+    def test_str(self):
+        report = jast.memory_report(jast.parse(SOURCE), compare=True)
+        text = str(report)
+        self.assertIn("BinOp", text)
+        self.assertIn("identifiers", text)
+        self.assertIn("slotted", text)
+        self.assertIn("interned", text)
+        self.assertIn(f"nodes={report.nodes}", repr(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
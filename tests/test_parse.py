@@ -1,4 +1,5 @@
 import itertools
+import threading
 
 from antlr4.error.Errors import ParseCancellationException
 from parameterized import parameterized
@@ -79,6 +80,39 @@ class TestParse(BaseTest):
         self._test_parse_mode_dire(src, "dire")
         self._test_parse_mode_dire(src, 4)
 
+    def test_expression_levels(self):
+        tree = jast.parse(
+            "a = b ? c || d && e | f ^ g & h == i < j << k + l * (int) -m++ : n",
+            jast.ParseMode.EXPR,
+        )
+        self.assertIsInstance(tree, jast.Assign)
+        self.assertIsInstance(tree.value, jast.IfExp)
+        node = tree.value.body
+        for op in (
+            jast.Or,
+            jast.And,
+            jast.BitOr,
+            jast.BitXor,
+            jast.BitAnd,
+            jast.Eq,
+            jast.Lt,
+            jast.LShift,
+            jast.Add,
+            jast.Mult,
+        ):
+            self.assertIsInstance(node, jast.BinOp)
+            self.assertIsInstance(node.op, op)
+            node = node.right
+        self.assertIsInstance(node, jast.Cast)
+        self.assertIsInstance(node.value, jast.UnaryOp)
+        self.assertIsInstance(node.value.operand, jast.PostOp)
+        self.assertEqual("m", node.value.operand.operand.id)
+        unary = node.value
+        self.assertEqual(
+            (1, 58, 1, 60),
+            (unary.lineno, unary.col_offset, unary.end_lineno, unary.end_col_offset),
+        )
+
     def test_identifier(self):
         name = jast.parse("foo", jast.ParseMode.EXPR)
         self._test_name(name, "foo")
@@ -2903,3 +2937,71 @@ class TestParse(BaseTest):
         self.assertIsInstance(tree, jast.ModularUnit)
         self.assertEqual(0, len(tree.imports))
         self.assertIsInstance(tree.body, jast.Module)
+
+    def test_parse_threads(self):
+        sources = [
+            f"class A{i} {{ int m(int a) {{ return a * {i} + (a << 2); }} }}"
+            for i in range(8)
+        ]
+        expected = [jast.dump(jast.parse(src)) for src in sources]
+        results = [None] * len(sources)
+
+        def run(index):
+            results[index] = jast.dump(jast.parse(sources[index]))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(expected, results)
+
+    def test_parse_many(self):
+        sources = [f"x + {i} * y" for i in range(5)]
+        trees = jast.parse_many(sources, jast.ParseMode.EXPR, max_workers=3)
+        self.assertEqual(5, len(trees))
+        for i, tree in enumerate(trees):
+            self.assertIsInstance(tree, jast.BinOp)
+            self.assertEqual(i, tree.right.left.value)
+        self.assertEqual([], jast.parse_many([]))
+
+    def test_parse_many_error(self):
+        with self.assertRaises(ParseCancellationException):
+            jast.parse_many(["class A {}", "class B {"])
+
+    def test_stats(self):
+        src = "class A { int m(int a) { return a * 2 + f(a); } }"
+        stats = jast.ParseStats()
+        tree = jast.parse(src, stats=stats)
+        self.assertEqual(jast.dump(jast.parse(src)), jast.dump(tree))
+        self.assertEqual(len(jast.tokenize(src)), stats.tokens)
+        self.assertEqual(
+            sum(1 for _ in jast._parse._walk(tree)),
+            stats.nodes,
+        )
+        self.assertGreater(stats.contexts, stats.nodes)
+        self.assertGreater(stats.lex_time, 0)
+        self.assertGreater(stats.parse_time, 0)
+        self.assertGreater(stats.convert_time, 0)
+        self.assertAlmostEqual(
+            stats.lex_time + stats.parse_time + stats.convert_time, stats.total_time
+        )
+        self.assertIn("tokens=", repr(stats))
+
+    def test_stats_full_context(self):
+        stats = jast.ParseStats()
+        jast.parse("class A { void m() { f(a < b, c > d); } }", stats=stats)
+        self.assertGreater(stats.full_context, 0)
+        stats = jast.ParseStats()
+        jast.parse("x + 1", jast.ParseMode.EXPR, stats=stats)
+        self.assertEqual(0, stats.full_context)
+        self.assertEqual(0, stats.ambiguities)
+
+    def test_stats_recover(self):
+        stats = jast.ParseStats()
+        tree, diagnostics = jast.parse(
+            "class A { int x = ; }", recover=True, stats=stats
+        )
+        self.assertTrue(diagnostics)
+        self.assertGreater(stats.tokens, 0)
+        self.assertGreater(stats.nodes, 0)
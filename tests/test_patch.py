@@ -0,0 +1,125 @@
+import unittest
+
+import jast
+
+
+class TestPatch(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "package example;\n"
+            "\n"
+            "public class Example {\n"
+            "    private int count = 0;\n"
+            "    \n"
+            "    public int add(int a, int b) {\n"
+            "        if (a > b) {\n"
+            "            count++;\n"
+            "        } else count--;\n"
+            "        return a + b;\n"
+            "    }\n"
+            "    \n"
+            "    public static void main(String[] args) {\n"
+            "        for (int i = 0; i < 10; i++) {\n"
+            "            System.out.println(add(27, i));\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+        )
+        self.tree = jast.parse(self.source)
+        self.cls = self.tree.body[0]
+        self.add = self.cls.body[1]
+        self.main = self.cls.body[2]
+
+    def test_no_edits(self):
+        renderer = jast.PatchRenderer(self.tree)
+        self.assertEqual(jast.unparse(self.tree), renderer.render([]))
+        self.assertEqual(jast.unparse(self.tree), renderer.render([]))
+
+    def test_replacement(self):
+        ret = self.add.body.body[1]
+        binop = ret.value
+        new_binop = jast.BinOp(left=binop.left, op=jast.Sub(), right=binop.right)
+        text = jast.PatchRenderer(self.tree).render(
+            [jast.Replacement(binop, new_binop)]
+        )
+        self.assertIn("return a - b;", text)
+        self.assertNotIn("return a + b;", text)
+        self.assertIn("return a + b;", jast.unparse(self.tree))
+        ret.value = new_binop
+        self.assertEqual(jast.unparse(self.tree), text)
+
+    def test_deletion(self):
+        if_ = self.add.body.body[0]
+        text = jast.PatchRenderer(self.tree).render([jast.Deletion(if_)])
+        self.add.body.body.remove(if_)
+        self.assertEqual(jast.unparse(self.tree), text)
+
+    def test_deletion_single_field(self):
+        if_ = self.add.body.body[0]
+        text = jast.PatchRenderer(self.tree).render([jast.Deletion(if_.orelse)])
+        if_.orelse = None
+        self.assertEqual(jast.unparse(self.tree), text)
+
+    def test_insertion(self):
+        stmt = jast.parse("count += a;", mode=jast.ParseMode.STMT)
+        block = self.add.body
+        text = jast.PatchRenderer(self.tree).render(
+            [
+                jast.Insertion(block, "body", 0, stmt),
+                jast.Insertion(block, "body", 2, stmt),
+            ]
+        )
+        block.body = [stmt, block.body[0], block.body[1], stmt]
+        self.assertEqual(jast.unparse(self.tree), text)
+
+    def test_multiple_edits(self):
+        if_ = self.add.body.body[0]
+        call = self.main.body.body[0].body.body[0]
+        new_call = jast.parse("System.out.print(i);", mode=jast.ParseMode.STMT)
+        edits = [jast.Replacement(call, new_call), jast.Deletion(if_)]
+        text = jast.PatchRenderer(self.tree).render(edits)
+        self.add.body.body.remove(if_)
+        self.main.body.body[0].body.body[0] = new_call
+        self.assertEqual(jast.unparse(self.tree), text)
+
+    def test_unparse_variants(self):
+        stmts = self.add.body.body
+        variants = [[jast.Deletion(stmt)] for stmt in stmts] + [[]]
+        expected = []
+        for stmt in stmts:
+            self.add.body.body = [s for s in stmts if s is not stmt]
+            expected.append(jast.unparse(self.tree))
+        self.add.body.body = stmts
+        expected.append(jast.unparse(self.tree))
+        self.assertEqual(expected, jast.unparse_variants(self.tree, variants))
+
+    def test_unparse_variants_indent(self):
+        binop = self.add.body.body[1].value
+        new_binop = jast.BinOp(left=binop.left, op=jast.Mult(), right=binop.right)
+        for indent in (-1, 2):
+            text = jast.unparse_variants(
+                self.tree, [[jast.Replacement(binop, new_binop)]], indent=indent
+            )[0]
+            self.add.body.body[1].value = new_binop
+            self.assertEqual(jast.unparse(self.tree, indent=indent), text)
+            self.add.body.body[1].value = binop
+
+    def test_apply_shares_unchanged(self):
+        binop = self.add.body.body[1].value
+        new_binop = jast.BinOp(left=binop.left, op=jast.Sub(), right=binop.right)
+        variant = jast.PatchRenderer(self.tree).apply(
+            [jast.Replacement(binop, new_binop)]
+        )
+        self.assertIsNot(self.tree, variant)
+        self.assertIsNot(self.cls, variant.body[0])
+        self.assertIs(self.tree.package, variant.package)
+        self.assertIs(self.main, variant.body[0].body[2])
+        self.assertIs(self.add.body.body[0], variant.body[0].body[1].body.body[0])
+
+    def test_foreign_target(self):
+        renderer = jast.PatchRenderer(self.tree)
+        self.assertRaises(
+            jast.JASTError,
+            renderer.render,
+            [jast.Deletion(jast.Name(jast.identifier("x")))],
+        )
@@ -0,0 +1,106 @@
+import unittest
+
+import jast
+
+SOURCE = """class A {
+    void f(List<String> xs) {
+        System.out.println(xs);
+        System.out.println("a" + 1);
+        if (x.equals(x)) {
+            g(1, 2, 3);
+        }
+        if (y.equals(z)) g();
+        int y = (int) z;
+    }
+}
+"""
+
+
+class TestPatterns(unittest.TestCase):
+    def setUp(self):
+        self.tree = jast.parse(SOURCE)
+
+    def test_capture(self):
+        pattern = jast.TreePattern("System.out.println($x)")
+        self.assertIs(jast.Member, pattern.root)
+        matches = pattern.findall(self.tree)
+        self.assertEqual(2, len(matches))
+        self.assertEqual("xs", jast.unparse(matches[0]["x"]))
+        self.assertEqual('"a" + 1', jast.unparse(matches[1]["x"]))
+
+    def test_repeated_capture(self):
+        matches = jast.TreePattern("$a.equals($a)").findall(self.tree)
+        self.assertEqual(1, len(matches))
+        self.assertEqual("x", jast.unparse(matches[0]["a"]))
+
+    def test_many(self):
+        matches = jast.TreePattern("g($first, $$rest)").findall(self.tree)
+        self.assertEqual(1, len(matches))
+        self.assertEqual("1", jast.unparse(matches[0]["first"]))
+        self.assertEqual(["2", "3"], [jast.unparse(n) for n in matches[0]["rest"]])
+        matches = jast.TreePattern("g($$args)").findall(self.tree)
+        self.assertEqual([3, 0], [len(match["args"]) for match in matches])
+
+    def test_statement(self):
+        pattern = jast.TreePattern("if ($c) $s;", mode="stmt")
+        matches = pattern.findall(self.tree)
+        self.assertEqual(2, len(matches))
+        self.assertIsInstance(matches[0]["s"], jast.Block)
+        self.assertIsInstance(matches[1]["s"], jast.Expr)
+
+    def test_type(self):
+        matches = jast.TreePattern("($T) $v").findall(self.tree)
+        self.assertEqual(1, len(matches))
+        self.assertIsInstance(matches[0]["T"], jast.Int)
+
+    def test_template(self):
+        pattern = jast.TreePattern(
+            jast.Call(
+                func=jast.Name(jast.identifier("g")),
+                args=[
+                    jast.Capture("first", jast.Constant(jast.IntLiteral(1))),
+                    jast.Many(),
+                ],
+            )
+        )
+        self.assertEqual(1, len(pattern.findall(self.tree)))
+        self.assertIsNone(pattern.match(jast.parse("g(2, 3)", "expr")))
+        self.assertEqual(
+            jast.IntLiteral(1),
+            pattern.match(jast.parse("g(1)", "expr"))["first"].value,
+        )
+
+    def test_wildcard(self):
+        pattern = jast.TreePattern(jast.Capture())
+        self.assertIsNone(pattern.root)
+        self.assertEqual({}, pattern.match(self.tree))
+        self.assertEqual(
+            {},
+            jast.TreePattern("$_.equals($_)").match(jast.parse("a.equals(b)", "expr")),
+        )
+
+    def test_matcher(self):
+        matcher = jast.PatternMatcher(
+            [
+                jast.TreePattern("System.out.println($x)", name="print"),
+                jast.TreePattern("$a.equals($b)", name="equals"),
+                jast.TreePattern("g($$args)", name="g"),
+            ]
+        )
+        matches = matcher.findall(self.tree)
+        self.assertEqual(
+            ["print", "print", "equals", "g", "equals", "g"],
+            [match.pattern.name for match in matches],
+        )
+        pattern = matcher.add("$a.equals($a)")
+        self.assertIn(pattern, matcher.patterns)
+        self.assertEqual(7, len(matcher.findall(self.tree)))
+
+    def test_no_match(self):
+        pattern = jast.TreePattern("System.err.println($x)")
+        self.assertEqual([], pattern.findall(self.tree))
+        self.assertIsNone(pattern.match(self.tree))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from jast._parser.JavaParser import JavaParser
+from jast._parser._profile import profile
+
+
+class TestProfile(unittest.TestCase):
+    def test_profile(self):
+        decisions = profile(["x + f(y) * 2"], "expr")
+        self.assertEqual(len(JavaParser.atn.decisionToState), len(decisions))
+        used = [info for info in decisions if info.invocations]
+        self.assertTrue(used)
+        for info in used:
+            self.assertIn(info.rule, JavaParser.ruleNames)
+            self.assertGreater(info.time, 0)
+            self.assertGreaterEqual(info.sll_max_lookahead, 1)
+            self.assertLessEqual(info.mean_lookahead, info.sll_max_lookahead)
+
+    def test_full_context(self):
+        decisions = profile(["class A { void m() { f(a < b, c > d); } }"])
+        fallbacks = [info for info in decisions if info.ll_fallbacks]
+        self.assertTrue(fallbacks)
+        for info in fallbacks:
+            self.assertGreaterEqual(info.ll_max_lookahead, 1)
+
+    def test_shared_dfa_untouched(self):
+        states = [len(dfa.states) for dfa in JavaParser.decisionsToDFA]
+        profile(["class B<T> { T t = (T) null; }"])
+        self.assertEqual(states, [len(dfa.states) for dfa in JavaParser.decisionsToDFA])
+
+
+if __name__ == "__main__":
+    unittest.main()
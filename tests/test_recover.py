@@ -0,0 +1,127 @@
+import unittest
+
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.error.Errors import ParseCancellationException
+
+import jast
+from jast._parser._convert import JASTRecoveringConverter
+
+
+class TestRecover(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "package example;\n"
+            "\n"
+            "public class Example {\n"
+            "    int x = 1;\n"
+            "    void broken() {\n"
+            "        foo(;\n"
+            "    }\n"
+            "    int y = #2;\n"
+            "    void good() {\n"
+            "        return;\n"
+            "    }\n"
+            "}\n"
+        )
+
+    def test_raises_without_recover(self):
+        self.assertRaises(ParseCancellationException, jast.parse, self.source)
+
+    def test_recover(self):
+        tree, diagnostics = jast.parse(self.source, recover=True)
+        self.assertIsInstance(tree, jast.CompilationUnit)
+        self.assertEqual(2, len(diagnostics))
+        self.assertTrue(all(isinstance(d, jast.Diagnostic) for d in diagnostics))
+        cls = tree.body[0]
+        self.assertIsInstance(cls, jast.Class)
+        self.assertEqual("Example", cls.id)
+        self.assertEqual(4, len(cls.body))
+        self.assertIsInstance(cls.body[0], jast.Field)
+        self.assertIsInstance(cls.body[1], jast.ErrorDecl)
+        self.assertIsInstance(cls.body[2], jast.ErrorDecl)
+        self.assertIsInstance(cls.body[3], jast.Method)
+        self.assertEqual("good", cls.body[3].id)
+
+    def test_error_decl_span(self):
+        tree, _ = jast.parse(self.source, recover=True)
+        error = tree.body[0].body[1]
+        self.assertEqual("void broken() {\n        foo(;\n    }", error.text)
+        self.assertEqual(
+            (5, 4, 7, 4),
+            (error.lineno, error.col_offset, error.end_lineno, error.end_col_offset),
+        )
+        self.assertEqual("int y = #2;", tree.body[0].body[2].text)
+
+    def test_unparse_error_decl(self):
+        tree, _ = jast.parse(self.source, recover=True)
+        code = jast.unparse(tree)
+        self.assertIn("void broken() {\n        foo(;\n    }", code)
+        self.assertIn("int y = #2;", code)
+
+    def test_recover_valid(self):
+        source = "class A {\n    int x = 1;\n}\n"
+        tree, diagnostics = jast.parse(source, recover=True)
+        self.assertEqual([], diagnostics)
+        self.assertEqual(jast.dump(jast.parse(source)), jast.dump(tree))
+
+    def test_recover_between_members(self):
+        tree, diagnostics = jast.parse("class A { int x; ) int y; }", recover=True)
+        self.assertEqual(1, len(diagnostics))
+        self.assertEqual(2, len(tree.body[0].body))
+        self.assertIsInstance(tree.body[0].body[0], jast.Field)
+        self.assertIsInstance(tree.body[0].body[1], jast.Field)
+
+    def test_recover_decl(self):
+        tree, diagnostics = jast.parse(
+            "int x = ;", mode=jast.ParseMode.DECL, recover=True
+        )
+        self.assertIsInstance(tree, jast.ErrorDecl)
+        self.assertEqual("int x = ;", tree.text)
+        self.assertEqual(1, len(diagnostics))
+
+    def test_recover_expr(self):
+        tree, diagnostics = jast.parse("a + ", mode=jast.ParseMode.EXPR, recover=True)
+        self.assertIsNone(tree)
+        self.assertEqual(1, len(diagnostics))
+
+    def test_recover_import(self):
+        tree, diagnostics = jast.parse(
+            "import a.b;\nimport ;\nclass A {}\n", recover=True
+        )
+        self.assertIsInstance(tree, jast.CompilationUnit)
+        self.assertEqual(1, len(diagnostics))
+        self.assertIsInstance(tree.imports[0], jast.Import)
+        self.assertIsInstance(tree.imports[1], jast.ErrorDecl)
+        self.assertIsInstance(tree.body[0], jast.Class)
+        self.assertEqual("A", tree.body[0].id)
+        self.assertEqual("import a.b;\nimport\n\nclass A {}", jast.unparse(tree))
+
+    def test_recover_package(self):
+        tree, diagnostics = jast.parse("package ;\nimport b;\nclass A {}", recover=True)
+        self.assertEqual(1, len(diagnostics))
+        self.assertIsInstance(tree.package, jast.ErrorDecl)
+        self.assertEqual("package ;\n\nimport b;\n\nclass A {}", jast.unparse(tree))
+
+    def test_recover_module(self):
+        tree, diagnostics = jast.parse("module m { requires ; }", recover=True)
+        self.assertIsInstance(tree, jast.ModularUnit)
+        self.assertIsInstance(tree.body, jast.ErrorDecl)
+        self.assertEqual(1, len(diagnostics))
+        self.assertEqual("module m { requires ; }", jast.unparse(tree))
+        self.assertEqual("module m { requires ; }", jast.unparse_min(tree))
+        self.assertEqual(
+            "module m { requires ; }", jast.unparse(tree, source_map=True)[0]
+        )
+        tree, diagnostics = jast.parse("import a.;\nmodule m {}", recover=True)
+        self.assertIsInstance(tree, jast.ModularUnit)
+        self.assertIsInstance(tree.imports[0], jast.ErrorDecl)
+        self.assertIsInstance(tree.body, jast.Module)
+        self.assertEqual(1, len(diagnostics))
+
+    def test_converter_error_not_recovered(self):
+        def fail(converter, ctx):
+            raise AttributeError("bug")
+
+        # a complete member that fails to convert is not turned into an ErrorDecl
+        converter = JASTRecoveringConverter(set())
+        self.assertRaises(AttributeError, converter._recover, fail, ParserRuleContext())
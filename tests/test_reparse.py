@@ -0,0 +1,95 @@
+import unittest
+
+from antlr4.error.Errors import ParseCancellationException
+
+import jast
+
+
+class TestReparse(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "package example;\n"
+            "\n"
+            "public class Example {\n"
+            "    private int count = 0;\n"
+            "\n"
+            "    public int add(int a, int b) {\n"
+            "        int c = a + b;\n"
+            "        if (c > 3) { c--; }\n"
+            "        return c;\n"
+            "    }\n"
+            "\n"
+            "    @Override\n"
+            "    public String toString() {\n"
+            "        return this.toString() + super.hashCode();\n"
+            "    }\n"
+            "}\n"
+        )
+        self.tree = jast.parse(self.source)
+
+    def _edit(self, edits):
+        parts, position = [], 0
+        for start, end, text in sorted(edits):
+            parts += [self.source[position:start], text]
+            position = end
+        return "".join(parts) + self.source[position:]
+
+    def _test_reparse(self, edits, in_place=True):
+        expected = jast.parse(self._edit(edits))
+        tree = jast.reparse(self.tree, self.source, edits)
+        self.assertEqual(in_place, tree is self.tree)
+        self.assertEqual(
+            jast.dump(expected, include_attributes=True),
+            jast.dump(tree, include_attributes=True),
+        )
+        return tree
+
+    def test_edit_in_line(self):
+        start = self.source.index("a + b")
+        tree = self._test_reparse([(start, start + 1, "count")])
+        self.assertIs(self.tree.body[0].body[2], tree.body[0].body[2])
+
+    def test_edit_new_lines(self):
+        start = self.source.index("c--;")
+        self._test_reparse([(start, start + 4, "c -= 2;\n\n            c++;")])
+
+    def test_insert_statement(self):
+        start = self.source.index("return c;")
+        self._test_reparse([(start, start, "c = c * 2;\n        ")])
+
+    def test_multiple_edits(self):
+        first = self.source.index("a + b")
+        second = self.source.index("return c;")
+        self._test_reparse(
+            [(second + 7, second + 8, "a"), (first + 4, first + 5, "42")]
+        )
+
+    def test_edit_declaration(self):
+        start = self.source.index("int a, int b")
+        self._test_reparse([(start + 4, start + 5, "x")])
+
+    def test_edit_package(self):
+        start = self.source.index("example;")
+        self._test_reparse([(start, start + 7, "sample")])
+
+    def test_edit_top_level(self):
+        start = self.source.index("public class")
+        self._test_reparse([(start, start + 6, "final")], in_place=False)
+
+    def test_no_edits(self):
+        self.assertIs(self.tree, jast.reparse(self.tree, self.source, []))
+
+    def test_syntax_error(self):
+        start = self.source.index("return c;")
+        self.assertRaises(
+            ParseCancellationException,
+            jast.reparse,
+            self.tree,
+            self.source,
+            [(start, start + 6, "retur (")],
+        )
+
+    def test_overlapping_edits(self):
+        self.assertRaises(
+            ValueError, jast.reparse, self.tree, self.source, [(5, 10, ""), (8, 12, "")]
+        )
@@ -0,0 +1,92 @@
+import unittest
+
+from antlr4.error.Errors import ParseCancellationException
+
+import jast
+from jast._parser.JavaLexer import JavaLexer
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        src = "class A {\n    int x = 42; // answer\n}"
+        tokens = jast.tokenize(src)
+        self.assertEqual(
+            ["class", "A", "{", "int", "x", "=", "42", ";", "}"], list(tokens.texts())
+        )
+        self.assertEqual(9, len(tokens))
+        self.assertEqual("IDENTIFIER", tokens.name(4))
+        self.assertEqual((JavaLexer.IDENTIFIER, 18, 19, 2, 8), tokens[4])
+        self.assertEqual("x", tokens.text(4))
+
+    def test_include_hidden(self):
+        src = "int x; /* c */ // d\n"
+        tokens = jast.tokenize(src, include_hidden=True)
+        self.assertEqual(src, "".join(tokens.texts()))
+        self.assertIn("COMMENT", [tokens.name(i) for i in range(len(tokens))])
+        self.assertIn("LINE_COMMENT", [tokens.name(i) for i in range(len(tokens))])
+
+    def test_iteration(self):
+        tokens = jast.tokenize("a + b")
+        self.assertEqual(
+            [
+                (JavaLexer.IDENTIFIER, 0, 1, 1, 0),
+                (JavaLexer.ADD, 2, 3, 1, 2),
+                (JavaLexer.IDENTIFIER, 4, 5, 1, 4),
+            ],
+            list(tokens),
+        )
+
+    def test_empty(self):
+        self.assertEqual(0, len(jast.tokenize("")))
+        self.assertEqual(0, len(jast.tokenize("  // nothing\n")))
+
+    def test_error(self):
+        self.assertRaises(ParseCancellationException, jast.tokenize, "int x = #;")
+
+
+class TestPositions(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "class A {\n"
+            "    public int f(int a) {\n"
+            "        return a + 1000;\n"
+            "    }\n"
+            '    String s = "hello";\n'
+            "}\n"
+        )
+        self.tree = jast.parse(self.source)
+        self.positions = jast.Positions(self.source)
+
+    def test_offset_position(self):
+        offset = self.source.index("return")
+        self.assertEqual((3, 8), self.positions.position(offset))
+        self.assertEqual(offset, self.positions.offset(3, 8))
+
+    def test_text(self):
+        method, field = self.tree.body[0].body
+        self.assertEqual(
+            "public int f(int a) {\n        return a + 1000;\n    }",
+            self.positions.text(method),
+        )
+        self.assertEqual("a + 1000", self.positions.text(method.body.body[0].value))
+        self.assertEqual('String s = "hello";', self.positions.text(field))
+        self.assertIsNone(self.positions.span(method.id))
+
+    def test_span_exact_end(self):
+        ret = self.tree.body[0].body[0].body.body[0]
+        start, end = self.positions.span(ret.value.right)
+        self.assertEqual("1000", self.source[start:end])
+
+    def test_node_at(self):
+        node = self.positions.node_at(self.tree, self.source.index("1000") + 2)
+        self.assertIsInstance(node, jast.Constant)
+        self.assertIsNone(self.positions.node_at(self.tree, len(self.source) - 1))
+
+    def test_nodes_in(self):
+        start = self.source.index("return")
+        end = self.source.index(";", start) + 1
+        nodes = list(self.positions.nodes_in(self.tree, start, end))
+        self.assertEqual(
+            [jast.Return, jast.BinOp, jast.Name, jast.Constant],
+            [type(node) for node in nodes],
+        )
@@ -1,5 +1,7 @@
 import itertools
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from parameterized import parameterized
 
@@ -2414,3 +2416,218 @@ class TestUnparse(unittest.TestCase):
             "}",
             jast.unparse(tree),
         )
+
+
+class TestUnparseMin(unittest.TestCase):
+    SOURCE = (
+        "package org.example;\n"
+        "\n"
+        "import java.util.*;\n"
+        "import static java.lang.Math.max;\n"
+        "\n"
+        '@SuppressWarnings("unchecked")\n'
+        "public final class Sample<T extends Comparable<T>> extends Base {\n"
+        "    private static final int[] VALUES = {1, 2, 3};\n"
+        "    protected volatile long count = 0L;\n"
+        "    private Map<String, List<Integer>> map = new HashMap<>();\n"
+        "\n"
+        "    public Sample(int a) throws Exception {\n"
+        "        this.count = a;\n"
+        "    }\n"
+        "\n"
+        "    public void run() {\n"
+        "        int i = 0, j = -1;\n"
+        "        i = i + +j - -j + ++j;\n"
+        "        i >>>= 2;\n"
+        "        if (o instanceof String s && s.length() > 3) {\n"
+        "            System.out.println(s);\n"
+        "        } else if (i % 2 == 0) i /= 2;\n"
+        "        else i = (int) -i;\n"
+        "        for (int k = 0; k < 10; k++) continue;\n"
+        "        do { i++; } while (i < 5);\n"
+        "        switch (i) {\n"
+        "            case 1:\n"
+        "                i = 3;\n"
+        "                break;\n"
+        "            default:\n"
+        "                i = 4;\n"
+        "        }\n"
+        "        try {\n"
+        "            i = 1;\n"
+        "        } catch (IOException | RuntimeException e) {\n"
+        "            throw new RuntimeException(e);\n"
+        "        } finally {\n"
+        "            i = 0;\n"
+        "        }\n"
+        "        java.util.function.Function<Integer, Integer> g = x -> -x;\n"
+        "        double d = 2.0d;\n"
+        '        String t = """\n'
+        "            hello\n"
+        "              world\n"
+        '            """;\n'
+        "        i = i > 0 ? i : -i;\n"
+        "    }\n"
+        "\n"
+        "    enum E { A, B }\n"
+        "}\n"
+    )
+
+    def test_round_trip(self):
+        tree = jast.parse(self.SOURCE)
+        code = jast.unparse_min(tree)
+        self.assertNotIn("\n    ", code)
+        self.assertEqual(jast.dump(tree), jast.dump(jast.parse(code)))
+
+    def test_stable(self):
+        code = jast.unparse_min(jast.parse(self.SOURCE))
+        self.assertEqual(code, jast.unparse_min(jast.parse(code)))
+
+    @parameterized.expand(
+        [
+            ("a + +b", "a+ +b"),
+            ("a - -b", "a- -b"),
+            ("a + ++b", "a+ ++b"),
+            ("a++ + b", "a++ +b"),
+            ("a-- - --b", "a-- - --b"),
+            ("a / b", "a/b"),
+            ("a instanceof B", "a instanceof B"),
+            ("(int) -a", "(int)-a"),
+            ("x -> -x", "x->-x"),
+            ("new int[] {1, 2}", "new int[]{1,2}"),
+            ("1L + 2", "1l+2"),
+        ]
+    )
+    def test_expr(self, source, expected):
+        tree = jast.parse(source, jast.ParseMode.EXPR)
+        code = jast.unparse_min(tree)
+        self.assertEqual(expected, code)
+        self.assertEqual(
+            jast.dump(tree), jast.dump(jast.parse(code, jast.ParseMode.EXPR))
+        )
+
+
+class TestUnparseParallel(unittest.TestCase):
+    def setUp(self):
+        self.source = (
+            "package example;\n"
+            "\n"
+            "import java.util.List;\n"
+            "\n"
+            "public class Example {\n"
+            "    private int count = 0;\n"
+            "    static {\n"
+            "        count = 1;\n"
+            "    }\n"
+            "    public int add(int a, int b) {\n"
+            "        return a + b;\n"
+            "    }\n"
+            "    public int sub(int a, int b) {\n"
+            "        return a - b;\n"
+            "    }\n"
+            "    class Inner {\n"
+            "        void run() {}\n"
+            "    }\n"
+            "}\n"
+            "\n"
+            "interface Other {\n"
+            "    void run();\n"
+            "}\n"
+            "\n"
+            "enum Kind { A, B; void run() {} }\n"
+        )
+        self.tree = jast.parse(self.source)
+
+    def test_unparse_parallel(self):
+        for indent in (4, 2, -1):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                self.assertEqual(
+                    jast.unparse(self.tree, indent=indent),
+                    jast.unparse_parallel(self.tree, indent=indent, executor=executor),
+                )
+
+    def test_unparse_parallel_class(self):
+        cls = self.tree.body[0]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                jast.unparse(cls), jast.unparse_parallel(cls, executor=executor)
+            )
+
+    def test_unparse_parallel_processes(self):
+        with patch.object(jast._unparse, "_PARALLEL_SECONDS", 0):
+            self.assertEqual(
+                jast.unparse(self.tree),
+                jast.unparse_parallel(self.tree, max_workers=2),
+            )
+
+    def test_unparse_parallel_sequential(self):
+        self.assertEqual(
+            jast.unparse(self.tree), jast.unparse_parallel(self.tree, max_workers=2)
+        )
+
+    def test_unparse_many(self):
+        trees = [self.tree, self.tree.body[1], jast.parse("a + b", jast.ParseMode.EXPR)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                [jast.unparse(tree) for tree in trees],
+                jast.unparse_many(trees, executor=executor),
+            )
+
+    def test_unparse_many_processes(self):
+        trees = [self.tree, self.tree.body[1], jast.parse("a + b", jast.ParseMode.EXPR)]
+        with patch.object(jast._unparse, "_PARALLEL_SECONDS", 0):
+            self.assertEqual(
+                [jast.unparse(tree) for tree in trees],
+                jast.unparse_many(trees, max_workers=2),
+            )
+
+
+class TestSourceMap(unittest.TestCase):
+    def setUp(self):
+        self.tree = jast.parse(
+            "public class Example {\n"
+            "    public int add(int a, int b) {\n"
+            "        if (a > b) return a - b;\n"
+            "        return a + b;\n"
+            "    }\n"
+            "}\n"
+        )
+        self.method = self.tree.body[0].body[0]
+
+    def test_text(self):
+        for indent in (4, -1):
+            code, _ = jast.unparse(self.tree, indent=indent, source_map=True)
+            self.assertEqual(jast.unparse(self.tree, indent=indent), code)
+
+    def test_span(self):
+        code, source_map = jast.unparse(self.tree, source_map=True)
+        if_, return_ = self.method.body.body
+        start, end = source_map.span(return_)
+        self.assertEqual("return a + b;", code[start:end])
+        start, end = source_map.span(if_.test)
+        self.assertEqual("a > b", code[start:end])
+        start, end = source_map.span(self.method)
+        self.assertTrue(code[start:end].startswith("public int add("))
+        self.assertTrue(code[start:end].endswith("}"))
+
+    def test_node_at(self):
+        code, source_map = jast.unparse(self.tree, source_map=True)
+        offset = code.index("a + b")
+        node = source_map.node_at(offset)
+        self.assertIsInstance(node, jast.Name)
+        self.assertIs(self.method.body.body[1].value.left, node)
+        self.assertIsInstance(source_map.node_at(offset + 2), jast.Add)
+        self.assertIsNone(source_map.node_at(len(code)))
+
+    def test_position(self):
+        code, source_map = jast.unparse(self.tree, source_map=True)
+        offset = code.index("a - b")
+        self.assertEqual((4, 19), source_map.position(offset))
+        self.assertEqual(offset, source_map.offset(4, 19))
+        self.assertIs(
+            self.method.body.body[0].body.value.left,
+            source_map.node_at_position(4, 19),
+        )
+
+    def test_unknown_node(self):
+        _, source_map = jast.unparse(self.tree, source_map=True)
+        self.assertRaises(jast.JASTError, source_map.span, jast.This())
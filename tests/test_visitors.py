@@ -316,3 +316,273 @@ class TestVisitor(unittest.TestCase):
             self.source,
             jast.unparse(self.example),
         )
+
+    def test_ChangeAdd_sharing(self):
+        class ChangeAdd(jast.JNodeSharingTransformer):
+            def visit_Method(self, node):
+                if node.id == "add":
+                    node.body = self.visit(node.body)
+                return node
+
+            def visit_BinOp(self, node):
+                if isinstance(node.op, jast.Add):
+                    node.op = jast.Sub()
+                return node
+
+        new_tree = ChangeAdd().visit(self.example)
+        self.assertEqual(
+            "public class Example {\n"
+            "    public int add(int a, int b) {\n"
+            "        return a - b;\n"
+            "    }\n"
+            "    \n"
+            "    public static void main(String[] args) {\n"
+            "        System.out.println(add(27, 55));\n"
+            "    }\n"
+            "}",
+            jast.unparse(new_tree),
+        )
+        self.assertEqual(self.source, jast.unparse(self.example))
+        old_class, new_class = self.example.body[0], new_tree.body[0]
+        self.assertIsNot(self.example, new_tree)
+        self.assertIsNot(old_class, new_class)
+        self.assertIsNot(old_class.body[0], new_class.body[0])
+        # the unchanged subtrees are shared
+        self.assertIs(old_class.id, new_class.id)
+        self.assertIs(old_class.modifiers[0], new_class.modifiers[0])
+        self.assertIs(old_class.body[0].parameters, new_class.body[0].parameters)
+        self.assertIs(old_class.body[1], new_class.body[1])
+
+    def test_unchanged_sharing(self):
+        class Identity(jast.JNodeSharingTransformer):
+            def visit_identifier(self, node):
+                return node
+
+            def visit_BinOp(self, node):
+                return self.generic_visit(node)
+
+        self.assertIs(self.example, Identity().visit(self.example))
+
+    def test_DeleteAndAdd_sharing(self):
+        class DeleteAndAdd(jast.JNodeSharingTransformer):
+            def __init__(self):
+                self.to_add = None
+
+            def visit_Method(self, node):
+                if node.id == "add":
+                    self.to_add = node
+                    return None
+                elif node.id == "main":
+                    return [node, self.to_add]
+                return node
+
+        new_tree = DeleteAndAdd().visit(self.example)
+        self.assertEqual(
+            "public class Example {\n"
+            "    public static void main(String[] args) {\n"
+            "        System.out.println(add(27, 55));\n"
+            "    }\n"
+            "    \n"
+            "    public int add(int a, int b) {\n"
+            "        return a + b;\n"
+            "    }\n"
+            "}",
+            jast.unparse(new_tree),
+        )
+        self.assertEqual(self.source, jast.unparse(self.example))
+
+    def test_variants_sharing(self):
+        class Rename(jast.JNodeSharingTransformer):
+            def __init__(self, old, new):
+                self.old, self.new = old, new
+
+            def visit_identifier(self, node):
+                if node == self.old:
+                    return jast.identifier(self.new)
+                return node
+
+        first = Rename("a", "x").visit(self.example)
+        second = Rename("b", "y").visit(self.example)
+        self.assertIn("return x + b;", jast.unparse(first))
+        self.assertIn("return a + y;", jast.unparse(second))
+        self.assertEqual(self.source, jast.unparse(self.example))
+        main = self.example.body[0].body[1]
+        self.assertIs(main, first.body[0].body[1])
+        self.assertIs(main, second.body[0].body[1])
+
+    def test_prune(self):
+        class BinOpVisitor(jast.JNodeVisitor):
+            prune = True
+
+            def __init__(self):
+                self.visited = set()
+
+            def generic_visit(self, node):
+                self.visited.add(type(node).__name__)
+                return super().generic_visit(node)
+
+            def visit_BinOp(self, node):
+                return node
+
+        visitor = BinOpVisitor()
+        visitor.visit(self.example)
+        self.assertIn("Return", visitor.visited)
+        # names only contain identifiers and cannot contain a binary operation
+        self.assertNotIn("Name", visitor.visited)
+        self.assertNotIn("Public", visitor.visited)
+        visitor = BinOpVisitor()
+        visitor.prune = False
+        visitor.visit(self.example)
+        self.assertIn("Name", visitor.visited)
+        self.assertIn("Public", visitor.visited)
+
+    def test_prune_transformer(self):
+        class RenameCall(jast.JNodeTransformer):
+            prune = True
+
+            def visit_Call(self, node):
+                node.func = jast.Name(jast.identifier("sub"))
+                return self.generic_visit(node)
+
+        pruned = RenameCall().visit(jast.parse(self.source))
+        transformer = RenameCall()
+        transformer.prune = False
+        full = transformer.visit(jast.parse(self.source))
+        self.assertEqual(jast.dump(full), jast.dump(pruned))
+        self.assertIn("sub(sub(27, 55))", jast.unparse(pruned))
+
+    def _count_nodes(self, tree):
+        count, stack = 0, [tree]
+        while stack:
+            node = stack.pop()
+            count += 1
+            for _, value in node:
+                if isinstance(value, list):
+                    stack.extend(item for item in value if isinstance(item, jast.JAST))
+                elif isinstance(value, jast.JAST):
+                    stack.append(value)
+        return count
+
+    def test_no_prune_by_default(self):
+        class CountVisitor(jast.JNodeVisitor):
+            def __init__(self):
+                self.count = 0
+
+            def visit(self, node):
+                self.count += 1
+                return super().visit(node)
+
+        class SizeVisitor(jast.JNodeVisitor):
+            def default_result(self):
+                return 1
+
+            def aggregate_result(self, aggregate, result):
+                return aggregate + result
+
+        nodes = self._count_nodes(self.example)
+        visitor = CountVisitor()
+        visitor.visit(self.example)
+        self.assertEqual(nodes, visitor.count)
+        self.assertEqual(nodes, SizeVisitor().visit(self.example))
+
+    def test_prune_overridden(self):
+        class PruningVisitor(jast.JNodeVisitor):
+            prune = True
+
+        class SizeVisitor(PruningVisitor):
+            def default_result(self):
+                return 1
+
+            def aggregate_result(self, aggregate, result):
+                return aggregate + result
+
+        class CountTransformer(jast.JNodeSharingTransformer):
+            def __init__(self):
+                self.count = 0
+
+            def visit(self, node):
+                self.count += 1
+                return super().visit(node)
+
+        nodes = self._count_nodes(self.example)
+        self.assertEqual(nodes, SizeVisitor().visit(self.example))
+        transformer = CountTransformer()
+        self.assertIs(self.example, transformer.visit(self.example))
+        self.assertEqual(nodes, transformer.count)
+        # pruning enabled explicitly is kept
+        visitor = SizeVisitor()
+        visitor.prune = True
+        self.assertEqual(1, visitor.visit(self.example))
+
+    def test_CompositeVisitor(self):
+        class IdentifierVisitor(jast.JNodeVisitor):
+            def default_result(self):
+                return []
+
+            def aggregate_result(self, aggregate, result):
+                return aggregate + result
+
+            def visit_identifier(self, node):
+                return [node.value]
+
+        class CountCalls(jast.JNodeVisitor):
+            def default_result(self):
+                return 0
+
+            def aggregate_result(self, aggregate, result):
+                return aggregate + result
+
+            def visit_Call(self, node):
+                return 1 + self.generic_visit(node)
+
+        class MethodNames(jast.JNodeVisitor):
+            def default_result(self):
+                return ()
+
+            def aggregate_result(self, aggregate, result):
+                return aggregate + result
+
+            def visit_Method(self, node):
+                return (node.id,)
+
+        class Recording(jast.JNodeVisitor):
+            def __init__(self):
+                self.visited = []
+
+            def generic_visit(self, node):
+                self.visited.append(type(node).__name__)
+                return super().generic_visit(node)
+
+        visitors = [
+            IdentifierVisitor(),
+            CountCalls(),
+            MethodNames(),
+            jast.JNodeVisitor(),
+            Recording(),
+        ]
+        expected = [
+            IdentifierVisitor().visit(self.example),
+            CountCalls().visit(self.example),
+            MethodNames().visit(self.example),
+            None,
+        ]
+        recording = Recording()
+        recording.visit(self.example)
+        results = jast.CompositeVisitor(visitors).visit(self.example)
+        self.assertEqual(expected, results[:4])
+        self.assertEqual(("add", "main"), results[2])
+        self.assertEqual(2, results[1])
+        self.assertEqual(recording.visited, visitors[4].visited)
+
+    def test_CompositeVisitor_dispatch(self):
+        class Counter(jast.JNodeVisitor):
+            def __init__(self):
+                self.names = 0
+
+            def visit_Name(self, node):
+                self.names += 1
+
+        visitors = [Counter(), Counter()]
+        jast.CompositeVisitor(visitors).visit(self.example)
+        self.assertEqual([6, 6], [visitor.names for visitor in visitors])
+        self.assertEqual([], jast.CompositeVisitor([]).visit(self.example))